@@ -7,17 +7,39 @@ Removes background from video and replaces with transparency
 import cv2
 import numpy as np
 from PIL import Image
-from rembg import remove
+from rembg import new_session
 from pathlib import Path
 import subprocess
 import json
 from tqdm import tqdm
 import os
+import sys
+import time
+import shutil
+import tempfile
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from encoder_profiles import build_encode_cmd
+from frame_buffers import ArrayMatter, read_frames_into
+from memory_planner import allocate_frames, plan_execution
 
 # FFmpeg paths - use full path if available, otherwise system PATH
 FFMPEG_PATH = 'C:\\ffmpeg\\bin\\ffmpeg.exe' if os.path.exists('C:\\ffmpeg\\bin\\ffmpeg.exe') else 'ffmpeg'
 FFPROBE_PATH = 'C:\\ffmpeg\\bin\\ffprobe.exe' if os.path.exists('C:\\ffmpeg\\bin\\ffprobe.exe') else 'ffprobe'
 
+VIDEO_EXTENSIONS = ['.mp4', '.avi', '.mov', '.mkv', '.webm']
+
+# Warm rembg session, created once per process and reused for every frame/file
+_SESSION = None
+
+def get_session():
+    """Return this process's rembg session, creating it on first use"""
+    global _SESSION
+    if _SESSION is None:
+        _SESSION = new_session('u2net')
+    return _SESSION
+
 def get_video_info(video_path):
     """Get video metadata using ffprobe"""
     cmd = [
@@ -48,50 +70,42 @@ def get_video_info(video_path):
         'total_frames': int(video_stream['nb_frames']) if 'nb_frames' in video_stream else None
     }
 
-def extract_frames(video_path, output_dir):
-    """Extract all frames from video"""
+def extract_frames(video_path, output_dir, strategy='in_memory'):
+    """Extract all frames from video into one preallocated RGB array (RAM or memmap)"""
     output_dir = Path(output_dir)
     output_dir.mkdir(exist_ok=True)
     
     cap = cv2.VideoCapture(str(video_path))
     frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
     
-    frames = []
     print(f"Extracting {frame_count} frames...")
     
-    for i in tqdm(range(frame_count)):
-        ret, frame = cap.read()
-        if not ret:
-            break
-        
-        # Convert BGR to RGB
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        frames.append(frame_rgb)
+    # Decode straight into the frame block; BGR -> RGB happens in place per slot
+    frames = allocate_frames((frame_count, height, width, 3), strategy, output_dir, 'original')
+    read = read_frames_into(cap, frames)
     
     cap.release()
-    return frames
+    return frames[:read]
 
-def remove_background_from_frames(frames):
+def remove_background_from_frames(frames, session=None, strategy='in_memory', output_dir='temp_original_frames'):
     """Remove background from all frames"""
+    session = session or get_session()
     print(f"Removing background from {len(frames)} frames...")
-    processed_frames = []
     
-    for i, frame in enumerate(tqdm(frames)):
-        # Convert numpy array to PIL Image
-        pil_image = Image.fromarray(frame)
-        
-        # Remove background - this returns RGBA image
-        output = remove(pil_image)
-        
-        # Convert back to numpy array
-        processed_frame = np.array(output)
-        processed_frames.append(processed_frame)
+    # One RGBA block for the whole clip; the model writes alpha into it directly
+    processed_frames = allocate_frames(frames.shape[:3] + (4,), strategy, output_dir, 'processed')
+    matter = ArrayMatter(session, frames.shape[1], frames.shape[2])
+    
+    for i in tqdm(range(len(frames))):
+        matter.matte_into(frames[i], processed_frames[i])
     
     return processed_frames
 
-def create_transparent_video(frames, output_path_base, fps, width, height):
+def create_transparent_video(frames, output_path_base, fps, width, height, temp_dir='temp_video_frames'):
     """Create video with transparency in multiple formats using ffmpeg"""
-    temp_dir = Path('temp_video_frames')
+    temp_dir = Path(temp_dir)
     temp_dir.mkdir(exist_ok=True)
 
     print(f"Saving {len(frames)} frames as PNG...")
@@ -104,16 +118,8 @@ def create_transparent_video(frames, output_path_base, fps, width, height):
     # Generate MOV with transparency using Apple ProRes 4444 (compressed with alpha)
     print(f"Encoding MOV with transparency (compressed)...")
     mov_path = str(output_path_base).replace('.mov', '.mov')
-    cmd_mov = [
-        FFMPEG_PATH, '-y',
-        '-framerate', str(fps),
-        '-i', str(temp_dir / 'frame_%05d.png'),
-        '-c:v', 'prores_ks',     # Apple ProRes 4444 - supports alpha channel with good compression
-        '-pix_fmt', 'yuva444p10le',  # 10-bit YUVA with alpha
-        '-profile:v', '4',       # ProRes 4444 profile (highest quality with alpha)
-        '-vendor', 'ap10',       # Apple vendor ID
-        mov_path
-    ]
+    cmd_mov = build_encode_cmd('mov', 'balanced', temp_dir / 'frame_%05d.png', mov_path, fps,
+                               ffmpeg=FFMPEG_PATH)
     result = subprocess.run(cmd_mov, capture_output=True, text=True)
     if result.returncode != 0:
         print(f"MOV encoding error: {result.stderr}")
@@ -124,13 +130,8 @@ def create_transparent_video(frames, output_path_base, fps, width, height):
     # Generate GIF with transparency
     print(f"Encoding GIF with transparency...")
     gif_path = str(output_path_base).replace('.mov', '.gif')
-    cmd_gif = [
-        FFMPEG_PATH, '-y',
-        '-framerate', str(fps),
-        '-i', str(temp_dir / 'frame_%05d.png'),
-        '-vf', f'fps={fps},scale={width}:{height}:flags=lanczos,split[s0][s1];[s0]palettegen=max_colors=256:reserve_transparent=1[p];[s1][p]paletteuse=dither=bayer:bayer_scale=5:diff_mode=rectangle',
-        gif_path
-    ]
+    cmd_gif = build_encode_cmd('gif', 'archival', temp_dir / 'frame_%05d.png', gif_path, fps,
+                               width, height, ffmpeg=FFMPEG_PATH)
     result = subprocess.run(cmd_gif, capture_output=True, text=True)
     if result.returncode != 0:
         print(f"GIF encoding error: {result.stderr}")
@@ -145,19 +146,162 @@ def create_transparent_video(frames, output_path_base, fps, width, height):
 
     print(f"[OK] All formats generated!")
 
+def find_video_files(directory='Uploads'):
+    """Find all video files in a directory, skipping previous outputs"""
+    uploads_dir = Path(directory)
+
+    if not uploads_dir.exists():
+        raise Exception(f"{directory} directory not found")
+
+    return [str(f) for f in sorted(uploads_dir.iterdir())
+            if f.suffix.lower() in VIDEO_EXTENSIONS and not f.stem.endswith('_transparent')]
+
 def find_video_file():
     """Find the first video file in the Uploads directory"""
-    uploads_dir = Path('Uploads')
-    video_extensions = ['.mp4', '.avi', '.mov', '.mkv', '.webm']
+    video_files = find_video_files('Uploads')
+    if not video_files:
+        raise Exception(f"No video files found in Uploads directory")
+    return video_files[0]
 
-    if not uploads_dir.exists():
-        raise Exception("Uploads directory not found")
+def read_list_file(list_path):
+    """Read video paths from a list file (one per line, # for comments)"""
+    lines = Path(list_path).read_text().splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.strip().startswith('#')]
+
+def output_path_for(input_video):
+    """Transparent output path next to the input video"""
+    input_path = Path(input_video)
+    return str(input_path.with_name(f'{input_path.stem}_transparent.mov'))
+
+def plan_for(info, max_workers=None):
+    """Memory plan for a clip; this pipeline keeps every input and output frame"""
+    frame_count = info['total_frames'] or round(info['duration'] * info['fps'])
+    return plan_execution(info['width'], info['height'], frame_count,
+                          needs_all_frames=True, max_workers=max_workers)
+
+def process_video(input_video, output_video, session=None):
+    """Run the full pipeline on one video and return per-stage timings"""
+    timings = {}
+    start = time.perf_counter()
+
+    info = get_video_info(input_video)
+    plan = plan_for(info)
+    timings['metadata'] = time.perf_counter() - start
+
+    # Unique workspace so parallel workers never share frame files
+    work_dir = tempfile.mkdtemp(prefix='temp_original_frames_')
+    temp_dir = None
+    try:
+        stage = time.perf_counter()
+        frames = extract_frames(input_video, work_dir, plan['strategy'])
+        frame_total = len(frames)
+        timings['extract'] = time.perf_counter() - stage
+
+        stage = time.perf_counter()
+        processed_frames = remove_background_from_frames(frames, session, plan['strategy'], work_dir)
+        timings['remove_background'] = time.perf_counter() - stage
+
+        temp_dir = tempfile.mkdtemp(prefix='temp_video_frames_')
+        stage = time.perf_counter()
+        create_transparent_video(processed_frames, output_video, info['fps'],
+                                 info['width'], info['height'], temp_dir)
+        timings['encode'] = time.perf_counter() - stage
+    finally:
+        # Drop memmaps before deleting their files
+        frames = processed_frames = None
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        shutil.rmtree(work_dir, ignore_errors=True)
 
-    for ext in video_extensions:
-        for video_file in uploads_dir.glob(f'*{ext}'):
-            return str(video_file)
+    timings['total'] = time.perf_counter() - start
+    return {'frames': frame_total, 'plan': plan, 'timings': {k: round(v, 3) for k, v in timings.items()}}
 
-    raise Exception(f"No video files found in Uploads directory")
+def _init_batch_worker(threads_per_worker):
+    """Pool initializer: limit ONNX threads and warm the session once per worker"""
+    os.environ['OMP_NUM_THREADS'] = str(threads_per_worker)
+    get_session()
+
+def _batch_entry(input_video):
+    """Manifest entry for one batch input, before it has been processed"""
+    output_video = output_path_for(input_video)
+    return {
+        'input': input_video,
+        'size_bytes': os.path.getsize(input_video),
+        'outputs': [output_video, output_video.replace('.mov', '.gif')],
+    }
+
+def _batch_error(entry, error):
+    """Mark a manifest entry as failed"""
+    entry['status'] = 'error'
+    entry['error'] = str(error)
+    return entry
+
+def _batch_job(input_video):
+    """Process one batch entry inside a worker, never raising"""
+    entry = _batch_entry(input_video)
+    try:
+        entry.update(process_video(input_video, entry['outputs'][0]))
+        entry['status'] = 'ok'
+    except Exception as e:
+        _batch_error(entry, e)
+    return entry
+
+def run_batch(input_videos, workers=1, manifest_path='Uploads/batch_manifest.json'):
+    """Process many videos in one process pool and write a results manifest"""
+    missing = [v for v in input_videos if not os.path.exists(v)]
+    for video in missing:
+        print(f"[SKIP] Not found: {video}")
+    input_videos = [v for v in input_videos if os.path.exists(v)]
+
+    # Largest first so long jobs start early and small ones fill the gaps
+    input_videos.sort(key=os.path.getsize, reverse=True)
+    workers = max(1, min(workers, len(input_videos) or 1))
+    results = []
+    # Size the pool for the largest clip so no worker mix can exhaust memory;
+    # a clip that cannot be probed is recorded as failed and the next one sizes it
+    while input_videos:
+        try:
+            workers = plan_for(get_video_info(input_videos[0]), max_workers=workers)['workers']
+            break
+        except Exception as e:
+            results.append(_batch_error(_batch_entry(input_videos[0]), e))
+            print(f"[ERROR] {input_videos.pop(0)}: {e}")
+    threads_per_worker = max(1, (os.cpu_count() or 1) // workers)
+
+    print("=" * 60)
+    print(f"Batch Background Removal: {len(input_videos)} videos, {workers} worker(s)")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    if workers == 1:
+        _init_batch_worker(threads_per_worker)
+        for video in input_videos:
+            results.append(_batch_job(video))
+            print(f"[{results[-1]['status'].upper()}] {video}")
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                                 initargs=(threads_per_worker,)) as pool:
+            futures = {pool.submit(_batch_job, video): video for video in input_videos}
+            for future in as_completed(futures):
+                results.append(future.result())
+                print(f"[{results[-1]['status'].upper()}] {futures[future]}")
+
+    manifest = {
+        'workers': workers,
+        'total_seconds': round(time.perf_counter() - start, 3),
+        'succeeded': sum(1 for r in results if r['status'] == 'ok'),
+        'failed': sum(1 for r in results if r['status'] != 'ok'),
+        'missing': missing,
+        'files': results,
+    }
+    Path(manifest_path).parent.mkdir(parents=True, exist_ok=True)
+    Path(manifest_path).write_text(json.dumps(manifest, indent=2))
+
+    print()
+    print(f"[OK] {manifest['succeeded']} succeeded, {manifest['failed']} failed "
+          f"in {manifest['total_seconds']:.1f}s")
+    print(f"Manifest: {manifest_path}")
+    return manifest
 
 def main():
     # Dynamically find video file in Uploads folder
@@ -179,26 +323,38 @@ def main():
     print(f"  - Dimensions: {info['width']}x{info['height']}")
     print(f"  - FPS: {info['fps']}")
     print(f"  - Duration: {info['duration']:.2f}s")
+    plan = plan_for(info)
+    print(f"  - Plan: {plan['strategy']} (~{plan['estimated_peak_mb']} MB of {plan['budget_mb']} MB budget)")
     print()
     
-    # Extract frames
-    frames = extract_frames(input_video, 'temp_original_frames')
-    print(f"[OK] Extracted {len(frames)} frames")
-    print()
+    # Unique workspace, removed afterwards (memmap files can be as large as the clip)
+    work_dir = tempfile.mkdtemp(prefix='temp_original_frames_')
+    temp_dir = tempfile.mkdtemp(prefix='temp_video_frames_')
+    try:
+        # Extract frames
+        frames = extract_frames(input_video, work_dir, plan['strategy'])
+        print(f"[OK] Extracted {len(frames)} frames")
+        print()
 
-    # Remove backgrounds
-    processed_frames = remove_background_from_frames(frames)
-    print(f"[OK] Background removed from {len(processed_frames)} frames")
-    print()
-    
-    # Create output video
-    create_transparent_video(
-        processed_frames, 
-        output_video, 
-        info['fps'],
-        info['width'],
-        info['height']
-    )
+        # Remove backgrounds
+        processed_frames = remove_background_from_frames(frames, strategy=plan['strategy'], output_dir=work_dir)
+        print(f"[OK] Background removed from {len(processed_frames)} frames")
+        print()
+
+        # Create output video
+        create_transparent_video(
+            processed_frames,
+            output_video,
+            info['fps'],
+            info['width'],
+            info['height'],
+            temp_dir
+        )
+    finally:
+        # Drop memmaps before deleting their files
+        frames = processed_frames = None
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        shutil.rmtree(work_dir, ignore_errors=True)
     
     print()
     print("=" * 60)
@@ -210,5 +366,25 @@ def main():
     print(f"Both formats support transparency and maintain the original loop")
     print()
 
+def parse_args(argv):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Remove video backgrounds (single file or batch)')
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--batch', metavar='DIR',
+                        help='Process every video in DIR in one process')
+    source.add_argument('--list', metavar='FILE',
+                        help='Process every video listed in FILE (one path per line)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Parallel worker processes for batch mode (default: 1)')
+    parser.add_argument('--manifest', default=None,
+                        help='Batch results manifest path (default: <DIR>/batch_manifest.json)')
+    return parser.parse_args(argv)
+
 if __name__ == '__main__':
-    main()
+    args = parse_args(sys.argv[1:])
+    if args.batch or args.list:
+        videos = find_video_files(args.batch) if args.batch else read_list_file(args.list)
+        manifest_path = args.manifest or str(Path(args.batch or 'Uploads') / 'batch_manifest.json')
+        run_batch(videos, args.workers, manifest_path)
+    else:
+        main()
@@ -0,0 +1,226 @@
+"""
+Animated WebP / APNG Output
+Encodes transparent animations straight from in-memory RGBA frames: each
+frame (or, with change cropping, only the rectangle that differs from what
+is already on screen) is compressed on a thread pool while matting goes on,
+then the container is assembled in order. Full 8-bit alpha, unlike GIF.
+
+Thread-level parallelism works because libwebp (through Pillow), zlib and
+the NumPy filter passes all run without holding the GIL.
+"""
+
+import io
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from roi import mask_bbox
+
+ANIMATED_FORMATS = ['webp', 'apng']
+WEBP_QUALITY = 80
+WEBP_METHOD = 4
+PNG_COMPRESS_LEVEL = 6
+# Channel difference up to this counts as "unchanged" when cropping (0 = exact)
+DIFF_TOLERANCE = {'webp': 3, 'apng': 0}
+# APNG delays are 16-bit; identical frames are only merged up to this length
+MAX_FRAME_MS = 65535
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def animated_path_for(output_path, fmt):
+    """Animated outputs keep the requested path; APNG uses the .png extension"""
+    output_path = Path(output_path)
+    return output_path if fmt == 'webp' else output_path.with_suffix('.png')
+
+
+def _riff_chunks(data):
+    """(fourcc, raw chunk bytes incl. header and padding) for each chunk of a WebP file"""
+    pos = 12
+    while pos + 8 <= len(data):
+        fourcc = data[pos:pos + 4]
+        size = struct.unpack('<I', data[pos + 4:pos + 8])[0]
+        end = pos + 8 + size + (size & 1)
+        yield fourcc, data[pos:end]
+        pos = end
+
+
+def _riff_chunk(fourcc, payload):
+    return fourcc + struct.pack('<I', len(payload)) + payload + (b'\x00' if len(payload) & 1 else b'')
+
+
+def encode_webp_frame(rgba, quality=WEBP_QUALITY, lossless=False):
+    """ALPH + VP8/VP8L chunks of one frame, ready to wrap in an ANMF chunk"""
+    buffer = io.BytesIO()
+    Image.fromarray(rgba, 'RGBA').save(buffer, 'WEBP', quality=quality, lossless=lossless, method=WEBP_METHOD)
+    return b''.join(raw for fourcc, raw in _riff_chunks(buffer.getvalue())
+                    if fourcc in (b'ALPH', b'VP8 ', b'VP8L'))
+
+
+def _png_filter(rgba):
+    """
+    Filter every row with all five PNG filters at once and keep, per row,
+    the one with the smallest sum of absolute signed residuals (the libpng
+    heuristic). Returns filter-type-prefixed rows ready for zlib.
+    """
+    height, width, channels = rgba.shape
+    raw = rgba.reshape(height, width * channels).astype(np.int16)
+    left = np.zeros_like(raw)
+    left[:, channels:] = raw[:, :-channels]
+    up = np.zeros_like(raw)
+    up[1:] = raw[:-1]
+    up_left = np.zeros_like(raw)
+    up_left[1:, channels:] = raw[:-1, :-channels]
+
+    estimate = left + up - up_left
+    dist_left, dist_up, dist_up_left = np.abs(estimate - left), np.abs(estimate - up), np.abs(estimate - up_left)
+    paeth = np.where((dist_left <= dist_up) & (dist_left <= dist_up_left), left,
+                     np.where(dist_up <= dist_up_left, up, up_left))
+
+    filtered = np.stack([raw, raw - left, raw - up, raw - ((left + up) >> 1), raw - paeth]).astype(np.uint8)
+    cost = np.abs(filtered.view(np.int8).astype(np.int32)).sum(axis=2)
+    choice = cost.argmin(axis=0)
+
+    rows = np.empty((height, width * channels + 1), dtype=np.uint8)
+    rows[:, 0] = choice
+    rows[:, 1:] = filtered[choice, np.arange(height)]
+    return rows
+
+
+def encode_png_frame(rgba, level=PNG_COMPRESS_LEVEL):
+    """Zlib stream of one RGBA frame (the IDAT/fdAT payload)"""
+    return zlib.compress(_png_filter(rgba).tobytes(), level)
+
+
+def _png_chunk(kind, payload):
+    return struct.pack('>I', len(payload)) + kind + payload + struct.pack('>I', zlib.crc32(kind + payload))
+
+
+class AnimationWriter:
+    """
+    Feed RGBA frames with add(); finish() writes the animated WebP or APNG.
+
+    With `crop_changes`, each frame after the first is stored as the
+    rectangle that differs from the current canvas (what the viewer shows),
+    so error cannot accumulate across frames, and frames with no change just
+    extend the previous frame's duration.
+    """
+
+    def __init__(self, output_path, fmt, fps, quality=WEBP_QUALITY, lossless=False, crop_changes=True,
+                 workers=None, loop=0):
+        if fmt not in ANIMATED_FORMATS:
+            raise ValueError(f"Unsupported animated format: {fmt}")
+        self.output_path = Path(output_path)
+        self.fmt = fmt
+        self.fps = fps
+        self.quality = quality
+        self.lossless = lossless
+        self.crop_changes = crop_changes
+        self.loop = loop
+        self.pool = ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1)
+        self.frames = []  # {'future', 'box', 'duration'}
+        self.canvas = None
+        self.frame_index = 0
+
+    def _duration(self):
+        """Frame duration in ms, rounding on the running total so long clips do not drift"""
+        start = round(self.frame_index * 1000 / self.fps)
+        self.frame_index += 1
+        return round(self.frame_index * 1000 / self.fps) - start
+
+    def _encode(self, rgba):
+        if self.fmt == 'webp':
+            return encode_webp_frame(rgba, self.quality, self.lossless)
+        return encode_png_frame(rgba)
+
+    def add(self, rgba):
+        """Queue one RGBA frame for encoding (the array is copied)"""
+        frame = np.array(rgba, dtype=np.uint8)
+        # Colour under fully transparent pixels is invisible; zero it so it neither
+        # counts as a change nor costs bits
+        frame[frame[..., 3] == 0, :3] = 0
+        duration = self._duration()
+        height, width = frame.shape[:2]
+
+        if self.canvas is None or not self.crop_changes:
+            box = (0, 0, width, height)
+            self.canvas = frame
+        else:
+            diff = np.abs(frame.astype(np.int16) - self.canvas).max(axis=2)
+            box = mask_bbox(diff, DIFF_TOLERANCE[self.fmt])
+            if box is None and self.frames[-1]['duration'] + duration <= MAX_FRAME_MS:
+                self.frames[-1]['duration'] += duration
+                return
+            x0, y0, x1, y1 = box or (0, 0, 1, 1)
+            if self.fmt == 'webp':
+                # ANMF offsets are stored halved
+                x0, y0 = x0 & ~1, y0 & ~1
+            box = (x0, y0, x1, y1)
+            self.canvas[y0:y1, x0:x1] = frame[y0:y1, x0:x1]
+
+        x0, y0, x1, y1 = box
+        future = self.pool.submit(self._encode, self.canvas[y0:y1, x0:x1].copy())
+        self.frames.append({'future': future, 'box': box, 'duration': duration})
+
+    def _webp_container(self, width, height, frames):
+        # VP8X flags: alpha (matted output always has it) and animation
+        body = [_riff_chunk(b'VP8X', struct.pack('<B3x', 0x10 | 0x02)
+                            + (width - 1).to_bytes(3, 'little') + (height - 1).to_bytes(3, 'little')),
+                _riff_chunk(b'ANIM', struct.pack('<IH', 0, self.loop))]
+        for frame, data in frames:
+            x0, y0, x1, y1 = frame['box']
+            header = b''.join(v.to_bytes(3, 'little') for v in
+                              (x0 // 2, y0 // 2, x1 - x0 - 1, y1 - y0 - 1, frame['duration']))
+            # Flags: do not blend (transparent pixels must replace the canvas), no disposal
+            body.append(_riff_chunk(b'ANMF', header + b'\x02' + data))
+        payload = b'WEBP' + b''.join(body)
+        return b'RIFF' + struct.pack('<I', len(payload)) + payload
+
+    def _apng_container(self, width, height, frames):
+        parts = [PNG_SIGNATURE,
+                 _png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0)),
+                 _png_chunk(b'acTL', struct.pack('>II', len(frames), self.loop))]
+        sequence = 0
+        for index, (frame, data) in enumerate(frames):
+            x0, y0, x1, y1 = frame['box']
+            # dispose_op none, blend_op source
+            parts.append(_png_chunk(b'fcTL', struct.pack('>IIIIIHHBB', sequence, x1 - x0, y1 - y0, x0, y0,
+                                                         frame['duration'], 1000, 0, 0)))
+            sequence += 1
+            if index == 0:
+                parts.append(_png_chunk(b'IDAT', data))
+            else:
+                parts.append(_png_chunk(b'fdAT', struct.pack('>I', sequence) + data))
+                sequence += 1
+        parts.append(_png_chunk(b'IEND', b''))
+        return b''.join(parts)
+
+    def finish(self):
+        """Wait for the encodes, write the file and return a summary dict"""
+        try:
+            if not self.frames:
+                raise Exception("No frames to write")
+            height, width = self.canvas.shape[:2]
+            frames = [(frame, frame['future'].result()) for frame in self.frames]
+            if self.fmt == 'webp':
+                data = self._webp_container(width, height, frames)
+            else:
+                data = self._apng_container(width, height, frames)
+            self.output_path.write_bytes(data)
+        finally:
+            self.pool.shutdown(wait=True)
+
+        full = width * height
+        stored = sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in (f['box'] for f in self.frames))
+        return {
+            'path': str(self.output_path),
+            'source_frames': self.frame_index,
+            'stored_frames': len(self.frames),
+            'stored_pixel_ratio': round(stored / (full * len(self.frames)), 3),
+            'bytes': len(data),
+        }
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Static Media Optimizer
+Shrinks the site's static assets with a process pool:
+- animated GIFs -> VP9 WebM (encoder_profiles) and animated WebP
+- PNG/JPEG images -> responsive PNG/WebP/AVIF sizes
+
+Outputs go to an `optimized/` directory inside each asset root, mirroring
+the source tree. A variant is only kept if it is smaller than its source.
+Unchanged sources are skipped via a content-hash manifest.
+
+Usage:
+    python asset_optimizer.py                      # client/public/assets and creator-studio/assets
+    python asset_optimizer.py path/to/assets --workers 4 --force
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from PIL import Image, ImageSequence
+
+from encoder_profiles import build_encode_cmd
+from manifest_store import file_hash, load_manifest, save_manifest
+from video_probe import get_video_info
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+ASSET_ROOTS = [REPO_ROOT / 'client' / 'public' / 'assets', REPO_ROOT / 'creator-studio' / 'assets']
+OUTPUT_DIR_NAME = 'optimized'
+MANIFEST_NAME = 'manifest.json'
+
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg'}
+ANIMATION_EXTENSIONS = {'.gif'}
+# Images smaller than this are left alone (icons, sprites)
+MIN_IMAGE_BYTES = 32 * 1024
+# srcset widths below the original; the original width is always produced
+RESPONSIVE_WIDTHS = [480, 960, 1920]
+
+# Anything that changes the outputs; a mismatch forces reprocessing
+PIPELINE_PARAMS = {
+    'widths': RESPONSIVE_WIDTHS,
+    'webp_quality': 82,
+    'avif_quality': 60,
+    'anim_webp_quality': 75,
+    'webm_profile': 'balanced',
+}
+
+
+def find_assets(root):
+    """Optimizable files under an asset root, skipping previous outputs"""
+    root = Path(root)
+    extensions = IMAGE_EXTENSIONS | ANIMATION_EXTENSIONS
+    return sorted(p for p in root.rglob('*')
+                  if p.is_file() and p.suffix.lower() in extensions
+                  and OUTPUT_DIR_NAME not in p.relative_to(root).parts[:1])
+
+
+def _keep_if_smaller(path, source_bytes, outputs):
+    """Record `path` if it beat the source, otherwise delete it"""
+    size = path.stat().st_size
+    if size < source_bytes:
+        outputs[path.name] = size
+    else:
+        path.unlink()
+
+
+def _save_image_variants(image, out_base, source_bytes, outputs):
+    """WebP/AVIF at every width, plus PNG fallbacks for the downscaled widths"""
+    has_alpha = image.mode in ('RGBA', 'LA') or 'transparency' in image.info
+    image = image.convert('RGBA' if has_alpha else 'RGB')
+    widths = [w for w in RESPONSIVE_WIDTHS if w < image.width] + [image.width]
+
+    for width in widths:
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        suffix = '' if width == image.width else f'-{width}w'
+        for fmt, kwargs in (('png', {}),
+                            ('webp', {'quality': PIPELINE_PARAMS['webp_quality'], 'method': 4}),
+                            ('avif', {'quality': PIPELINE_PARAMS['avif_quality'], 'speed': 6})):
+            # Re-saving the original PNG at full size costs seconds for a few bytes
+            if fmt == 'png' and width == image.width:
+                continue
+            path = out_base.with_name(f'{out_base.name}{suffix}.{fmt}')
+            resized.save(path, fmt.upper(), **kwargs)
+            _keep_if_smaller(path, source_bytes, outputs)
+
+
+def _save_animation_variants(source, out_base, source_bytes, outputs, ffmpeg='ffmpeg', ffprobe='ffprobe'):
+    """WebM (ffmpeg) and animated WebP (Pillow) versions of a GIF; returns (warnings, skipped variants)"""
+    warnings, skipped = [], []
+    missing = [tool for tool in (ffmpeg, ffprobe) if not shutil.which(tool)]
+    if not missing:
+        info = get_video_info(source)
+        path = out_base.with_name(f'{out_base.name}.webm')
+        cmd = build_encode_cmd('webm', PIPELINE_PARAMS['webm_profile'], source, path, info['fps'],
+                               ffmpeg=ffmpeg, threads=1, input_is_sequence=False)
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise Exception(f"WebM encoding failed: {result.stderr[-500:]}")
+        _keep_if_smaller(path, source_bytes, outputs)
+    else:
+        warnings.append(f"{' and '.join(missing)} not found, WebM skipped")
+        skipped.append('webm')
+
+    with Image.open(source) as gif:
+        frames, durations = [], []
+        for frame in ImageSequence.Iterator(gif):
+            frames.append(frame.convert('RGBA'))
+            durations.append(frame.info.get('duration', 100))
+        path = out_base.with_name(f'{out_base.name}.webp')
+        frames[0].save(path, 'WEBP', save_all=True, append_images=frames[1:], duration=durations,
+                       loop=gif.info.get('loop', 0), quality=PIPELINE_PARAMS['anim_webp_quality'],
+                       method=4)
+    _keep_if_smaller(path, source_bytes, outputs)
+    return warnings, skipped
+
+
+def optimize_asset(source, out_dir):
+    """Worker task: write every variant of one asset; returns a result dict"""
+    source = Path(source)
+    out_base = Path(out_dir) / source.stem
+    out_base.parent.mkdir(parents=True, exist_ok=True)
+    source_bytes = source.stat().st_size
+    start = time.perf_counter()
+    outputs, warnings, skipped = {}, [], []
+    try:
+        if source.suffix.lower() in ANIMATION_EXTENSIONS:
+            warnings, skipped = _save_animation_variants(source, out_base, source_bytes, outputs)
+        else:
+            with Image.open(source) as image:
+                image.load()
+                _save_image_variants(image, out_base, source_bytes, outputs)
+        status, error = 'ok', None
+    except Exception as e:
+        status, error = 'error', str(e)
+
+    # Savings against the best same-size replacement (responsive sizes excluded)
+    full_size = [size for name, size in outputs.items() if Path(name).stem == source.stem]
+    best = min(full_size) if full_size else source_bytes
+    return {
+        'source': str(source),
+        'status': status,
+        'error': error,
+        'warnings': warnings,
+        'skipped': skipped,
+        'source_bytes': source_bytes,
+        'best_bytes': best,
+        'saved_bytes': source_bytes - best,
+        'outputs': {str(Path(out_dir) / name): size for name, size in outputs.items()},
+        'seconds': round(time.perf_counter() - start, 2),
+    }
+
+
+def _is_up_to_date(record, digest):
+    # Variants skipped for a missing tool are retried on the next run
+    return (record is not None and record.get('status') == 'ok' and not record.get('skipped')
+            and record.get('hash') == digest and record.get('params') == PIPELINE_PARAMS
+            and all(os.path.exists(p) for p in record.get('outputs', {})))
+
+
+def optimize_roots(roots, workers=None, force=False, min_bytes=MIN_IMAGE_BYTES):
+    """Optimize every asset under `roots`; returns the per-asset results"""
+    jobs, manifests, hashes = [], {}, {}
+    skipped = 0
+    for root in map(Path, roots):
+        if not root.is_dir():
+            print(f"[WARN] Not a directory, skipping: {root}")
+            continue
+        manifest_path = root / OUTPUT_DIR_NAME / MANIFEST_NAME
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        manifest = manifests[root] = load_manifest(manifest_path)
+        for source in find_assets(root):
+            if source.suffix.lower() in IMAGE_EXTENSIONS and source.stat().st_size < min_bytes:
+                continue
+            relative = source.relative_to(root).as_posix()
+            digest = file_hash(source)
+            if not force and _is_up_to_date(manifest['files'].get(relative), digest):
+                skipped += 1
+                continue
+            hashes[str(source)] = (root, relative, digest)
+            out_dir = root / OUTPUT_DIR_NAME / Path(relative).parent
+            jobs.append((source, out_dir))
+
+    print(f"Assets: {len(jobs)} to optimize, {skipped} unchanged")
+    # Largest first so the pool is not left waiting on one big GIF at the end
+    jobs.sort(key=lambda job: job[0].stat().st_size, reverse=True)
+
+    results = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        futures = [pool.submit(optimize_asset, source, out_dir) for source, out_dir in jobs]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            root, relative, digest = hashes[result['source']]
+            manifests[root]['files'][relative] = {
+                'hash': digest,
+                'params': PIPELINE_PARAMS,
+                'status': result['status'],
+                'skipped': result['skipped'],
+                'source_bytes': result['source_bytes'],
+                'best_bytes': result['best_bytes'],
+                'outputs': result['outputs'],
+            }
+            if result['status'] == 'ok':
+                print(f"  {relative}: {result['source_bytes']:,} -> {result['best_bytes']:,} bytes "
+                      f"(saved {result['saved_bytes']:,}, {len(result['outputs'])} variants)")
+                for warning in result['warnings']:
+                    print(f"     [WARN] {warning}")
+            else:
+                print(f"  [ERROR] {relative}: {result['error']}")
+
+    for root, manifest in manifests.items():
+        save_manifest(manifest, root / OUTPUT_DIR_NAME / MANIFEST_NAME)
+
+    saved = sum(r['saved_bytes'] for r in results if r['status'] == 'ok')
+    total = sum(r['source_bytes'] for r in results if r['status'] == 'ok')
+    print(f"[OK] {len(results)} assets in {time.perf_counter() - start:.1f}s, "
+          f"saved {saved / 1024 / 1024:.1f} MB of {total / 1024 / 1024:.1f} MB")
+    return results
+
+
+def parse_args(argv):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Optimize static images and GIFs')
+    parser.add_argument('roots', nargs='*', default=[str(r) for r in ASSET_ROOTS],
+                        help='Asset directories (default: client/public/assets, creator-studio/assets)')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--force', action='store_true', help='Reprocess unchanged assets')
+    parser.add_argument('--min-bytes', type=int, default=MIN_IMAGE_BYTES,
+                        help='Leave images smaller than this alone')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    args = parse_args(sys.argv[1:])
+    optimize_roots(args.roots, args.workers, args.force, args.min_bytes)
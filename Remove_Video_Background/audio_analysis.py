@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Audio Analysis Worker
+Measures tempo, key and energy of a WAV file and prints them as the
+band generator's AudioMetrics JSON. The file is memory-mapped and analysed
+in fixed-size blocks, so memory use does not grow with track length.
+
+Usage:
+    python audio_analysis.py track.wav [--details]
+"""
+
+import argparse
+import json
+import struct
+import sys
+import time
+
+import numpy as np
+
+N_FFT = 2048
+HOP = 512
+# STFT frames per streaming block (~6 s at 44.1 kHz)
+BLOCK_FRAMES = 512
+TEMPO_RANGE = (60.0, 200.0)
+# Centre and width (octaves) of the tempo prior; halves/doubles are penalised
+TEMPO_PRIOR_BPM = 120.0
+TEMPO_PRIOR_WIDTH = 1.0
+CHROMA_RANGE = (55.0, 5000.0)
+# A tempo is only reported for a clear pulse: the autocorrelation peak must
+# hold this share of the onset envelope's energy...
+MIN_TEMPO_CLARITY = 0.1
+# ...and the repeating part must be a real spectral change, not the ripple of
+# a steady tone (RMS log-magnitude rise per frequency bin)
+MIN_PULSE_STRENGTH = 0.02
+
+KEY_NAMES = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
+# Krumhansl-Kessler key profiles, tonic first
+MAJOR_PROFILE = np.array([6.35, 2.23, 3.48, 2.33, 4.38, 4.09, 2.52, 5.19, 2.39, 3.66, 2.29, 2.88])
+MINOR_PROFILE = np.array([6.33, 2.68, 3.52, 5.38, 2.60, 3.53, 2.54, 4.75, 3.98, 2.69, 3.34, 3.17])
+
+WAVE_FORMAT_PCM = 1
+WAVE_FORMAT_IEEE_FLOAT = 3
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+def read_wav_header(path):
+    """Format and data-chunk location of a RIFF/WAVE file"""
+    with open(path, 'rb') as f:
+        riff = f.read(12)
+        if len(riff) < 12 or riff[:4] != b'RIFF' or riff[8:12] != b'WAVE':
+            raise ValueError(f"Not a RIFF/WAVE file: {path}")
+        fmt = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError(f"No data chunk in WAV file: {path}")
+            chunk_id, size = struct.unpack('<4sI', header)
+            if chunk_id == b'fmt ':
+                body = f.read(size)
+                tag, channels, rate, _, block_align, bits = struct.unpack('<HHIIHH', body[:16])
+                if tag == WAVE_FORMAT_EXTENSIBLE and len(body) >= 26:
+                    tag = struct.unpack('<H', body[24:26])[0]
+                fmt = {'tag': tag, 'channels': channels, 'sample_rate': rate,
+                       'block_align': block_align, 'bits': bits}
+            elif chunk_id == b'data':
+                if fmt is None:
+                    raise ValueError(f"WAV data chunk before fmt chunk: {path}")
+                offset = f.tell()
+                # Streaming writers leave the size unset; use what is on disk
+                f.seek(0, 2)
+                fmt['data_offset'] = offset
+                fmt['data_bytes'] = min(size, f.tell() - offset)
+                fmt['data_bytes'] -= fmt['data_bytes'] % fmt['block_align']
+                return fmt
+            else:
+                f.seek(size, 1)
+            if size % 2:
+                f.seek(1, 1)
+
+
+def _decode(raw, fmt):
+    """Interleaved sample bytes -> mono float32 in [-1, 1]"""
+    bits, tag = fmt['bits'], fmt['tag']
+    if tag == WAVE_FORMAT_IEEE_FLOAT:
+        samples = raw.view('<f4' if bits == 32 else '<f8').astype(np.float32)
+    elif bits == 8:
+        samples = (raw.astype(np.float32) - 128.0) / 128.0
+    elif bits == 16:
+        samples = raw.view('<i2').astype(np.float32) / 32768.0
+    elif bits == 24:
+        triplets = raw.reshape(-1, 3).astype(np.int32)
+        ints = triplets[:, 0] | (triplets[:, 1] << 8) | (triplets[:, 2] << 16)
+        samples = ((ints ^ 0x800000) - 0x800000).astype(np.float32) / 8388608.0
+    elif bits == 32:
+        samples = raw.view('<i4').astype(np.float32) / 2147483648.0
+    else:
+        raise ValueError(f"Unsupported WAV sample format: {bits}-bit tag {tag}")
+    return samples.reshape(-1, fmt['channels']).mean(axis=1)
+
+
+def stream_blocks(path, fmt):
+    """
+    Yield mono blocks that each hold BLOCK_FRAMES whole STFT frames.
+
+    Consecutive blocks overlap by N_FFT - HOP samples so every frame is seen
+    exactly once; only one block is decoded at a time.
+    """
+    data = np.memmap(path, dtype=np.uint8, mode='r', offset=fmt['data_offset'],
+                     shape=(fmt['data_bytes'],))
+    frame_bytes = fmt['block_align']
+    total = fmt['data_bytes'] // frame_bytes
+    step = BLOCK_FRAMES * HOP
+    for start in range(0, max(total - N_FFT, 0) + 1, step):
+        stop = min(start + step + N_FFT - HOP, total)
+        yield _decode(np.asarray(data[start * frame_bytes:stop * frame_bytes]), fmt)
+    del data
+
+
+def estimate_tempo(onset_env, frame_rate):
+    """
+    Tempo (BPM) from the onset-strength autocorrelation, weighted by a tempo
+    prior; None when there is no clear pulse (steady tones, noise)
+    """
+    env = onset_env - onset_env.mean()
+    if len(env) < 4 or not np.any(env):
+        return None
+    size = 1 << int(np.ceil(np.log2(2 * len(env))))
+    spectrum = np.fft.rfft(env, size)
+    autocorr = np.fft.irfft(spectrum * np.conj(spectrum), size)[:len(env)]
+
+    lags = np.arange(len(autocorr), dtype=np.float64)
+    with np.errstate(divide='ignore'):
+        bpm = 60.0 * frame_rate / lags
+    valid = (bpm >= TEMPO_RANGE[0]) & (bpm <= TEMPO_RANGE[1])
+    if not np.any(valid):
+        return None
+    prior = np.exp(-0.5 * (np.log2(bpm[valid] / TEMPO_PRIOR_BPM) / TEMPO_PRIOR_WIDTH) ** 2)
+    lag = int(lags[valid][np.argmax(autocorr[valid] * prior)])
+    pulse = np.sqrt(max(autocorr[lag], 0.0) / len(env))
+    if autocorr[lag] < MIN_TEMPO_CLARITY * autocorr[0] or pulse < MIN_PULSE_STRENGTH * (N_FFT // 2 + 1):
+        return None
+    # Parabolic interpolation between lags for sub-frame tempo resolution
+    if 0 < lag < len(autocorr) - 1:
+        left, centre, right = autocorr[lag - 1:lag + 2]
+        curvature = left - 2 * centre + right
+        if curvature < 0:
+            return 60.0 * frame_rate / (lag + 0.5 * (left - right) / curvature)
+    return 60.0 * frame_rate / lag
+
+
+def estimate_key(chroma):
+    """Best-correlating major/minor key for an accumulated 12-bin chroma vector"""
+    if not np.any(chroma):
+        return None
+    best, best_score = None, -np.inf
+    for mode, profile in (('major', MAJOR_PROFILE), ('minor', MINOR_PROFILE)):
+        # Row k is the profile with its tonic on pitch class k
+        rotations = np.stack([np.roll(profile, k) for k in range(12)])
+        scores = [np.corrcoef(chroma, rotations[k])[0, 1] for k in range(12)]
+        k = int(np.argmax(scores))
+        if scores[k] > best_score:
+            best, best_score = f'{KEY_NAMES[k]} {mode}', scores[k]
+    return best
+
+
+def estimate_energy(loudness_db, onset_rate):
+    """Energy on the generator's 1-10 scale from loudness and onset density"""
+    loud = np.clip((loudness_db + 30.0) / 22.0, 0.0, 1.0)   # -30 dBFS .. -8 dBFS
+    busy = np.clip(onset_rate / 4.0, 0.0, 1.0)              # 0 .. 4 onsets/s
+    return int(np.clip(round(1 + 9 * (0.7 * loud + 0.3 * busy)), 1, 10))
+
+
+def analyze_wav(path):
+    """Analyse a WAV file; returns AudioMetrics plus an `analysis` details dict"""
+    start = time.perf_counter()
+    fmt = read_wav_header(path)
+    rate = fmt['sample_rate']
+
+    window = np.hanning(N_FFT).astype(np.float32)
+    freqs = np.fft.rfftfreq(N_FFT, 1.0 / rate)
+    in_range = (freqs >= CHROMA_RANGE[0]) & (freqs <= CHROMA_RANGE[1])
+    pitch_class = np.round(12 * np.log2(freqs[in_range] / 440.0)).astype(int) % 12
+    pitch_class = (pitch_class + 9) % 12  # A=9 with C=0
+
+    onset_env = []
+    chroma = np.zeros(12)
+    prev_logmag = None
+    sum_squares, peak, sample_count = 0.0, 0.0, 0
+    frame_rms = []
+
+    for block in stream_blocks(path, fmt):
+        if len(block) < N_FFT:
+            block = np.pad(block, (0, N_FFT - len(block)))
+        frames = np.lib.stride_tricks.sliding_window_view(block, N_FFT)[::HOP]
+        # The overlap region is counted by the next block
+        owned = block[:len(frames) * HOP]
+        sum_squares += float(np.dot(owned, owned))
+        sample_count += len(owned)
+        peak = max(peak, float(np.abs(block).max()))
+        frame_rms.append(np.sqrt(np.mean(frames ** 2, axis=1)))
+
+        magnitude = np.abs(np.fft.rfft(frames * window, axis=1))
+        logmag = np.log1p(100.0 * magnitude)
+        if prev_logmag is not None:
+            logmag_prev = np.vstack([prev_logmag[None], logmag[:-1]])
+        else:
+            logmag_prev = np.vstack([logmag[:1], logmag[:-1]])
+        onset_env.append(np.maximum(logmag - logmag_prev, 0.0).sum(axis=1))
+        prev_logmag = logmag[-1]
+
+        power = magnitude[:, in_range] ** 2
+        chroma += np.bincount(pitch_class, weights=power.sum(axis=0), minlength=12)
+
+    if sample_count == 0:
+        raise ValueError(f"WAV file has no audio data: {path}")
+
+    onset_env = np.concatenate(onset_env)
+    frame_rms = np.concatenate(frame_rms)
+    frame_rate = rate / HOP
+    duration = fmt['data_bytes'] / fmt['block_align'] / rate
+
+    loudness_db = 20 * np.log10(max(np.sqrt(sum_squares / sample_count), 1e-10))
+    peak_db = 20 * np.log10(max(peak, 1e-10))
+    # Onsets: frames whose flux stands clearly above the local median
+    threshold = np.median(onset_env) + 2 * onset_env.std()
+    peaks = (onset_env[1:-1] > threshold) & (onset_env[1:-1] >= onset_env[:-2]) & \
+            (onset_env[1:-1] >= onset_env[2:])
+    onset_rate = peaks.sum() / duration if duration else 0.0
+
+    metrics = {}
+    tempo = estimate_tempo(onset_env, frame_rate)
+    if tempo is not None:
+        metrics['tempo'] = int(round(tempo))
+    key = estimate_key(chroma)
+    if key is not None:
+        metrics['key'] = key
+    metrics['energy'] = estimate_energy(loudness_db, onset_rate)
+
+    elapsed = time.perf_counter() - start
+    analysis = {
+        'duration': round(duration, 3),
+        'sample_rate': rate,
+        'channels': fmt['channels'],
+        'loudness_db': round(float(loudness_db), 2),
+        'peak_db': round(float(peak_db), 2),
+        'dynamic_range_db': round(float(20 * np.log10(
+            max(np.percentile(frame_rms, 95), 1e-10) / max(np.percentile(frame_rms, 10), 1e-10))), 2),
+        'onsets_per_second': round(float(onset_rate), 3),
+        'seconds': round(elapsed, 3),
+        'realtime_factor': round(duration / elapsed, 1) if elapsed > 0 else None,
+    }
+    return metrics, analysis
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='Analyse a WAV file into AudioMetrics JSON')
+    parser.add_argument('wav')
+    parser.add_argument('--details', action='store_true',
+                        help='Include loudness and timing details under "analysis"')
+    args = parser.parse_args(argv)
+
+    try:
+        metrics, analysis = analyze_wav(args.wav)
+    except (OSError, ValueError) as e:
+        print(json.dumps({'error': str(e)}))
+        sys.exit(1)
+    if args.details:
+        metrics['analysis'] = analysis
+    print(json.dumps(metrics))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
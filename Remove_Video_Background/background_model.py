@@ -0,0 +1,132 @@
+"""
+Static-Camera Background Subtraction
+For locked-off shots the empty background is estimated as the per-pixel
+temporal median of a few sampled frames; each frame's matte is then a
+vectorised difference against it, cleaned up with morphology. Only tiles
+where the difference is ambiguous (shadows, colours close to the
+background) go through the neural model, or the whole frame when too much
+of it is ambiguous.
+"""
+
+import cv2
+import numpy as np
+
+from chroma_key import border_pixels
+from roi import matte_in_roi
+
+SAMPLE_COUNT = 15           # Frames sampled for the median background
+STATIC_TOLERANCE = 18       # Gray-level difference still counted as "same as background"
+MIN_STATIC_BORDER = 0.7     # Share of each sample's border that must match (camera did not move)
+LOW_THRESHOLD = 12          # Difference below this is background
+HIGH_THRESHOLD = 40         # Difference above this is foreground; in between is ambiguous
+TILE_GRID = 8               # Frames are split into TILE_GRID x TILE_GRID tiles
+AMBIGUOUS_TILE = 0.12       # Share of ambiguous pixels that sends a tile to the model
+MAX_MODEL_TILES = 0.5       # Beyond this share of tiles, run the model on the whole frame
+MAX_FOREGROUND = 0.85       # More "foreground" than this means the lighting changed
+MIN_AGREEMENT = 0.8         # IoU with the model on a sample frame needed to trust the plate
+MORPH_KERNEL = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
+
+
+def estimate_background(frames):
+    """Per-pixel temporal median of the sampled RGB frames"""
+    return np.median(np.stack(frames), axis=0).astype(np.uint8)
+
+
+def is_static(frames, background, tolerance=STATIC_TOLERANCE, min_border=MIN_STATIC_BORDER):
+    """True if every sample's border matches the median background (no pan, zoom or shake)"""
+    gray_background = cv2.cvtColor(background, cv2.COLOR_RGB2GRAY)
+    for frame in frames:
+        diff = cv2.absdiff(cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY), gray_background)
+        if (border_pixels(diff[..., None]) < tolerance).mean() < min_border:
+            return False
+    return True
+
+
+class BackgroundSubtractor:
+    """
+    Difference matte against a fixed background. `matte_fn` (RGB -> RGBA,
+    the neural model) is called only for ambiguous tiles or frames.
+    """
+
+    def __init__(self, background, matte_fn):
+        self.background = background
+        self.matte_fn = matte_fn
+        height, width = background.shape[:2]
+        self.tile_edges_y = np.linspace(0, height, TILE_GRID + 1).astype(int)
+        self.tile_edges_x = np.linspace(0, width, TILE_GRID + 1).astype(int)
+        self.model_tiles = 0
+        self.model_frames = 0
+
+    @classmethod
+    def from_samples(cls, frames, matte_fn):
+        """A subtractor for the clip if the samples show a static camera, else None"""
+        if len(frames) < 3:
+            return None
+        background = estimate_background(frames)
+        if not is_static(frames, background):
+            return None
+        subtractor = cls(background, matte_fn)
+        # A subject that barely moved is baked into the median; check one frame against the model
+        sample = frames[len(frames) // 2]
+        plate_mask = subtractor.difference_alpha(subtractor.difference(sample)) > 127
+        model_mask = np.asarray(matte_fn(sample))[..., 3] > 127
+        union = np.count_nonzero(plate_mask | model_mask)
+        if union and np.count_nonzero(plate_mask & model_mask) < MIN_AGREEMENT * union:
+            return None
+        return subtractor
+
+    def difference(self, frame_rgb):
+        """Largest per-channel absolute difference from the background, uint8"""
+        diff = cv2.absdiff(frame_rgb, self.background)
+        return cv2.max(cv2.max(diff[..., 0], diff[..., 1]), diff[..., 2])
+
+    def difference_alpha(self, diff):
+        """Threshold halfway through the ambiguous band, then clean up speckle and holes"""
+        mask = cv2.compare(diff, (LOW_THRESHOLD + HIGH_THRESHOLD) // 2, cv2.CMP_GT)
+        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, MORPH_KERNEL)
+        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, MORPH_KERNEL, iterations=2)
+        return cv2.GaussianBlur(mask, (5, 5), 0)
+
+    def matte(self, frame_rgb, box=None):
+        """
+        RGBA for one frame; ambiguous tiles are matted by the model. With a
+        subject `box` (x0, y0, x1, y1) the model only sees the part inside it
+        and everything outside is background.
+        """
+        def model(rgb):
+            return np.asarray(self.matte_fn(rgb) if box is None else matte_in_roi(rgb, box, self.matte_fn))
+
+        diff = self.difference(frame_rgb)
+        foreground = cv2.compare(diff, HIGH_THRESHOLD, cv2.CMP_GT)
+        if cv2.countNonZero(foreground) > MAX_FOREGROUND * foreground.size:
+            # Lighting or exposure change: the background model no longer applies
+            self.model_frames += 1
+            return model(frame_rgb)
+
+        alpha = self.difference_alpha(diff)
+        ambiguous = cv2.inRange(diff, LOW_THRESHOLD, HIGH_THRESHOLD)
+        tile_share = cv2.resize(ambiguous.astype(np.float32) * (1.0 / 255.0), (TILE_GRID, TILE_GRID),
+                                interpolation=cv2.INTER_AREA)
+        rows, cols = np.nonzero(tile_share > AMBIGUOUS_TILE)
+        if len(rows) > MAX_MODEL_TILES * TILE_GRID * TILE_GRID:
+            self.model_frames += 1
+            return model(frame_rgb)
+
+        if len(rows):
+            # One model call on the box around all ambiguous tiles (clipped to the subject box),
+            # pasted back tile by tile
+            y0, y1 = self.tile_edges_y[rows.min()], self.tile_edges_y[rows.max() + 1]
+            x0, x1 = self.tile_edges_x[cols.min()], self.tile_edges_x[cols.max() + 1]
+            model_alpha = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+            bx0, by0, bx1, by1 = box or (x0, y0, x1, y1)
+            cx0, cy0, cx1, cy1 = max(x0, bx0), max(y0, by0), min(x1, bx1), min(y1, by1)
+            if cx0 < cx1 and cy0 < cy1:
+                model_alpha[cy0 - y0:cy1 - y0, cx0 - x0:cx1 - x0] = \
+                    np.asarray(self.matte_fn(frame_rgb[cy0:cy1, cx0:cx1]))[..., 3]
+            for row, col in zip(rows, cols):
+                ty0, ty1 = self.tile_edges_y[row], self.tile_edges_y[row + 1]
+                tx0, tx1 = self.tile_edges_x[col], self.tile_edges_x[col + 1]
+                alpha[ty0:ty1, tx0:tx1] = model_alpha[ty0 - y0:ty1 - y0, tx0 - x0:tx1 - x0]
+            self.model_tiles += len(rows)
+
+        return cv2.merge([frame_rgb, alpha])
@@ -7,7 +7,6 @@ Outputs JSON progress to stdout for real-time UI updates
 import cv2
 import numpy as np
 from PIL import Image
-from rembg import remove
 from pathlib import Path
 import subprocess
 import json
@@ -15,8 +14,27 @@ import sys
 import tempfile
 import os
 import traceback
+import argparse
+import time
+import itertools
+import shutil
 
-def emit_progress(step, message, progress=None, total=None):
+from encoder_profiles import PROFILE_ORDER, build_encode_cmd, select_profile
+from edge_refine import AlphaRefiner
+from video_probe import get_video_info
+from memory_planner import allocate_frames, plan_execution, resolve_budget
+from job_control import EXIT_CODES, JobCancelled, JobController
+from segmented_output import SegmentWriter, playlist_path_for
+from roi import estimate_subject_boxes, union_box, matte_in_roi, write_roi_metadata
+from thumbnails import ThumbnailCollector
+from chroma_key import ChromaKeyer, sample_frames
+from background_model import BackgroundSubtractor, SAMPLE_COUNT as BACKGROUND_SAMPLES
+from animated_output import ANIMATED_FORMATS, AnimationWriter, animated_path_for
+from stream_ingest import StreamSource
+from job_scheduler import JobScheduler, job_work, plan_for_user
+from frame_range import FrameRange, RangedCapture
+
+def emit_progress(step, message, progress=None, total=None, **extra):
     """Emit JSON progress update to stdout"""
     data = {
         'step': step,
@@ -25,165 +43,481 @@ def emit_progress(step, message, progress=None, total=None):
         'total': total,
         'percent': round((progress / total * 100), 1) if (progress is not None and total is not None and total != 0) else None
     }
+    data.update(extra)
     print(json.dumps(data), flush=True)
 
-def get_video_info(video_path):
-    """Get video metadata using ffprobe"""
-    cmd = [
-        'ffprobe', '-v', 'quiet', '-print_format', 'json',
-        '-show_streams', '-show_format', video_path
-    ]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    info = json.loads(result.stdout)
-
-    video_stream = next(s for s in info['streams'] if s['codec_type'] == 'video')
-
-    fps_parts = video_stream['r_frame_rate'].split('/')
-    fps = float(fps_parts[0]) / float(fps_parts[1])
-
-    return {
-        'width': int(video_stream['width']),
-        'height': int(video_stream['height']),
-        'fps': fps,
-        'duration': float(info['format']['duration'])
-    }
+# Encoder profile used per format when none is requested
+DEFAULT_PROFILES = {'webm': 'balanced', 'mov': 'balanced', 'gif': 'fast'}
+
+# Quick preview settings: a few small frames matted with the fastest model
+PREVIEW_MODEL = 'u2netp'
+PREVIEW_MAX_FRAMES = 24
+PREVIEW_FPS = 6
+PREVIEW_SIZE = 240
+
+# rembg sessions are expensive to create, so keep one per model
+_sessions = {}
+
+def get_session(model='u2net'):
+    """Return a warm rembg session for the model"""
+    if model not in _sessions:
+        # rembg loads onnxruntime; import it on first use so --help and argument errors stay fast
+        from rembg import new_session
+        _sessions[model] = new_session(model)
+    return _sessions[model]
+
+def mask_low_res(frame_rgb):
+    """Alpha mask for a small RGB frame (used for ROI tracking)"""
+    from rembg import remove
+    return np.array(remove(Image.fromarray(frame_rgb), session=get_session(), only_mask=True))
+
+def matte_frame(frame_rgb, model='u2net'):
+    """Remove background from an RGB frame, returning an RGBA array"""
+    from rembg import remove
+    return np.array(remove(Image.fromarray(frame_rgb), session=get_session(model)))
+
+def preview_path_for(output_path, fmt):
+    """Preview file path next to the main output"""
+    output_path = Path(output_path)
+    return output_path.with_name(f'{output_path.stem}_preview.{fmt}')
+
+def _capture_preview_frames(input_path, frame_range, step, size, job):
+    """Every `step`-th selected frame of a file, resized, as RGB"""
+    cap = RangedCapture(input_path, frame_range)
+    try:
+        index = 0
+        while True:
+            job.check()
+            # grab() skips frames without converting them
+            if not cap.grab():
+                break
+            if index % step == 0:
+                ret, frame = cap.retrieve()
+                if not ret:
+                    break
+                small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+                yield cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
+            index += 1
+    finally:
+        cap.release()
+
+def _follow_preview_frames(input_path, frame_range, step, size, job):
+    """
+    The same frames from a file that is still growing: a second small ffmpeg
+    decode picks and scales them, so the main stream is left untouched
+    """
+    frame_range = frame_range or FrameRange()
+    stride = step * frame_range.step
+    select = f'gte(n,{frame_range.start})*not(mod(n-{frame_range.start},{stride}))'
+    if frame_range.end is not None:
+        select += f'*lt(n,{frame_range.end})'
+    source = StreamSource(input_path, job, follow=True, size=size, max_frames=PREVIEW_MAX_FRAMES,
+                          video_filter=f"select='{select}',scale={size[0]}:{size[1]}:flags=area")
+    source.open()
+    yield from source.frames()
+
+def create_preview(input_path, info, preview_path, temp_dir, job, frame_range=None, follow=False):
+    """Matte a small, low-fps subset of the selected frames with the fastest model and encode it"""
+    fmt = preview_path.suffix.lstrip('.')
+    step = max(1, round(info['fps'] / PREVIEW_FPS))
+    scale = min(1.0, PREVIEW_SIZE / max(info['width'], info['height']))
+    size = (max(2, round(info['width'] * scale)) & ~1, max(2, round(info['height'] * scale)) & ~1)
+
+    preview_dir = temp_dir / 'preview'
+    preview_dir.mkdir(exist_ok=True)
+
+    read_frames = _follow_preview_frames if follow else _capture_preview_frames
+    frames = read_frames(input_path, frame_range, step, size, job)
+    written = 0
+    try:
+        for small_rgb in itertools.islice(frames, PREVIEW_MAX_FRAMES):
+            rgba = matte_frame(small_rgb, PREVIEW_MODEL)
+            Image.fromarray(rgba, 'RGBA').save(str(preview_dir / f"frame_{written:05d}.png"), 'PNG')
+            written += 1
+    finally:
+        frames.close()
 
-def process_video_with_transparency(input_path, output_webm, output_mov=None, output_gif=None):
+    if written == 0:
+        return None
+
+    cmd = build_encode_cmd(fmt, 'fast', preview_dir / 'frame_%05d.png', preview_path,
+                           info['fps'] / step, size[0], size[1])
+    result = job.run(cmd)
+    for frame_file in preview_dir.glob('*.png'):
+        frame_file.unlink()
+    preview_dir.rmdir()
+    if result.returncode != 0:
+        print(f"Preview encoding failed: {result.stderr}", file=sys.stderr)
+        return None
+    return preview_path
+
+def stream_frames(cap, job, thumbs=None):
+    """Yield RGB frames from an open capture one at a time, then release it"""
+    try:
+        i = 0
+        while True:
+            job.check()
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            if thumbs:
+                thumbs.add(i, frame_rgb)
+            i += 1
+            yield frame_rgb
+    finally:
+        cap.release()
+
+def write_thumbnails(thumbs, output_path):
+    """Write the poster/sprite/index collected during decode and announce them"""
+    paths = thumbs.write(output_path)
+    if paths:
+        emit_progress('thumbnails', 'Poster and thumbnails ready', 1, 1,
+                      poster_path=str(paths['poster']), sprite_path=str(paths['sprite']),
+                      thumbnails_path=str(paths['index']))
+    else:
+        emit_progress('thumbnails', 'Thumbnails unavailable', 1, 1)
+
+def process_video_with_transparency(input_path, output_webm, output_mov=None, output_gif=None,
+                                    track_roi=False, crop_output=False,
+                                    encoder_profile=None, target_seconds=None, preview=False,
+                                    segment_seconds=None, refine=False, deadline=None,
+                                    memory_budget_mb=None, thumbnails=False, keyer='auto',
+                                    background_model='auto', output_webp=None, output_apng=None,
+                                    crop_changes=True, follow=False, schedule=False, user_id=None,
+                                    subscription_plan=None, max_jobs=None, start=None, end=None,
+                                    duration=None, every_nth=1):
     """Process video and create outputs with transparency"""
+    job_start = time.monotonic()
+    animated_outputs = {fmt: path for fmt, path in [('webp', output_webp), ('apng', output_apng)] if path}
+    ffmpeg_outputs = [(fmt, path) for fmt, path in [('webm', output_webm), ('mov', output_mov), ('gif', output_gif)]
+                      if path]
+    primary_output = output_webm or output_mov or output_gif or output_webp or output_apng
+    # stdin ('-') or a file still being uploaded (follow) is decoded as it arrives
+    stream_source = None
+    # Worker slot from the shared queue, when scheduling is on
+    scheduler = JobScheduler(pool_size=max_jobs) if schedule else None
+    ticket = None
+    completed = False
+    temp_dir = None
+    # SIGTERM/SIGINT or the deadline stop the job at the next checkpoint
+    job = JobController(deadline)
     try:
         # STEP 1: Reading metadata
         emit_progress('step1', 'Reading video metadata...', 0, 1)
-        info = get_video_info(input_path)
-        emit_progress('step1', f"Video: {info['width']}x{info['height']}, {info['fps']} fps", 1, 1)
+        if input_path == '-' or follow:
+            if track_roi or crop_output:
+                raise Exception("--roi and --crop-output need the whole file and cannot be used with streaming input")
+            # The stream header replaces the ffprobe pass
+            stream_source = StreamSource(input_path, job, follow=follow)
+            info = stream_source.open()
+        else:
+            info = get_video_info(input_path)
+
+        # Only the selected range is decoded, matted and encoded; from here on `info`
+        # describes the output (fps divided by the stride, range length)
+        frame_range = FrameRange.from_times(info['fps'], start, end, duration, every_nth, info['total_frames'])
+        if not frame_range.is_full:
+            emit_progress('step1', f"Processing {frame_range.describe(info['fps'])}", 0, 1,
+                          start_time=frame_range.start / info['fps'],
+                          end_time=frame_range.end / info['fps'] if frame_range.end is not None else None,
+                          every_nth=frame_range.step)
+            info = frame_range.apply(info)
+
+        # Decide how frames are held so the job fits the memory budget
+        plan = plan_execution(info['width'], info['height'], info['total_frames'] or 0,
+                              resolve_budget(memory_budget_mb),
+                              needs_all_frames=track_roi or crop_output, holds_output=False)
+        if stream_source:
+            plan['strategy'] = 'streaming'
+        emit_progress('step1', f"Video: {info['width']}x{info['height']}, {info['fps']} fps", 1, 1,
+                      plan=plan)
+
+        # Wait for a worker slot: higher plans first, fair share between users, short jobs first
+        if scheduler:
+            if subscription_plan is None:
+                subscription_plan = plan_for_user(user_id) if user_id is not None else 'free'
+            queued_at = time.monotonic()
+
+            def report_queue(position, wait_seconds):
+                emit_progress('queue', f'Waiting for a worker: position {position} in queue, '
+                              f'about {wait_seconds:.0f}s', 0, 1,
+                              queue_position=position, wait_estimate=round(wait_seconds, 1))
+
+            ticket = scheduler.acquire(job, user_id if user_id is not None else os.getpid(), subscription_plan,
+                                       job_work(info), on_wait=report_queue)
+            emit_progress('queue', 'Worker slot acquired', 1, 1, queue_position=0,
+                          waited_seconds=round(time.monotonic() - queued_at, 1))
+            # The deadline and the encode-time target limit processing; time spent queued does not count
+            job.restart_deadline()
+            job_start = time.monotonic()
+
+        # Per-job workspace in the system temp directory: concurrent jobs must not share
+        # frame PNGs, preview frames or the memmap
+        temp_dir = Path(tempfile.mkdtemp(prefix='transparent_frames_'))
+        job.register_cleanup(temp_dir)
+
+        # Optional quick preview so the user sees a result within seconds
+        if preview and input_path == '-':
+            # stdin can only be read once
+            emit_progress('preview', 'Preview unavailable for input read from stdin', 1, 1)
+        elif preview:
+            emit_progress('preview', 'Rendering quick preview...', 0, 1)
+            preview_fmt = 'gif' if output_gif and not (output_webm or output_mov) else 'webm'
+            preview_path = create_preview(input_path, info,
+                                          preview_path_for(primary_output, preview_fmt),
+                                          temp_dir, job, frame_range, follow=stream_source is not None)
+            if preview_path:
+                emit_progress('preview', 'Preview ready', 1, 1, preview_path=str(preview_path))
+            else:
+                emit_progress('preview', 'Preview unavailable', 1, 1)
 
         # STEP 2: Extract frames
-        cap = cv2.VideoCapture(input_path)
-        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        if stream_source:
+            # Estimated from the header duration; None if the stream does not say
+            frame_count = info['total_frames']
+        else:
+            # Seeks to the range start and skips unselected frames without converting them
+            cap = RangedCapture(input_path, frame_range)
+            frame_count = frame_range.count(int(cap.get(cv2.CAP_PROP_FRAME_COUNT)))
 
-        emit_progress('step2', f'Extracting {frame_count} frames...', 0, frame_count)
+        # Poster and sprite sheet are sampled from this decode, not a second pass
+        thumbs = None
+        if thumbnails and frame_count:
+            thumbs = ThumbnailCollector(frame_count, info['fps'], info['width'], info['height'])
+        elif thumbnails:
+            emit_progress('thumbnails', 'Thumbnails unavailable: stream length unknown', 1, 1)
 
-        # Use system temp directory for cross-platform compatibility
-        temp_dir = Path(tempfile.gettempdir()) / 'transparent_frames'
-        temp_dir.mkdir(exist_ok=True)
+        if stream_source:
+            # A stream cannot seek: frames before the range are decoded and dropped
+            frames_data = frame_range.select(stream_source.frames())
+            if thumbs:
+                frames_data = (thumbs.add(i, frame) or frame for i, frame in enumerate(frames_data))
+            emit_progress('step2', 'Decoding the stream as it arrives...', 0, frame_count)
+        elif plan['strategy'] == 'streaming':
+            # Frames are decoded one at a time inside the matting loop
+            frames_data = stream_frames(cap, job, thumbs)
+            emit_progress('step2', f'Streaming {frame_count} frames through the model...', frame_count, frame_count)
+        else:
+            emit_progress('step2', f'Extracting {frame_count} frames...', 0, frame_count)
 
-        frames_data = []
-        for i in range(frame_count):
-            ret, frame = cap.read()
-            if not ret:
-                break
+            # RAM or a disk-backed memmap, as planned
+            frames_data = allocate_frames((frame_count, info['height'], info['width'], 3),
+                                          plan['strategy'], temp_dir)
+            extracted = 0
+            for i in range(frame_count):
+                job.check()
+                ret, frame = cap.read()
+                if not ret:
+                    break
 
-            # Convert BGR to RGB and store
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            frames_data.append(frame_rgb)
+                # Convert BGR to RGB straight into the frame block
+                cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frames_data[i])
+                if thumbs:
+                    thumbs.add(i, frames_data[i])
+                extracted += 1
 
-            # Emit progress every 10 frames or at end
-            if i % 10 == 0 or i == frame_count - 1:
-                emit_progress('step2', f'Extracting frame {i+1}/{frame_count}...', i+1, frame_count)
+                # Emit progress every 10 frames or at end
+                if i % 10 == 0 or i == frame_count - 1:
+                    emit_progress('step2', f'Extracting frame {i+1}/{frame_count}...', i+1, frame_count)
 
-        cap.release()
+            cap.release()
+            frames_data = frames_data[:extracted]
+            if thumbs:
+                write_thumbnails(thumbs, primary_output)
+                thumbs = None
+
+        # Optional: track the subject so matting only sees the region it occupies
+        boxes = None
+        crop_box = None
+        if track_roi or crop_output:
+            emit_progress('step3', 'Tracking subject region...', 0, frame_count)
+            boxes = estimate_subject_boxes(frames_data, mask_low_res)
+            if crop_output:
+                crop_box = union_box(boxes)
+            x0, y0, x1, y1 = union_box(boxes)
+            emit_progress('step3', f'Subject region: {x1 - x0}x{y1 - y0} at ({x0}, {y0})', 0, frame_count)
+
+        # Optional progressive WebM: encode playable chunks while matting continues
+        segment_writer = None
+        if segment_seconds and output_webm:
+            def announce_segment(segment):
+                emit_progress('segment', f"Segment {segment['index'] + 1} ready", segment['index'] + 1, None,
+                              segment_path=segment['path'], start_time=segment['start_time'],
+                              duration=segment['duration'],
+                              playlist_path=str(playlist_path_for(output_webm)))
+
+            segment_profile = encoder_profile if encoder_profile not in (None, 'auto') else DEFAULT_PROFILES['webm']
+            segment_writer = SegmentWriter(output_webm, temp_dir / 'frame_%05d.png', info['fps'],
+                                           round(segment_seconds * info['fps']), segment_profile,
+                                           on_segment=announce_segment, runner=job.run)
+
+        # Optional edge cleanup (guided filter, feathering, temporal EMA)
+        refiner = AlphaRefiner() if refine else None
+
+        # Solid/uniform backgrounds are keyed without the model, static cameras are
+        # matted against a median background; unsure frames or tiles still use the model
+        chroma_keyer = None
+        subtractor = None
+        samples = []
+        if stream_source:
+            # The first frames of a stream always show the subject in the same place, so a
+            # median plate from them would contain it: only the keyer is tried on streams
+            background_model = 'off'
+        if stream_source and keyer == 'auto':
+            # No seeking in a stream: look at its first frames, then put them back
+            samples = list(itertools.islice(frames_data, BACKGROUND_SAMPLES))
+            frames_data = itertools.chain(samples, frames_data)
+        elif keyer == 'auto' or background_model == 'auto':
+            samples = sample_frames(input_path, BACKGROUND_SAMPLES, frame_range.start, frame_range.end)
+        if keyer == 'auto':
+            chroma_keyer = ChromaKeyer.from_samples(samples[::3])
+            if chroma_keyer:
+                emit_progress('step3', f'Uniform {chroma_keyer.describe()} background detected, '
+                              'keying without the AI model', 0, frame_count)
+        if chroma_keyer is None and background_model == 'auto':
+            subtractor = BackgroundSubtractor.from_samples(samples, matte_frame)
+            if subtractor:
+                emit_progress('step3', 'Static camera detected, matting against the background plate',
+                              0, frame_count)
+        samples = None
+        keyed_count = 0
+
+        # Animated WebP/APNG frames are compressed on a thread pool straight from memory
+        animation_writers = {fmt: AnimationWriter(animated_path_for(path, fmt), fmt, info['fps'],
+                                                  crop_changes=crop_changes)
+                             for fmt, path in animated_outputs.items()}
 
         # STEP 3: AI Background Removal
-        emit_progress('step3', f'Removing background from {frame_count} frames with AI...', 0, frame_count)
+        emit_progress('step3', f'Removing background from {frame_count or "streamed"} frames with AI...',
+                      0, frame_count)
 
+        processed_count = 0
         for i, frame_rgb in enumerate(frames_data):
-            pil_image = Image.fromarray(frame_rgb)
+            job.check()
+            # Every model call, including the keyer and plate fallbacks, stays inside the subject box
+            roi_box = boxes[i] if boxes is not None and track_roi else None
+            if chroma_keyer:
+                rgba = np.empty((*frame_rgb.shape[:2], 4), dtype=np.uint8)
+                if chroma_keyer.matte_into(frame_rgb, rgba):
+                    keyed_count += 1
+                elif roi_box:
+                    rgba = matte_in_roi(frame_rgb, roi_box, matte_frame)
+                else:
+                    rgba = matte_frame(frame_rgb)
+            elif subtractor:
+                rgba = subtractor.matte(frame_rgb, roi_box)
+            elif roi_box:
+                # Remove background on the cropped region only - returns RGBA
+                rgba = matte_in_roi(frame_rgb, roi_box, matte_frame)
+            else:
+                # Remove background - returns RGBA
+                rgba = matte_frame(frame_rgb)
+
+            if refiner:
+                rgba = refiner.refine(rgba, frame_rgb)
 
-            # Remove background - returns RGBA
-            output = remove(pil_image)
+            if crop_box is not None:
+                x0, y0, x1, y1 = crop_box
+                rgba = rgba[y0:y1, x0:x1]
 
-            # Save as PNG with alpha
-            frame_path = temp_dir / f"frame_{i:05d}.png"
-            output.save(str(frame_path), 'PNG')
+            for writer in animation_writers.values():
+                writer.add(rgba)
+
+            # Save as PNG with alpha for the ffmpeg encoders
+            if ffmpeg_outputs:
+                frame_path = temp_dir / f"frame_{i:05d}.png"
+                Image.fromarray(rgba, 'RGBA').save(str(frame_path), 'PNG')
+                if segment_writer:
+                    segment_writer.frame_saved(i)
+            processed_count += 1
 
             # Emit progress every 5 frames or at end (AI is slow, update frequently)
-            if i % 5 == 0 or i == frame_count - 1:
-                emit_progress('step3', f'AI processing frame {i+1}/{frame_count}...', i+1, frame_count)
+            if i % 5 == 0 or i + 1 == frame_count:
+                emit_progress('step3', f'AI processing frame {i+1}/{frame_count or "?"}...', i+1, frame_count)
+
+        if chroma_keyer:
+            emit_progress('step3', f'Keyed {keyed_count}/{processed_count} frames, '
+                          f'{processed_count - keyed_count} sent to the AI model', processed_count, frame_count,
+                          keyed_frames=keyed_count)
+        if subtractor:
+            emit_progress('step3', f'Background plate: model used on {subtractor.model_frames} whole frames '
+                          f'and {subtractor.model_tiles} tiles', processed_count, frame_count,
+                          model_frames=subtractor.model_frames, model_tiles=subtractor.model_tiles)
+
+        # Streaming decode finishes with the matting loop
+        if thumbs:
+            write_thumbnails(thumbs, primary_output)
 
         # STEP 4: Encoding
-        total_encodes = sum([1 for x in [output_webm, output_mov, output_gif] if x])
+        total_encodes = len(ffmpeg_outputs) + len(animation_writers)
         current_encode = 0
 
-        # Create WebM
-        if output_webm:
-            current_encode += 1
-            emit_progress('step4', f'Encoding WebM ({current_encode}/{total_encodes})...', current_encode, total_encodes)
-            webm_cmd = [
-                'ffmpeg', '-y',
-                '-framerate', str(info['fps']),
-                '-i', str(temp_dir / 'frame_%05d.png'),
-                '-c:v', 'libvpx-vp9',
-                '-pix_fmt', 'yuva420p',
-                '-auto-alt-ref', '0',
-                '-lossless', '0',
-                '-crf', '30',
-                '-b:v', '0',
-                output_webm
-            ]
-            result = subprocess.run(webm_cmd, capture_output=True, text=True)
-            if result.returncode != 0:
-                print(f"WebM encoding failed: {result.stderr}", file=sys.stderr)
-                emit_progress('step4', 'WebM encoding failed', 0, 1)
-                return
+        out_width, out_height = info['width'], info['height']
+        if crop_box is not None:
+            out_width, out_height = crop_box[2] - crop_box[0], crop_box[3] - crop_box[1]
 
-        # Create MOV
-        if output_mov:
+        for fmt, output_path in ffmpeg_outputs:
             current_encode += 1
-            emit_progress('step4', f'Encoding MOV ({current_encode}/{total_encodes})...', current_encode, total_encodes)
-            mov_cmd = [
-                'ffmpeg', '-y',
-                '-framerate', str(info['fps']),
-                '-i', str(temp_dir / 'frame_%05d.png'),
-                '-c:v', 'prores_ks',
-                '-profile:v', '4444',
-                '-pix_fmt', 'yuva444p10le',
-                '-vendor', 'apl0',
-                output_mov
-            ]
-            result = subprocess.run(mov_cmd, capture_output=True, text=True)
+
+            # Segmented WebM only needs its last chunk and a stream-copy join
+            if fmt == 'webm' and segment_writer:
+                emit_progress('step4', f'Joining WebM segments ({current_encode}/{total_encodes})...',
+                              current_encode, total_encodes)
+                segment_writer.finish()
+                continue
+
+            # Pick the encoder profile: explicit, deadline-driven, or the format default
+            if encoder_profile and encoder_profile != 'auto':
+                profile = encoder_profile
+            elif target_seconds is not None:
+                remaining = target_seconds - (time.monotonic() - job_start)
+                budget = remaining / (total_encodes - current_encode + 1)
+                profile = select_profile(fmt, processed_count, out_width, out_height, budget)
+            else:
+                profile = DEFAULT_PROFILES[fmt]
+
+            emit_progress('step4', f'Encoding {fmt.upper()} [{profile}] ({current_encode}/{total_encodes})...',
+                          current_encode, total_encodes)
+            cmd = build_encode_cmd(fmt, profile, temp_dir / 'frame_%05d.png', output_path, info['fps'],
+                                   out_width, out_height)
+            result = job.run(cmd)
             if result.returncode != 0:
-                print(f"MOV encoding failed: {result.stderr}", file=sys.stderr)
-                emit_progress('step4', 'MOV encoding failed', 0, 1)
+                print(f"{fmt.upper()} encoding failed: {result.stderr}", file=sys.stderr)
+                emit_progress('step4', f'{fmt.upper()} encoding failed', 0, 1)
                 return
 
-        # Create GIF (simplified)
-        if output_gif:
+        for fmt, writer in animation_writers.items():
             current_encode += 1
-            emit_progress('step4', f'Encoding GIF ({current_encode}/{total_encodes})...', current_encode, total_encodes)
-            gif_fps = min(info['fps'], 15)
-            gif_cmd = [
-                'ffmpeg', '-y',
-                '-framerate', str(info['fps']),
-                '-i', str(temp_dir / 'frame_%05d.png'),
-                '-vf', f'fps={gif_fps}',
-                output_gif
-            ]
-            result = subprocess.run(gif_cmd, capture_output=True, text=True)
-            if result.returncode != 0:
-                print(f"GIF encoding failed: {result.stderr}", file=sys.stderr)
-                emit_progress('step4', 'GIF encoding failed', 0, 1)
-                return
+            emit_progress('step4', f'Assembling animated {fmt.upper()} ({current_encode}/{total_encodes})...',
+                          current_encode, total_encodes)
+            summary = writer.finish()
+            emit_progress('step4', f"Animated {fmt.upper()}: {summary['stored_frames']} frames, "
+                          f"{summary['bytes'] / 1024:.0f} KB", current_encode, total_encodes, animation=summary)
+
+        # Record where the cropped output sits in the source frame
+        if crop_box is not None:
+            for output_path in [output_webm, output_mov, output_gif, output_webp, output_apng]:
+                if output_path:
+                    write_roi_metadata(output_path, crop_box, info['width'], info['height'])
 
         # STEP 5: Cleanup
         emit_progress('step5', 'Cleaning up temporary files...', 0, 1)
-        try:
-            for frame_file in temp_dir.glob('*.png'):
-                try:
-                    frame_file.unlink()
-                except:
-                    pass  # Ignore file deletion errors
-
-            # Try to remove directory, but don't fail if it's not empty
-            try:
-                temp_dir.rmdir()
-            except:
-                pass  # Ignore directory removal errors
-        except Exception as e:
-            print(f"Warning: Cleanup incomplete: {e}", flush=True)
+        frames_data = None  # Release the memmap (if any) so its file can be removed
+        shutil.rmtree(temp_dir, ignore_errors=True)
 
         emit_progress('step5', 'Cleanup complete', 1, 1)
 
         # STEP 6: Complete!
         emit_progress('step6', 'Processing complete! Your video is ready.', 1, 1)
+        completed = True
+
+    except JobCancelled as e:
+        # Stop children, drop the workspace and report why the job ended
+        job.cleanup()
+        message = 'Processing cancelled' if e.reason == 'cancelled' else 'Processing timed out'
+        emit_progress(e.reason, message, 0, 1)
+        sys.exit(EXIT_CODES[e.reason])
 
     except Exception as e:
         # Emit error progress and traceback
@@ -193,21 +527,101 @@ def process_video_with_transparency(input_path, output_webm, output_mov=None, ou
         emit_progress('error', error_msg, 0, 1)
         sys.exit(1)
 
-if __name__ == '__main__':
-    if len(sys.argv) < 4:
-        print(json.dumps({'error': 'Invalid arguments'}), flush=True)
-        sys.exit(1)
+    finally:
+        # Failed or aborted jobs must not leave their workspace behind either
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        if ticket:
+            scheduler.release(ticket, completed=completed)
+
+def parse_args(argv):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Remove video background with JSON progress output')
+    parser.add_argument('input_video', help='Input video, or - to read it from stdin')
+    parser.add_argument('output_path')
+    parser.add_argument('format', type=str.lower)
+    parser.add_argument('--roi', action='store_true',
+                        help='Track the subject and run matting on the cropped region only')
+    parser.add_argument('--crop-output', action='store_true',
+                        help='Crop the output to the subject region and write <output>.roi.json')
+    parser.add_argument('--encoder-profile', choices=PROFILE_ORDER + ['auto'],
+                        help='Encoder profile (default: per-format default, or auto with --target-seconds)')
+    parser.add_argument('--target-seconds', type=float,
+                        help='Target total job time; picks the best encoder profile that fits')
+    parser.add_argument('--preview', action='store_true',
+                        help='Emit a small low-fps preview (<output>_preview.webm/gif) before the full job')
+    parser.add_argument('--segment-seconds', type=float,
+                        help='WebM only: encode playable chunks of this length as matting progresses')
+    parser.add_argument('--refine', action='store_true',
+                        help='Refine mask edges (guided filter, feathering, temporal smoothing)')
+    parser.add_argument('--deadline', type=float,
+                        help='Abort with a timeout event if the job runs longer than this many seconds')
+    parser.add_argument('--memory-budget', type=float, metavar='MB',
+                        help='Memory budget for planning (default: BG_MEMORY_BUDGET_MB or 80%% of available)')
+    parser.add_argument('--keyer', choices=['auto', 'off'], default='auto',
+                        help='auto: key solid/uniform backgrounds without the AI model when detected')
+    parser.add_argument('--background-model', choices=['auto', 'off'], default='auto',
+                        help='auto: on static-camera clips, matte against a median background plate')
+    parser.add_argument('--crop-changes', action=argparse.BooleanOptionalAction, default=True,
+                        help='WebP/APNG: store only the changed rectangle of each frame')
+    parser.add_argument('--follow', action='store_true',
+                        help='Input is still being written: decode as it grows, until <input>.done appears')
+    parser.add_argument('--schedule', action='store_true',
+                        help='Wait for a slot in the shared job queue before processing')
+    parser.add_argument('--user-id', help='Queue owner, for fair share between users')
+    parser.add_argument('--plan', help='Subscription plan (queue priority); default: looked up in Users/users.csv')
+    parser.add_argument('--max-jobs', type=int,
+                        help='Concurrent jobs allowed by the queue (default: BG_MAX_CONCURRENT_JOBS or half the cores)')
+    parser.add_argument('--start', type=float, help='Start of the range to process, in seconds')
+    range_end = parser.add_mutually_exclusive_group()
+    range_end.add_argument('--end', type=float, help='End of the range to process, in seconds')
+    range_end.add_argument('--duration', type=float, help='Length of the range to process, in seconds')
+    parser.add_argument('--every-nth', type=int, default=1,
+                        help='Process every n-th frame of the range (output frame rate is divided by n)')
+    parser.add_argument('--thumbnails', action='store_true',
+                        help='Write <output>_poster.jpg, _sprite.jpg and _thumbnails.json from the decode pass')
+    return parser.parse_args(argv)
 
-    input_video = sys.argv[1]
-    output_path = sys.argv[2]
-    format_type = sys.argv[3].lower()
+def main(argv):
+    """Command line entry point"""
+    args = parse_args(argv)
+    options = {
+        'track_roi': args.roi,
+        'crop_output': args.crop_output,
+        'encoder_profile': args.encoder_profile,
+        'target_seconds': args.target_seconds,
+        'preview': args.preview,
+        'segment_seconds': args.segment_seconds,
+        'refine': args.refine,
+        'deadline': args.deadline,
+        'memory_budget_mb': args.memory_budget,
+        'thumbnails': args.thumbnails,
+        'keyer': args.keyer,
+        'background_model': args.background_model,
+        'crop_changes': args.crop_changes,
+        'follow': args.follow,
+        'schedule': args.schedule,
+        'user_id': args.user_id,
+        'subscription_plan': args.plan,
+        'max_jobs': args.max_jobs,
+        'start': args.start,
+        'end': args.end,
+        'duration': args.duration,
+        'every_nth': args.every_nth,
+    }
 
-    if format_type == 'webm':
-        process_video_with_transparency(input_video, output_path, None, None)
-    elif format_type == 'mov':
-        process_video_with_transparency(input_video, None, output_path, None)
-    elif format_type == 'gif':
-        process_video_with_transparency(input_video, None, None, output_path)
+    if args.format == 'webm':
+        process_video_with_transparency(args.input_video, args.output_path, None, None, **options)
+    elif args.format == 'mov':
+        process_video_with_transparency(args.input_video, None, args.output_path, None, **options)
+    elif args.format == 'gif':
+        process_video_with_transparency(args.input_video, None, None, args.output_path, **options)
+    elif args.format in ANIMATED_FORMATS:
+        process_video_with_transparency(args.input_video, None, None, None,
+                                        **{f'output_{args.format}': args.output_path}, **options)
     else:
-        print(json.dumps({'error': f'Invalid format: {format_type}'}), flush=True)
-        sys.exit(1)
\ No newline at end of file
+        print(json.dumps({'error': f'Invalid format: {args.format}'}), flush=True)
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
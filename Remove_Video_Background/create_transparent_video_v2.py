@@ -12,6 +12,8 @@ import subprocess
 import json
 from tqdm import tqdm
 
+from encoder_profiles import build_encode_cmd
+
 def get_video_info(video_path):
     """Get video metadata using ffprobe"""
     cmd = [
@@ -89,18 +91,7 @@ def process_video_with_transparency(input_path, output_webm, output_mov=None, ou
     # Create WebM with VP9 and alpha (only if output_webm is provided)
     if output_webm:
         print("Encoding WebM with transparency (VP9 codec)...")
-        webm_cmd = [
-            'ffmpeg', '-y',
-            '-framerate', str(info['fps']),
-            '-i', str(temp_dir / 'frame_%05d.png'),
-            '-c:v', 'libvpx-vp9',
-            '-pix_fmt', 'yuva420p',
-            '-auto-alt-ref', '0',
-            '-lossless', '0',
-            '-crf', '30',
-            '-b:v', '0',
-            output_webm
-        ]
+        webm_cmd = build_encode_cmd('webm', 'balanced', temp_dir / 'frame_%05d.png', output_webm, info['fps'])
 
         result = subprocess.run(webm_cmd, capture_output=True, text=True)
         if result.returncode == 0:
@@ -112,16 +103,7 @@ def process_video_with_transparency(input_path, output_webm, output_mov=None, ou
     # Optionally create MOV with ProRes 4444 (better alpha support)
     if output_mov:
         print("Encoding MOV with transparency (ProRes 4444 codec)...")
-        mov_cmd = [
-            'ffmpeg', '-y',
-            '-framerate', str(info['fps']),
-            '-i', str(temp_dir / 'frame_%05d.png'),
-            '-c:v', 'prores_ks',
-            '-profile:v', '4444',
-            '-pix_fmt', 'yuva444p10le',
-            '-vendor', 'apl0',
-            output_mov
-        ]
+        mov_cmd = build_encode_cmd('mov', 'balanced', temp_dir / 'frame_%05d.png', output_mov, info['fps'])
         
         result = subprocess.run(mov_cmd, capture_output=True, text=True)
         if result.returncode == 0:
@@ -133,16 +115,7 @@ def process_video_with_transparency(input_path, output_webm, output_mov=None, ou
     # Optionally create GIF with transparency
     if output_gif:
         print("Creating GIF with transparency...")
-        # Calculate appropriate frame rate for GIF (max 15fps for reasonable file size)
-        gif_fps = min(info['fps'], 15)
-        gif_cmd = [
-            'ffmpeg', '-y',
-            '-framerate', str(info['fps']),
-            '-i', str(temp_dir / 'frame_%05d.png'),
-            '-vf', f'fps={gif_fps},scale=iw:ih:flags=lanczos,split[s0][s1];[s0]palettegen[p];[s1][p]paletteuse',
-            '-gifflags', '+transdiff',
-            output_gif
-        ]
+        gif_cmd = build_encode_cmd('gif', 'balanced', temp_dir / 'frame_%05d.png', output_gif, info['fps'])
 
         result = subprocess.run(gif_cmd, capture_output=True, text=True)
         if result.returncode == 0:
@@ -150,13 +123,7 @@ def process_video_with_transparency(input_path, output_webm, output_mov=None, ou
         else:
             print(f"! GIF encoding issue, trying simpler approach...")
             # Fallback: simpler GIF without palette optimization
-            simple_gif_cmd = [
-                'ffmpeg', '-y',
-                '-framerate', str(info['fps']),
-                '-i', str(temp_dir / 'frame_%05d.png'),
-                '-vf', f'fps={gif_fps}',
-                output_gif
-            ]
+            simple_gif_cmd = build_encode_cmd('gif', 'fast', temp_dir / 'frame_%05d.png', output_gif, info['fps'])
             result = subprocess.run(simple_gif_cmd, capture_output=True, text=True)
             if result.returncode == 0:
                 print(f"+ GIF created successfully (simple mode)!")
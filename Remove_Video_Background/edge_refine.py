@@ -0,0 +1,98 @@
+"""
+Alpha Edge Refinement
+Trimap-free cleanup of the raw U2-Net alpha: a guided filter snaps edges to
+the image, morphology removes specks and feathers the boundary, and a
+motion-gated temporal EMA suppresses flicker. Everything is vectorized
+NumPy/OpenCV, so it costs a few milliseconds per frame instead of the
+seconds pymatting's alpha matting takes.
+"""
+
+import cv2
+import numpy as np
+
+# Refinement settings
+GUIDED_RADIUS = 4          # Guided filter window radius (pixels)
+GUIDED_EPS = 1e-3          # Guided filter regularisation (smaller = sharper edges)
+OPEN_KERNEL = 3            # Morphological opening kernel; removes isolated specks
+FEATHER_SIGMA = 1.0        # Gaussian feather applied to the edge band only
+TEMPORAL_DECAY = 0.6       # Weight of the previous alpha in still regions
+MOTION_THRESHOLD = 0.15    # Alpha change above which a pixel is treated as moving
+
+
+def guided_filter(guide, src, radius=GUIDED_RADIUS, eps=GUIDED_EPS):
+    """Edge-preserving filter of `src` steered by `guide` (both float32 in [0, 1])"""
+    ksize = (2 * radius + 1, 2 * radius + 1)
+
+    def box(x):
+        return cv2.boxFilter(x, -1, ksize, borderType=cv2.BORDER_REFLECT)
+
+    mean_i = box(guide)
+    mean_p = box(src)
+    cov_ip = box(guide * src) - mean_i * mean_p
+    var_i = box(guide * guide) - mean_i * mean_i
+
+    a = cov_ip / (var_i + eps)
+    b = mean_p - a * mean_i
+    return box(a) * guide + box(b)
+
+
+def feather_edges(alpha, open_kernel=OPEN_KERNEL, sigma=FEATHER_SIGMA):
+    """Remove specks and soften only the boundary band of a float alpha"""
+    if open_kernel > 1:
+        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (open_kernel, open_kernel))
+        alpha = cv2.morphologyEx(alpha, cv2.MORPH_OPEN, kernel)
+    if sigma > 0:
+        blurred = cv2.GaussianBlur(alpha, (0, 0), sigma)
+        # Interior and background stay crisp; only partial-alpha pixels are feathered
+        band = (blurred > 0.02) & (blurred < 0.98)
+        alpha = np.where(band, blurred, alpha)
+    return alpha
+
+
+class AlphaRefiner:
+    """Refines a sequence of RGBA frames; keeps the previous alpha for temporal smoothing"""
+
+    def __init__(self, guided=True, feather=True, temporal=True,
+                 decay=TEMPORAL_DECAY, motion_threshold=MOTION_THRESHOLD):
+        self.guided = guided
+        self.feather = feather
+        self.temporal = temporal
+        self.decay = decay
+        self.motion_threshold = motion_threshold
+        self.previous = None
+
+    def reset(self):
+        """Forget temporal state (call between clips or after a cut)"""
+        self.previous = None
+
+    def refine_alpha(self, rgb, alpha):
+        """Return a refined uint8 alpha for one RGB frame and its raw uint8 alpha"""
+        a = alpha.astype(np.float32) * (1.0 / 255.0)
+
+        if self.guided:
+            guide = cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY).astype(np.float32) * (1.0 / 255.0)
+            a = guided_filter(guide, a)
+        if self.feather:
+            a = feather_edges(a)
+        np.clip(a, 0.0, 1.0, out=a)
+
+        if self.temporal:
+            if self.previous is not None and self.previous.shape == a.shape:
+                # Blend with the last frame only where alpha barely changed (flicker, not motion)
+                still = np.abs(a - self.previous) < self.motion_threshold
+                a = np.where(still, self.decay * self.previous + (1.0 - self.decay) * a, a)
+            self.previous = a
+
+        return (a * 255.0 + 0.5).astype(np.uint8)
+
+    def refine(self, rgba, rgb=None):
+        """
+        Refine the alpha channel of an RGBA frame in place and return it.
+        Pass the original `rgb` frame when the cutout's colour was zeroed
+        outside the raw mask (rembg does this); it is used as the guide and
+        restored so pixels the refinement re-admits keep their real colour.
+        """
+        if rgb is not None:
+            rgba[..., :3] = rgb
+        rgba[..., 3] = self.refine_alpha(rgba[..., :3], rgba[..., 3])
+        return rgba
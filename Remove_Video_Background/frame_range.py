@@ -0,0 +1,113 @@
+"""
+Frame Range Selection
+Turns --start/--end/--duration/--every-nth into a range of source frames and
+reads only that range: the capture seeks to the first frame, frames between
+kept ones are grabbed without being converted, and decoding stops at the end
+of the range. The output frame rate is the source rate divided by the
+stride, so every kept frame keeps its timestamp relative to the range start.
+"""
+
+import itertools
+import math
+
+import cv2
+
+
+class FrameRange:
+    """Source frames start, start + step, ... before `end` (None: to the end of the clip)"""
+
+    def __init__(self, start=0, end=None, step=1):
+        self.start = start
+        self.end = end
+        self.step = step
+
+    @classmethod
+    def from_times(cls, fps, start=None, end=None, duration=None, every_nth=1, total_frames=None):
+        """Range from times in seconds; raises ValueError for an empty or inconsistent range"""
+        if end is not None and duration is not None:
+            raise ValueError("Use either --end or --duration, not both")
+        if every_nth < 1:
+            raise ValueError("--every-nth must be at least 1")
+        start = start or 0.0
+        if start < 0 or (duration is not None and duration <= 0):
+            raise ValueError("--start must not be negative and --duration must be positive")
+        if duration is not None:
+            end = start + duration
+        if end is not None and end <= start:
+            raise ValueError("--end must be after --start")
+
+        start_frame = round(start * fps)
+        end_frame = round(end * fps) if end is not None else None
+        if total_frames and start_frame >= total_frames:
+            raise ValueError(f"--start {start}s is past the end of the video ({total_frames / fps:.2f}s)")
+        if total_frames and end_frame is not None and end_frame >= total_frames:
+            end_frame = None
+        return cls(start_frame, end_frame, every_nth)
+
+    @property
+    def is_full(self):
+        return self.start == 0 and self.end is None and self.step == 1
+
+    def count(self, total_frames):
+        """Frames selected from a clip of `total_frames` (None if that is unknown and the range is open)"""
+        stop = total_frames if self.end is None else self.end if total_frames is None else min(self.end, total_frames)
+        if stop is None:
+            return None
+        return max(0, math.ceil((stop - self.start) / self.step))
+
+    def apply(self, info):
+        """Probe-style info for the selected frames: frame rate divided by the stride"""
+        fps = info['fps'] / self.step
+        total_frames = self.count(info['total_frames'])
+        return {**info, 'fps': fps, 'total_frames': total_frames,
+                'duration': total_frames / fps if total_frames is not None else None,
+                'start_time': self.start / info['fps']}
+
+    def select(self, frames):
+        """Pick the range out of a frame iterator that cannot seek (a stream)"""
+        return itertools.islice(frames, self.start, self.end, self.step)
+
+    def describe(self, fps):
+        """Human-readable range for progress messages"""
+        end = f'{self.end / fps:.2f}s' if self.end is not None else 'end'
+        stride = f', every {self.step} frames' if self.step > 1 else ''
+        return f'{self.start / fps:.2f}s to {end}{stride}'
+
+
+class RangedCapture:
+    """
+    cv2.VideoCapture restricted to a FrameRange: read(), grab() and
+    retrieve() only see the selected frames. Other attributes are passed
+    through to the capture.
+    """
+
+    def __init__(self, video_path, frame_range=None):
+        self.cap = cv2.VideoCapture(str(video_path))
+        self.range = frame_range or FrameRange()
+        self.index = self.range.start
+        self.started = False
+        if self.range.start:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, self.range.start)
+
+    def grab(self):
+        if self.started:
+            # Skipped frames are grabbed (demuxed and decoded) but never converted
+            for _ in range(self.range.step - 1):
+                if not self.cap.grab():
+                    return False
+            self.index += self.range.step
+        self.started = True
+        if self.range.end is not None and self.index >= self.range.end:
+            return False
+        return self.cap.grab()
+
+    def retrieve(self):
+        return self.cap.retrieve()
+
+    def read(self):
+        if not self.grab():
+            return False, None
+        return self.retrieve()
+
+    def __getattr__(self, name):
+        return getattr(self.cap, name)
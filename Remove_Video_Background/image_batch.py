@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Batch Background Removal for Still Images
+Cuts out album art, card art and other stills with the same warm sessions
+and worker pool as the video pipeline. Inputs whose content hash and
+parameters match the manifest are skipped.
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from frame_buffers import ArrayMatter
+from manifest_store import file_hash, load_manifest, save_manifest
+from Remove_Background import get_session, _init_batch_worker
+
+IMAGE_EXTENSIONS = ['.png', '.jpg', '.jpeg', '.webp', '.bmp']
+OUTPUT_FORMATS = ['png', 'webp']
+MANIFEST_NAME = 'image_manifest.json'
+# Images sent to a worker per task, to amortise inter-process overhead
+BATCH_SIZE = 8
+
+
+def find_images(source):
+    """Image files from a directory or a glob pattern, skipping previous outputs"""
+    path = Path(source)
+    candidates = path.iterdir() if path.is_dir() else (Path(p) for p in glob.glob(source, recursive=True))
+    return sorted(str(p) for p in candidates
+                  if p.suffix.lower() in IMAGE_EXTENSIONS and not p.stem.endswith('_transparent'))
+
+
+def output_path_for(image_path, output_dir, fmt):
+    """Cut-out path for an input image"""
+    return str(Path(output_dir) / f'{Path(image_path).stem}_transparent.{fmt}')
+
+
+def _matte_batch(items, fmt):
+    """Worker task: cut out a batch of (input, output) images with the warm session"""
+    session = get_session()
+    matters = {}  # (height, width) -> ArrayMatter, shared by same-sized images
+    results = []
+    for image_path, output_path in items:
+        start = time.perf_counter()
+        try:
+            bgr = cv2.imread(image_path, cv2.IMREAD_COLOR)
+            if bgr is None:
+                raise Exception(f"Unreadable image: {image_path}")
+            height, width = bgr.shape[:2]
+            matter = matters.get((height, width))
+            if matter is None:
+                matter = matters[(height, width)] = ArrayMatter(session, height, width)
+
+            rgba = np.empty((height, width, 4), dtype=np.uint8)
+            matter.matte_into(cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB), rgba)
+            if fmt == 'webp':
+                Image.fromarray(rgba, 'RGBA').save(output_path, 'WEBP', lossless=True, method=4)
+            else:
+                Image.fromarray(rgba, 'RGBA').save(output_path, 'PNG', optimize=False)
+            results.append({'input': image_path, 'output': output_path, 'status': 'ok',
+                            'seconds': round(time.perf_counter() - start, 3)})
+        except Exception as e:
+            results.append({'input': image_path, 'output': output_path, 'status': 'error',
+                            'error': str(e)})
+    return results
+
+
+def run_images(source, output_dir=None, fmt='png', workers=1, force=False):
+    """Cut out every image in `source`, skipping unchanged ones; returns a summary"""
+    images = find_images(source)
+    if not images:
+        print(f"No images found for: {source}")
+        return {'processed': 0, 'failed': 0, 'skipped': 0, 'seconds': 0.0, 'images_per_sec': 0.0}
+    if output_dir is None:
+        base = Path(source) if Path(source).is_dir() else Path(images[0]).parent
+        output_dir = base / 'transparent'
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    manifest_path = output_dir / MANIFEST_NAME
+    manifest = load_manifest(manifest_path)
+    params = {'model': 'u2net', 'format': fmt}
+
+    todo, hashes, skipped = [], {}, 0
+    for image_path in images:
+        output_path = output_path_for(image_path, output_dir, fmt)
+        digest = file_hash(image_path)
+        record = manifest['files'].get(image_path)
+        if not force and record and record.get('hash') == digest and record.get('params') == params \
+                and os.path.exists(output_path):
+            skipped += 1
+            continue
+        hashes[image_path] = digest
+        todo.append((image_path, output_path))
+
+    print(f"Images: {len(images)} found, {skipped} unchanged, {len(todo)} to process")
+
+    # Largest first, then dealt round-robin so batches carry similar work
+    todo.sort(key=lambda item: os.path.getsize(item[0]), reverse=True)
+    workers = max(1, min(workers, len(todo) or 1))
+    batch_count = max(workers, -(-len(todo) // BATCH_SIZE))
+    batches = [todo[i::batch_count] for i in range(batch_count) if todo[i::batch_count]]
+
+    start = time.perf_counter()
+    results = []
+    if workers == 1:
+        for batch in batches:
+            results.extend(_matte_batch(batch, fmt))
+    else:
+        threads_per_worker = max(1, (os.cpu_count() or 1) // workers)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                                 initargs=(threads_per_worker,)) as pool:
+            for batch_results in pool.map(_matte_batch, batches, [fmt] * len(batches)):
+                results.extend(batch_results)
+    elapsed = time.perf_counter() - start
+
+    for result in results:
+        if result['status'] == 'ok':
+            manifest['files'][result['input']] = {
+                'hash': hashes[result['input']],
+                'params': params,
+                'output': result['output'],
+            }
+        else:
+            print(f"[ERROR] {result['input']}: {result['error']}")
+    save_manifest(manifest, manifest_path)
+
+    done = sum(1 for r in results if r['status'] == 'ok')
+    rate = done / elapsed if elapsed > 0 else 0.0
+    print(f"[OK] {done} images in {elapsed:.1f}s ({rate:.2f} images/sec), output: {output_dir}")
+    return {'processed': done, 'failed': len(results) - done, 'skipped': skipped,
+            'seconds': round(elapsed, 3), 'images_per_sec': round(rate, 3)}
+
+
+def parse_args(argv):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Remove backgrounds from still images')
+    parser.add_argument('source', help='Directory or glob pattern (quote it), e.g. "art/*.png"')
+    parser.add_argument('-o', '--output-dir', help='Output directory (default: <source>/transparent)')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='png')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--force', action='store_true', help='Reprocess unchanged images')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    args = parse_args(sys.argv[1:])
+    run_images(args.source, args.output_dir, args.format, args.workers, args.force)
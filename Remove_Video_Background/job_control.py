@@ -0,0 +1,125 @@
+"""
+Job Cancellation and Deadlines
+Turns SIGTERM/SIGINT and an optional wall-clock deadline into a JobCancelled
+exception at the next checkpoint, and runs ffmpeg children so they can be
+killed the moment the job is cancelled
+"""
+
+import os
+import shutil
+import signal
+import subprocess
+import time
+from pathlib import Path
+
+# How often a running child process is checked against cancellation
+POLL_INTERVAL = 0.2
+
+# Exit codes for aborted jobs (same conventions as SIGINT and timeout(1))
+EXIT_CODES = {'cancelled': 130, 'timeout': 124}
+
+
+class JobCancelled(Exception):
+    """Raised at a checkpoint once the job is cancelled or out of time"""
+
+    def __init__(self, reason):
+        super().__init__(f"Job {reason}")
+        self.reason = reason  # 'cancelled' or 'timeout'
+
+
+class JobController:
+    """
+    Tracks cancellation, the deadline, child processes and workspace paths.
+
+    Call check() inside long loops, use run() instead of subprocess.run()
+    for child processes, and register_cleanup() for temporary files or
+    directories that should be removed if the job is aborted.
+    """
+
+    def __init__(self, deadline_seconds=None, install_signals=True):
+        self.deadline_seconds = deadline_seconds
+        self.restart_deadline()
+        self.cancel_reason = None
+        self.children = set()
+        self.cleanup_paths = []
+        if install_signals:
+            signal.signal(signal.SIGTERM, self._on_signal)
+            signal.signal(signal.SIGINT, self._on_signal)
+
+    def _on_signal(self, signum, frame):
+        """Signal handler: record the request and stop children; Python work stops at the next checkpoint"""
+        self.cancel_reason = 'cancelled'
+        self.kill_children()
+
+    def restart_deadline(self):
+        """Start the deadline (and elapsed-time) clock now, e.g. once a queued job gets to run"""
+        self.started = time.monotonic()
+        self.deadline = self.started + self.deadline_seconds if self.deadline_seconds else None
+
+    def remaining(self):
+        """Seconds left before the deadline, or None without one"""
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
+
+    def check(self):
+        """Raise JobCancelled if the job was cancelled or ran past its deadline"""
+        if self.cancel_reason is None and self.deadline is not None and time.monotonic() >= self.deadline:
+            self.cancel_reason = 'timeout'
+        if self.cancel_reason is not None:
+            raise JobCancelled(self.cancel_reason)
+
+    def run(self, cmd, **kwargs):
+        """
+        Like subprocess.run(cmd, capture_output=True, text=True), but the child
+        is killed and JobCancelled raised on cancellation or deadline.
+        """
+        self.check()
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                   text=True, start_new_session=True, **kwargs)
+        self.children.add(process)
+        try:
+            while True:
+                try:
+                    stdout, stderr = process.communicate(timeout=POLL_INTERVAL)
+                    break
+                except subprocess.TimeoutExpired:
+                    try:
+                        self.check()
+                    except JobCancelled:
+                        self._kill(process)
+                        process.communicate()
+                        raise
+        finally:
+            self.children.discard(process)
+        # A child killed by a signal handler is a cancellation, not an encode failure
+        self.check()
+        return subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
+
+    def _kill(self, process):
+        """Kill a child and anything it spawned"""
+        if process.poll() is not None:
+            return
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except (AttributeError, ProcessLookupError, PermissionError):
+            process.kill()
+
+    def kill_children(self):
+        """Kill every running child process"""
+        for process in list(self.children):
+            self._kill(process)
+
+    def register_cleanup(self, path):
+        """Remove `path` (file or directory) when cleanup() runs"""
+        self.cleanup_paths.append(Path(path))
+        return path
+
+    def cleanup(self):
+        """Kill children and delete registered workspace paths"""
+        self.kill_children()
+        for path in self.cleanup_paths:
+            if path.is_dir():
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                path.unlink(missing_ok=True)
@@ -0,0 +1,194 @@
+"""
+Plan-Aware Job Scheduler
+Background-removal jobs run as separate processes started by the server;
+this module makes them take turns on a bounded number of worker slots.
+Each job files a ticket in a shared queue file and waits until it is among
+the next tickets to run: higher subscription plans first, users served
+round-robin within a plan class, and the shortest estimated job first for
+each user. Waiting promotes a ticket's class over time, so free jobs are
+delayed under load but never starved.
+"""
+
+import csv
+import fcntl
+import heapq
+import json
+import os
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+# Priority class per subscription plan; lower runs first
+PLAN_CLASSES = {'mogul': 0, 'producer': 0, 'creator': 1, 'studio': 1, 'free': 2}
+DEFAULT_CLASS = PLAN_CLASSES['free']
+AGING_SECONDS = 120          # Each this-many seconds of waiting promotes a ticket one class
+DEFAULT_THROUGHPUT = 1.5     # Megapixel-frames/sec per job, until finished jobs have been measured
+THROUGHPUT_SMOOTHING = 0.3   # Weight of the newest measurement in the running throughput
+UNKNOWN_LENGTH_SECONDS = 30  # Assumed clip length when a stream does not report its duration
+POLL_INTERVAL = 1.0
+REPORT_INTERVAL = 10.0       # Re-send an unchanged queue position this often
+USERS_CSV = Path(__file__).resolve().parent.parent / 'Users' / 'users.csv'
+
+
+def default_pool_size():
+    """Concurrent jobs: BG_MAX_CONCURRENT_JOBS, or half the CPU cores"""
+    if os.environ.get('BG_MAX_CONCURRENT_JOBS'):
+        return max(1, int(os.environ['BG_MAX_CONCURRENT_JOBS']))
+    return max(1, (os.cpu_count() or 1) // 2)
+
+
+def default_queue_dir():
+    """Queue state directory: BG_SCHEDULER_DIR, or one shared folder under the temp dir"""
+    return Path(os.environ.get('BG_SCHEDULER_DIR') or Path(tempfile.gettempdir()) / 'bg_removal_queue')
+
+
+def plan_for_user(user_id, csv_path=USERS_CSV):
+    """Subscription plan of a user in the users table export, 'free' if unknown"""
+    try:
+        with open(csv_path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                if row.get('id') == str(user_id):
+                    return row.get('subscription_plan') or 'free'
+    except OSError:
+        pass
+    return 'free'
+
+
+def job_work(info):
+    """Size of a job in megapixel-frames, from a probe-style info dict"""
+    frames = info.get('total_frames') or round((info.get('fps') or 30) * UNKNOWN_LENGTH_SECONDS)
+    return frames * info['width'] * info['height'] / 1e6
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class JobScheduler:
+    """
+    Shared queue of jobs across processes (state in `queue_dir`, guarded by
+    an exclusive file lock). acquire() blocks until the job may run and
+    release() frees its slot; tickets of processes that died are dropped.
+    """
+
+    def __init__(self, queue_dir=None, pool_size=None):
+        self.queue_dir = Path(queue_dir) if queue_dir else default_queue_dir()
+        self.queue_dir.mkdir(parents=True, exist_ok=True)
+        self.state_path = self.queue_dir / 'queue.json'
+        self.lock_path = self.queue_dir / 'queue.lock'
+        self.pool_size = pool_size or default_pool_size()
+
+    @contextmanager
+    def _state(self):
+        """Load the queue under the lock and write it back atomically afterwards"""
+        with open(self.lock_path, 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                try:
+                    state = json.loads(self.state_path.read_text())
+                except (OSError, ValueError):
+                    state = {}
+                state.setdefault('tickets', {})
+                state.setdefault('throughput', DEFAULT_THROUGHPUT)
+                # Crashed or killed jobs never release; their slots are reclaimed here
+                for ticket_id, ticket in list(state['tickets'].items()):
+                    if not _pid_alive(ticket['pid']):
+                        del state['tickets'][ticket_id]
+                yield state
+                tmp_path = self.state_path.with_suffix('.tmp')
+                tmp_path.write_text(json.dumps(state))
+                os.replace(tmp_path, self.state_path)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    @staticmethod
+    def order(tickets, now):
+        """Waiting ticket ids in the order they will be started"""
+        running_per_user = defaultdict(int)
+        waiting_per_user = defaultdict(list)
+        for ticket_id, ticket in tickets.items():
+            if ticket['started'] is not None:
+                running_per_user[ticket['user']] += 1
+            else:
+                waiting_per_user[ticket['user']].append(ticket_id)
+
+        keys = {}
+        for user, ticket_ids in waiting_per_user.items():
+            ticket_ids.sort(key=lambda t: (tickets[t]['estimate'], tickets[t]['enqueued']))
+            for rank, ticket_id in enumerate(ticket_ids):
+                ticket = tickets[ticket_id]
+                priority = max(0, ticket['class'] - int((now - ticket['enqueued']) // AGING_SECONDS))
+                # Fair share: a user's n-th job (counting running ones) waits behind every other user's (n-1)-th
+                keys[ticket_id] = (priority, running_per_user[user] + rank, ticket['estimate'], ticket['enqueued'])
+        return sorted(keys, key=keys.get)
+
+    def wait_estimate(self, tickets, ahead, now):
+        """Seconds until a slot frees up for a ticket queued behind `ahead`"""
+        slots = [max(0.0, t['estimate'] - (now - t['started'])) for t in tickets.values() if t['started'] is not None]
+        slots += [0.0] * (self.pool_size - len(slots))
+        heapq.heapify(slots)
+        for ticket_id in ahead:
+            heapq.heappush(slots, heapq.heappop(slots) + tickets[ticket_id]['estimate'])
+        return slots[0]
+
+    def acquire(self, job, user_id, plan, work, on_wait=None):
+        """
+        Queue a job of `work` megapixel-frames and block until it may run.
+        `on_wait(position, wait_seconds)` is called while queued; the
+        JobController is checked between polls. Returns the ticket id.
+        """
+        ticket_id = uuid.uuid4().hex
+        with self._state() as state:
+            state['tickets'][ticket_id] = {
+                'pid': os.getpid(),
+                'user': str(user_id),
+                'class': PLAN_CLASSES.get(plan, DEFAULT_CLASS),
+                'work': work,
+                'estimate': work / state['throughput'],
+                'enqueued': time.time(),
+                'started': None,
+            }
+
+        last_report = None
+        try:
+            while True:
+                with self._state() as state:
+                    tickets = state['tickets']
+                    now = time.time()
+                    queue = self.order(tickets, now)
+                    free_slots = self.pool_size - sum(t['started'] is not None for t in tickets.values())
+                    position = queue.index(ticket_id)
+                    if position < free_slots:
+                        tickets[ticket_id]['started'] = now
+                        return ticket_id
+                    wait = self.wait_estimate(tickets, queue[:position], now)
+
+                if on_wait and (last_report is None or last_report[0] != position
+                                or time.monotonic() - last_report[1] >= REPORT_INTERVAL):
+                    on_wait(position + 1, wait)
+                    last_report = (position, time.monotonic())
+                time.sleep(POLL_INTERVAL)
+                job.check()
+        except BaseException:
+            self.release(ticket_id, completed=False)
+            raise
+
+    def release(self, ticket_id, completed=True):
+        """Free the job's slot; a completed job also updates the throughput estimate"""
+        with self._state() as state:
+            ticket = state['tickets'].pop(ticket_id, None)
+            if completed and ticket and ticket['started'] is not None:
+                elapsed = time.time() - ticket['started']
+                if elapsed > 1.0:
+                    measured = ticket['work'] / elapsed
+                    state['throughput'] = ((1 - THROUGHPUT_SMOOTHING) * state['throughput']
+                                           + THROUGHPUT_SMOOTHING * measured)
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Seamless Loop Builder
+Decodes a small, low frame rate grayscale copy of a video once, scores
+every in/out pair of an allowed length with vectorised frame distances, and
+writes the best loop (optionally crossfaded at the seam) with a single
+ffmpeg call.
+
+Usage:
+    python loop_builder.py input.mp4 loop.mp4 [--min-seconds 2] [--crossfade 0.5]
+
+Prints one JSON line with the chosen loop points.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+import numpy as np
+
+from video_probe import get_video_info
+
+# Analysis frames are ANALYSIS_WIDTH pixels wide; enough to see pose and
+# camera position, small enough that the whole clip fits in a few MB
+ANALYSIS_WIDTH = 64
+# Frames either side of the seam that must also line up, so motion carries
+# through the cut instead of only the single frame matching
+SEAM_WINDOW = 2
+DEFAULT_MIN_SECONDS = 2.0
+# Loop points are searched on at most ANALYSIS_FPS frames per second; the
+# search is quadratic in the frame count, so longer clips are rejected
+ANALYSIS_FPS = 10.0
+MAX_ANALYSIS_FRAMES = 3000
+BLOCK_ROWS = 256         # Start frames scored per block of the search
+TYPICAL_SAMPLES = 20000  # Frame pairs sampled for the clip's typical distance
+
+
+def analysis_fps(info):
+    """Frame rate the loop search runs at: the source rate, capped at ANALYSIS_FPS"""
+    return min(info['fps'], ANALYSIS_FPS)
+
+
+def decode_gray(video_path, info, width=ANALYSIS_WIDTH, ffmpeg='ffmpeg'):
+    """Frames at analysis_fps() as a (frames, height, width) uint8 array from one ffmpeg pipe"""
+    height = max(2, round(info['height'] * width / info['width'] / 2) * 2)
+    rate = f'fps={ANALYSIS_FPS:g},' if info['fps'] > ANALYSIS_FPS else ''
+    cmd = [ffmpeg, '-v', 'error', '-i', str(video_path), '-an',
+           '-vf', f'{rate}scale={width}:{height}:flags=area,format=gray',
+           '-f', 'rawvideo', '-pix_fmt', 'gray', '-']
+    result = subprocess.run(cmd, capture_output=True)
+    if result.returncode != 0:
+        raise Exception(f"Failed to decode video: {result.stderr.decode(errors='replace')[-500:]}")
+    frame_bytes = width * height
+    count = len(result.stdout) // frame_bytes
+    return np.frombuffer(result.stdout, dtype=np.uint8, count=count * frame_bytes).reshape(count, height, width)
+
+
+def frame_features(frames):
+    """Flattened frames scaled to 0..1 and their squared norms, for Gram-trick distances"""
+    features = frames.reshape(len(frames), -1).astype(np.float32) / 255.0
+    return features, np.einsum('ij,ij->i', features, features)
+
+
+def block_distances(features, squared, rows, cols):
+    """Mean squared difference between frames `rows` and frames `cols` (two slices)"""
+    distances = squared[rows, None] + squared[None, cols] - 2.0 * (features[rows] @ features[cols].T)
+    np.maximum(distances, 0.0, out=distances)  # Rounding can go slightly negative
+    return distances / features.shape[1]
+
+
+def typical_distance(features, squared, samples=TYPICAL_SAMPLES, seed=0):
+    """Median distance between randomly sampled frame pairs"""
+    rng = np.random.default_rng(seed)
+    i = rng.integers(0, len(features), samples)
+    j = rng.integers(0, len(features), samples)
+    distances = squared[i] + squared[j] - 2.0 * np.einsum('ij,ij->i', features[i], features[j])
+    return float(np.median(np.maximum(distances, 0.0))) / features.shape[1]
+
+
+def find_loop(frames, fps, min_seconds=DEFAULT_MIN_SECONDS, max_seconds=None, window=SEAM_WINDOW):
+    """
+    Best loop [start, end) where frame `end` looks like frame `start`.
+    Returns frame indices, times and the seam cost relative to the clip's
+    typical frame distance (0 = identical, 1 = as different as average).
+
+    The cost of cutting from frame j back to frame i is how far frames
+    j-w..j+w are from i-w..i+w. Starts are scored BLOCK_ROWS at a time
+    against only the ends that give an allowed loop length, so memory is
+    BLOCK_ROWS x (max - min length) rather than frames x frames.
+    """
+    n = len(frames)
+    if n > MAX_ANALYSIS_FRAMES:
+        raise Exception(f"Video too long for loop search: {n} analysis frames (max {MAX_ANALYSIS_FRAMES})")
+    features, squared = frame_features(frames)
+    min_length = max(1, round(min_seconds * fps))
+    max_length = n if max_seconds is None else round(max_seconds * fps)
+
+    best = None  # (cost, start, end)
+    for block_start in range(window, n - window, BLOCK_ROWS):
+        block_end = min(block_start + BLOCK_ROWS, n - window)
+        first_end = max(window, block_start + min_length)
+        last_end = min(n - window, block_end + max_length)
+        if first_end >= last_end:
+            continue
+        starts, ends = block_end - block_start, last_end - first_end
+        distances = block_distances(features, squared,
+                                    slice(block_start - window, block_end + window),
+                                    slice(first_end - window, last_end + window))
+        costs = np.zeros((starts, ends), dtype=np.float32)
+        for k in range(-window, window + 1):
+            costs += distances[window + k:window + k + starts, window + k:window + k + ends]
+        costs /= 2 * window + 1
+
+        length = np.subtract.outer(np.arange(first_end, last_end), np.arange(block_start, block_end)).T
+        costs[(length < min_length) | (length > max_length)] = np.inf
+        block_best = costs.min()
+        if not np.isfinite(block_best):
+            continue
+        # Ties (e.g. a static clip) go to the longest loop
+        candidates = np.argwhere(costs <= block_best + 1e-6)
+        row, col = max(candidates, key=lambda pair: length[pair[0], pair[1]])
+        candidate = (float(block_best), block_start + int(row), first_end + int(col))
+        if (best is None or candidate[0] < best[0] - 1e-6
+                or (candidate[0] <= best[0] + 1e-6 and candidate[2] - candidate[1] > best[2] - best[1])):
+            best = candidate
+    if best is None:
+        raise Exception(f"Video too short for a {min_seconds:g}s loop ({n} frames at {fps:g} fps)")
+
+    best_cost, start, end = best
+    typical = typical_distance(features, squared) or 1.0
+    return {
+        'start_frame': start,
+        'end_frame': end,
+        'start_time': round(start / fps, 3),
+        'end_time': round(end / fps, 3),
+        'duration': round((end - start) / fps, 3),
+        'seam_score': round(best_cost / typical, 4),
+    }
+
+
+def build_loop_cmd(input_path, output_path, start_time, end_time, crossfade=0.0, ffmpeg='ffmpeg'):
+    """
+    One ffmpeg command that cuts [start, end) and, with a crossfade, blends
+    the last `crossfade` seconds into the loop's opening so the wrap is
+    invisible. Output is H.264 MP4 like the rest of the loop tools.
+    """
+    length = end_time - start_time
+    cmd = [ffmpeg, '-y', '-ss', f'{start_time:.3f}', '-t', f'{length:.3f}', '-i', str(input_path)]
+    if crossfade > 0:
+        crossfade = min(crossfade, length / 2)
+        body = length - crossfade
+        graph = (f'[0:v]split[a][b];'
+                 f'[a]trim=start={crossfade:.3f},setpts=PTS-STARTPTS[body];'
+                 f'[b]trim=end={crossfade:.3f},setpts=PTS-STARTPTS[head];'
+                 f'[body][head]xfade=transition=fade:duration={crossfade:.3f}:offset={body - crossfade:.3f}[v]')
+        cmd += ['-filter_complex', graph, '-map', '[v]']
+    cmd += ['-an', '-c:v', 'libx264', '-preset', 'fast', '-crf', '23', '-pix_fmt', 'yuv420p',
+            '-movflags', '+faststart', str(output_path)]
+    return cmd
+
+
+def build_loop(input_path, output_path, min_seconds=DEFAULT_MIN_SECONDS, max_seconds=None,
+               crossfade=0.0, ffmpeg='ffmpeg'):
+    """Find the best seam in `input_path` and write the loop; returns the loop points"""
+    info = get_video_info(input_path)
+    fps = analysis_fps(info)
+    if info['duration'] * fps > MAX_ANALYSIS_FRAMES:
+        raise Exception(f"Video too long for loop search: {info['duration']:.0f}s "
+                        f"(max {MAX_ANALYSIS_FRAMES / ANALYSIS_FPS:.0f}s)")
+    frames = decode_gray(input_path, info, ffmpeg=ffmpeg)
+    loop = find_loop(frames, fps, min_seconds, max_seconds)
+    if crossfade > 0:
+        crossfade = min(crossfade, loop['duration'] / 2)
+
+    cmd = build_loop_cmd(input_path, output_path, loop['start_time'], loop['end_time'], crossfade, ffmpeg)
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise Exception(f"Loop encoding failed: {result.stderr[-500:]}")
+
+    loop['crossfade'] = round(crossfade, 3)
+    # The crossfade overlaps the seam, shortening the output by its length
+    loop['output_duration'] = round(loop['duration'] - crossfade, 3)
+    loop['output_path'] = str(output_path)
+    return loop
+
+
+def parse_args(argv):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Cut a video at its most seamless loop point')
+    parser.add_argument('input_video')
+    parser.add_argument('output_path')
+    parser.add_argument('--min-seconds', type=float, default=DEFAULT_MIN_SECONDS,
+                        help='Shortest acceptable loop')
+    parser.add_argument('--max-seconds', type=float, help='Longest acceptable loop')
+    parser.add_argument('--crossfade', type=float, default=0.0,
+                        help='Seconds to blend across the seam (0 = hard cut)')
+    return parser.parse_args(argv)
+
+
+def main(argv):
+    """Command line entry point"""
+    args = parse_args(argv)
+    try:
+        loop = build_loop(args.input_video, args.output_path, args.min_seconds, args.max_seconds,
+                          args.crossfade)
+    except Exception as e:
+        print(json.dumps({'error': str(e)}), flush=True)
+        sys.exit(1)
+    print(json.dumps(loop), flush=True)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
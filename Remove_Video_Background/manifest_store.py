@@ -0,0 +1,35 @@
+"""
+Content-Hash Manifests
+Shared by the batch tools that skip inputs whose content has not changed
+since the last run
+"""
+
+import hashlib
+import json
+import os
+
+
+def file_hash(path, chunk_size=1024 * 1024):
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(manifest_path):
+    """Load the processed-file manifest, or start an empty one"""
+    if manifest_path.exists():
+        try:
+            return json.loads(manifest_path.read_text())
+        except ValueError:
+            print(f"[WARN] Corrupt manifest, starting fresh: {manifest_path}")
+    return {'files': {}}
+
+
+def save_manifest(manifest, manifest_path):
+    """Write the manifest atomically so a crash never leaves it half-written"""
+    tmp_path = manifest_path.with_suffix('.tmp')
+    tmp_path.write_text(json.dumps(manifest, indent=2))
+    os.replace(tmp_path, manifest_path)
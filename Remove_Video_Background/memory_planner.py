@@ -0,0 +1,116 @@
+"""
+Memory Budget Planner
+Chooses how a job holds its frames (in RAM, in a disk-backed memmap, or not
+at all by streaming them) and how many workers fit, from the ffprobe
+metadata and the memory actually available to this process
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+# Resident cost of one warm rembg/ONNX session plus its inference buffers
+MODEL_MEMORY = 450 * 1024 * 1024
+# Interpreter, cv2/onnxruntime libraries and encoder pipes
+BASE_MEMORY = 200 * 1024 * 1024
+# Never plan to use more than this share of what is available
+SAFETY_FACTOR = 0.8
+# Frames a streaming or memmap job keeps resident at once
+WORKING_FRAMES = 8
+
+STRATEGIES = ('in_memory', 'memmap', 'streaming')
+
+
+def _cgroup_limit():
+    """Container memory limit in bytes, if one is set"""
+    for path in ('/sys/fs/cgroup/memory.max', '/sys/fs/cgroup/memory/memory.limit_in_bytes'):
+        try:
+            value = Path(path).read_text().strip()
+        except OSError:
+            continue
+        if value.isdigit() and int(value) < 1 << 60:
+            return int(value)
+    return None
+
+
+def available_memory():
+    """Bytes of memory this process can use, or None if it cannot be determined"""
+    available = None
+    try:
+        import psutil
+        available = psutil.virtual_memory().available
+    except ImportError:
+        try:
+            for line in Path('/proc/meminfo').read_text().splitlines():
+                if line.startswith('MemAvailable:'):
+                    available = int(line.split()[1]) * 1024
+                    break
+        except OSError:
+            pass
+
+    limit = _cgroup_limit()
+    if limit is not None:
+        available = min(available, limit) if available is not None else limit
+    return available
+
+
+def resolve_budget(budget_mb=None):
+    """Memory budget in bytes: explicit, BG_MEMORY_BUDGET_MB, or detected"""
+    if budget_mb is None and os.environ.get('BG_MEMORY_BUDGET_MB'):
+        budget_mb = float(os.environ['BG_MEMORY_BUDGET_MB'])
+    if budget_mb is not None:
+        return int(budget_mb * 1024 * 1024)
+    detected = available_memory()
+    return int(detected * SAFETY_FACTOR) if detected else 2 * 1024 * 1024 * 1024
+
+
+def plan_execution(width, height, frame_count, budget_bytes=None, needs_all_frames=False,
+                   max_workers=None, holds_output=True):
+    """
+    Pick an execution strategy and worker count for a clip.
+
+    Holding a clip costs RGB input plus (if `holds_output`) RGBA output per
+    frame. If that fits next to the model, frames stay in RAM; otherwise
+    they spill to a memmap when the job must revisit frames (e.g. ROI
+    tracking), or are streamed through one at a time when it does not.
+    """
+    budget = budget_bytes if budget_bytes is not None else resolve_budget()
+    frame_rgb = width * height * 3
+    frame_rgba = width * height * 4 if holds_output else 0
+    clip_bytes = frame_count * (frame_rgb + frame_rgba)
+    working_set = WORKING_FRAMES * (frame_rgb + frame_rgba)
+    fixed = BASE_MEMORY + MODEL_MEMORY
+
+    if fixed + clip_bytes <= budget:
+        strategy, resident = 'in_memory', clip_bytes
+    elif needs_all_frames:
+        strategy, resident = 'memmap', working_set
+    else:
+        strategy, resident = 'streaming', working_set
+
+    # Every worker holds its own session and frames
+    per_worker = MODEL_MEMORY + resident
+    workers = max(1, int((budget - BASE_MEMORY) // per_worker))
+    workers = min(workers, os.cpu_count() or 1)
+    if max_workers is not None:
+        workers = min(workers, max_workers)
+
+    return {
+        'strategy': strategy,
+        'workers': workers,
+        'budget_mb': round(budget / 1024 / 1024),
+        'clip_mb': round(clip_bytes / 1024 / 1024),
+        'estimated_peak_mb': round((fixed + resident) / 1024 / 1024),
+    }
+
+
+def allocate_frames(shape, strategy, directory=None, name='frames'):
+    """Frame block for a plan: np.empty in RAM, or a disk-backed np.memmap"""
+    # Imported here so planning (e.g. `main.py probe --plan`) stays lightweight
+    import numpy as np
+
+    if strategy == 'in_memory':
+        return np.empty(shape, dtype=np.uint8)
+    directory = Path(directory or tempfile.gettempdir())
+    directory.mkdir(parents=True, exist_ok=True)
+    return np.memmap(directory / f'{name}.u8', dtype=np.uint8, mode='w+', shape=shape)
@@ -12,6 +12,8 @@ import subprocess
 import json
 from tqdm import tqdm
 
+from encoder_profiles import build_encode_cmd
+
 def get_video_info(video_path):
     """Get video metadata using ffprobe"""
     cmd = [
@@ -84,18 +86,7 @@ def process_video_with_transparency(input_path, output_webm):
     
     # Create WebM with VP9 and alpha
     print("Encoding WebM with transparency (VP9 codec)...")
-    webm_cmd = [
-        'ffmpeg', '-y',
-        '-framerate', str(info['fps']),
-        '-i', str(temp_dir / 'frame_%05d.png'),
-        '-c:v', 'libvpx-vp9',
-        '-pix_fmt', 'yuva420p',
-        '-auto-alt-ref', '0',
-        '-lossless', '0',
-        '-crf', '30',
-        '-b:v', '0',
-        str(output_webm)
-    ]
+    webm_cmd = build_encode_cmd('webm', 'balanced', temp_dir / 'frame_%05d.png', output_webm, info['fps'])
     
     result = subprocess.run(webm_cmd, capture_output=True, text=True)
     if result.returncode == 0:
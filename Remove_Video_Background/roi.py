@@ -0,0 +1,146 @@
+"""
+Subject ROI Tracking
+Estimates a smoothed subject bounding box from low-resolution masks so
+matting can run on the cropped region and outputs can be trimmed to it
+"""
+
+import json
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# Low-res analysis settings
+ANALYSIS_SIZE = 160      # Longest side of the frames fed to the mask function
+MASK_THRESHOLD = 32      # Alpha (0-255) above which a pixel counts as subject
+SAMPLE_EVERY = 5         # Analyse one frame in N, interpolate the rest
+SMOOTH_WINDOW = 5        # Moving-average window over sampled boxes
+MARGIN = 0.08            # Padding around the box, as a fraction of box size
+
+
+def mask_bbox(mask, threshold=MASK_THRESHOLD):
+    """Return (x0, y0, x1, y1) of pixels above threshold, or None if empty"""
+    subject = mask > threshold
+    ys = np.flatnonzero(subject.any(axis=1))
+    if ys.size == 0:
+        return None
+    xs = np.flatnonzero(subject.any(axis=0))
+    return (int(xs[0]), int(ys[0]), int(xs[-1]) + 1, int(ys[-1]) + 1)
+
+
+def _downscale(frame, size):
+    """Resize frame so its longest side is at most `size`; return frame and scale"""
+    h, w = frame.shape[:2]
+    scale = min(1.0, size / max(h, w))
+    if scale == 1.0:
+        return frame, 1.0
+    small = cv2.resize(frame, (max(1, round(w * scale)), max(1, round(h * scale))),
+                       interpolation=cv2.INTER_AREA)
+    return small, scale
+
+
+def _smooth(values, window):
+    """Edge-padded moving average along axis 0"""
+    if window <= 1 or len(values) < 2:
+        return values
+    window = min(window, len(values))
+    pad_lo = window // 2
+    pad_hi = window - 1 - pad_lo
+    padded = np.pad(values, ((pad_lo, pad_hi), (0, 0)), mode='edge')
+    kernel = np.ones(window) / window
+    return np.stack([np.convolve(padded[:, c], kernel, mode='valid')
+                     for c in range(values.shape[1])], axis=1)
+
+
+def _finalize_box(box, width, height, margin):
+    """Pad, clamp and align a float box to even integer coordinates"""
+    x0, y0, x1, y1 = box
+    pad_x = (x1 - x0) * margin
+    pad_y = (y1 - y0) * margin
+    x0 = max(0, int(np.floor(x0 - pad_x)) & ~1)
+    y0 = max(0, int(np.floor(y0 - pad_y)) & ~1)
+    x1 = min(width, int(np.ceil(x1 + pad_x)))
+    y1 = min(height, int(np.ceil(y1 + pad_y)))
+    # Even dimensions keep yuva420p encoders happy
+    if (x1 - x0) % 2:
+        x1 = x1 + 1 if x1 < width else x1 - 1
+    if (y1 - y0) % 2:
+        y1 = y1 + 1 if y1 < height else y1 - 1
+    return (x0, y0, x1, y1)
+
+
+def estimate_subject_boxes(frames, mask_fn, sample_every=SAMPLE_EVERY,
+                           analysis_size=ANALYSIS_SIZE, window=SMOOTH_WINDOW,
+                           margin=MARGIN, threshold=MASK_THRESHOLD):
+    """
+    Estimate one subject box per frame.
+
+    `mask_fn` takes a small RGB frame and returns a uint8 mask of the same
+    size. Only every `sample_every`-th frame is analysed; boxes are smoothed
+    across the samples and linearly interpolated for the frames in between.
+    Frames where no subject is found fall back to the whole frame.
+    """
+    if len(frames) == 0:
+        return []
+    height, width = frames[0].shape[:2]
+    full = (0, 0, width, height)
+
+    sample_idx = list(range(0, len(frames), max(1, sample_every)))
+    if sample_idx[-1] != len(frames) - 1:
+        sample_idx.append(len(frames) - 1)
+
+    found_idx, found_boxes = [], []
+    for i in sample_idx:
+        small, scale = _downscale(frames[i], analysis_size)
+        box = mask_bbox(np.asarray(mask_fn(small)), threshold)
+        if box is not None:
+            found_idx.append(i)
+            found_boxes.append([c / scale for c in box])
+
+    if not found_boxes:
+        return [full] * len(frames)
+
+    smoothed = _smooth(np.array(found_boxes, dtype=np.float64), window)
+    all_idx = np.arange(len(frames))
+    coords = np.stack([np.interp(all_idx, found_idx, smoothed[:, c])
+                       for c in range(4)], axis=1)
+    return [_finalize_box(row, width, height, margin) for row in coords]
+
+
+def union_box(boxes):
+    """Smallest box containing every box in the list"""
+    arr = np.array(boxes)
+    return (int(arr[:, 0].min()), int(arr[:, 1].min()),
+            int(arr[:, 2].max()), int(arr[:, 3].max()))
+
+
+def matte_in_roi(frame_rgb, box, matte_fn):
+    """Run `matte_fn` (RGB -> RGBA) on the box only and paste into a full-size RGBA frame"""
+    x0, y0, x1, y1 = box
+    height, width = frame_rgb.shape[:2]
+    if (x0, y0, x1, y1) == (0, 0, width, height):
+        return np.asarray(matte_fn(frame_rgb))
+    rgba = np.zeros((height, width, 4), dtype=np.uint8)
+    rgba[y0:y1, x0:x1] = np.asarray(matte_fn(frame_rgb[y0:y1, x0:x1]))
+    return rgba
+
+
+def roi_metadata_path(output_path):
+    """Sidecar path that stores the crop offset for an output file"""
+    return Path(str(output_path) + '.roi.json')
+
+
+def write_roi_metadata(output_path, box, source_width, source_height):
+    """Write crop offset metadata next to a cropped output"""
+    x0, y0, x1, y1 = box
+    meta = {
+        'x': x0,
+        'y': y0,
+        'width': x1 - x0,
+        'height': y1 - y0,
+        'source_width': source_width,
+        'source_height': source_height,
+    }
+    path = roi_metadata_path(output_path)
+    path.write_text(json.dumps(meta, indent=2))
+    return path
@@ -0,0 +1,106 @@
+"""
+Progressive Segmented Output
+Encodes the transparent WebM as playable chunks while matting is still
+running, keeps a JSON playlist of the finished chunks, and joins them into
+the final file without re-encoding
+"""
+
+import json
+import subprocess
+from pathlib import Path
+
+from encoder_profiles import build_encode_cmd
+
+
+def segment_path_for(output_path, index):
+    """Chunk file path next to the main output"""
+    output_path = Path(output_path)
+    return output_path.with_name(f'{output_path.stem}_part{index:03d}{output_path.suffix}')
+
+
+def playlist_path_for(output_path):
+    """Playlist file path next to the main output"""
+    output_path = Path(output_path)
+    return output_path.with_name(f'{output_path.stem}_segments.json')
+
+
+class SegmentWriter:
+    """
+    Encodes every `segment_frames` saved frames into a standalone WebM chunk.
+
+    Call frame_saved(i) after frame i is written to `frame_pattern`; chunks
+    are encoded as soon as they are complete and reported via `on_segment`.
+    finish() flushes the last partial chunk, concatenates all chunks into
+    `output_path` and marks the playlist complete. Chunks and playlist are
+    left in place for clients still playing them; the caller removes them
+    once those clients have switched to the joined file.
+    """
+
+    def __init__(self, output_path, frame_pattern, fps, segment_frames, profile='balanced',
+                 on_segment=None, ffmpeg='ffmpeg', runner=None):
+        self.output_path = Path(output_path)
+        self.frame_pattern = frame_pattern
+        self.fps = fps
+        self.segment_frames = max(1, segment_frames)
+        self.profile = profile
+        self.on_segment = on_segment
+        self.ffmpeg = ffmpeg
+        # runner(cmd) -> CompletedProcess; lets callers make encodes cancellable
+        self.runner = runner or (lambda cmd: subprocess.run(cmd, capture_output=True, text=True))
+        self.next_start = 0
+        self.last_saved = -1
+        self.segments = []
+
+    def frame_saved(self, index):
+        """Record a saved frame and encode a chunk once enough have accumulated"""
+        self.last_saved = index
+        if index - self.next_start + 1 >= self.segment_frames:
+            self._encode_segment(index)
+
+    def _encode_segment(self, last_index):
+        """Encode frames next_start..last_index into the next chunk"""
+        count = last_index - self.next_start + 1
+        seg_index = len(self.segments)
+        path = segment_path_for(self.output_path, seg_index)
+        cmd = build_encode_cmd('webm', self.profile, self.frame_pattern, path, self.fps,
+                               ffmpeg=self.ffmpeg, start_number=self.next_start, frame_count=count)
+        result = self.runner(cmd)
+        if result.returncode != 0:
+            raise RuntimeError(f"Segment {seg_index} encoding failed: {result.stderr[-500:]}")
+
+        segment = {
+            'index': seg_index,
+            'path': str(path),
+            'start_time': round(self.next_start / self.fps, 3),
+            'duration': round(count / self.fps, 3),
+            'frames': count,
+        }
+        self.segments.append(segment)
+        self.next_start = last_index + 1
+        self._write_playlist(complete=False)
+        if self.on_segment:
+            self.on_segment(segment)
+
+    def _write_playlist(self, complete):
+        """Write the chunk playlist so clients can play what exists so far"""
+        playlist = {'fps': self.fps, 'complete': complete, 'segments': self.segments}
+        playlist_path_for(self.output_path).write_text(json.dumps(playlist, indent=2))
+
+    def finish(self):
+        """Flush the final chunk and join all chunks into the output file"""
+        if self.last_saved >= self.next_start:
+            self._encode_segment(self.last_saved)
+        if not self.segments:
+            raise RuntimeError("No segments were encoded")
+
+        list_path = self.output_path.with_name(f'{self.output_path.stem}_concat.txt')
+        list_path.write_text(''.join(f"file '{Path(s['path']).resolve().as_posix()}'\n"
+                                     for s in self.segments))
+        cmd = [self.ffmpeg, '-y', '-f', 'concat', '-safe', '0', '-i', str(list_path),
+               '-c', 'copy', str(self.output_path)]
+        result = self.runner(cmd)
+        list_path.unlink(missing_ok=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"Segment concatenation failed: {result.stderr[-500:]}")
+        self._write_playlist(complete=True)
+        return self.output_path
@@ -0,0 +1,196 @@
+"""
+Streaming Ingest
+Decodes a video that is still arriving (stdin, a pipe, or a file that is
+still being written by an upload) with one ffmpeg child. The stream header
+ffmpeg prints is parsed for size, frame rate and duration, so there is no
+separate ffprobe pass and matting starts on the first frames while the
+rest of the upload is still in flight.
+
+Containers that put their index at the end (non-faststart MP4/MOV) cannot
+be decoded until the upload completes; ffmpeg reports that as an error and
+callers should fall back to processing the finished file.
+"""
+
+import re
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+HEADER_TIMEOUT = 60          # Seconds to wait for enough bytes to read the stream header
+IDLE_TIMEOUT = 30            # Seconds a growing file may stop growing before it counts as complete
+READ_CHUNK = 1 << 16
+POLL_INTERVAL = 0.1
+DONE_SUFFIX = '.done'        # Marker written next to a growing file once the upload finished
+
+_DURATION = re.compile(r'Duration: (\d+):(\d+):(\d+(?:\.\d+)?)')
+_VIDEO_STREAM = re.compile(r'Stream #\d+:\d+.*?: Video: .*?(\d{2,5})x(\d{2,5})')
+_FPS = re.compile(r'([\d.]+) fps')
+_TBR = re.compile(r'([\d.]+)(k?) tbr')
+_ROTATION = re.compile(r'rotation of (-?[\d.]+) degrees')
+
+
+def done_marker_for(path):
+    """Marker file that tells a follower the growing file is complete"""
+    return Path(str(path) + DONE_SUFFIX)
+
+
+def parse_stream_header(lines):
+    """Probe-style info dict from ffmpeg's input banner; missing values are None"""
+    info = {'width': None, 'height': None, 'fps': None, 'duration': None, 'total_frames': None}
+    rotation = 0.0
+    for line in lines:
+        if info['duration'] is None and (match := _DURATION.search(line)):
+            hours, minutes, seconds = match.groups()
+            info['duration'] = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+        elif info['width'] is None and (match := _VIDEO_STREAM.search(line)):
+            info['width'], info['height'] = int(match.group(1)), int(match.group(2))
+            if match := _FPS.search(line):
+                info['fps'] = float(match.group(1))
+            elif match := _TBR.search(line):
+                info['fps'] = float(match.group(1)) * (1000 if match.group(2) else 1)
+        elif match := _ROTATION.search(line):
+            rotation = float(match.group(1))
+    # ffmpeg auto-rotates, so decoded frames have the displayed orientation
+    if info['width'] and round(abs(rotation)) % 180 == 90:
+        info['width'], info['height'] = info['height'], info['width']
+    if info['duration'] and info['fps']:
+        info['total_frames'] = round(info['duration'] * info['fps'])
+    return info
+
+
+class StreamSource:
+    """
+    One ffmpeg decoder fed from stdin ('-') or a growing file (`follow`).
+
+    open() waits for the stream header and returns the probe-style info;
+    frames() then yields RGB frames as they are decoded. The child is
+    registered with the JobController so cancellation kills it.
+
+    `video_filter` is passed to ffmpeg as -vf; if it resizes, `size` must
+    give the output (width, height). `max_frames` stops decoding early.
+    """
+
+    def __init__(self, source, job, follow=False, idle_timeout=IDLE_TIMEOUT, ffmpeg='ffmpeg',
+                 video_filter=None, size=None, max_frames=None):
+        self.source = source
+        self.job = job
+        self.follow = follow
+        self.idle_timeout = idle_timeout
+        self.ffmpeg = ffmpeg
+        self.video_filter = video_filter
+        self.size = size
+        self.max_frames = max_frames
+        self.process = None
+        self.info = None
+        self.header_lines = []
+        self.header_ready = threading.Event()
+        self.bytes_in = 0
+
+    def _feed(self):
+        """Copy the source into ffmpeg's stdin until it ends"""
+        sink = self.process.stdin
+        try:
+            if self.source == '-':
+                reader = sys.stdin.buffer
+                while chunk := reader.read1(READ_CHUNK):
+                    sink.write(chunk)
+                    self.bytes_in += len(chunk)
+            else:
+                self._feed_growing_file(sink)
+        except (BrokenPipeError, ValueError):
+            pass  # ffmpeg exited (error or cancellation); its exit status tells the story
+        finally:
+            try:
+                sink.close()
+            except BrokenPipeError:
+                pass
+
+    def _feed_growing_file(self, sink):
+        """Tail the file; it is complete once its marker exists and no more bytes arrive"""
+        marker = done_marker_for(self.source)
+        last_growth = time.monotonic()
+        with open(self.source, 'rb') as f:
+            while True:
+                chunk = f.read(READ_CHUNK)
+                if chunk:
+                    sink.write(chunk)
+                    self.bytes_in += len(chunk)
+                    last_growth = time.monotonic()
+                    continue
+                if not self.follow or marker.exists() or time.monotonic() - last_growth > self.idle_timeout:
+                    # The marker may have appeared after the last read; drain once more
+                    if chunk := f.read():
+                        sink.write(chunk)
+                        self.bytes_in += len(chunk)
+                    return
+                time.sleep(POLL_INTERVAL)
+
+    def _read_banner(self):
+        """Collect ffmpeg's stderr; the input banner ends at 'Stream mapping:'"""
+        for raw in self.process.stderr:
+            line = raw.decode(errors='replace').rstrip()
+            self.header_lines.append(line)
+            if line.startswith('Stream mapping:'):
+                self.header_ready.set()
+            if len(self.header_lines) > 400:
+                del self.header_lines[100:200]  # Keep the banner and the most recent errors
+        self.header_ready.set()
+
+    def open(self, timeout=HEADER_TIMEOUT):
+        """Start decoding and return width/height/fps (duration/total_frames may be None)"""
+        cmd = [self.ffmpeg, '-hide_banner', '-nostats', '-i', 'pipe:0', '-an', '-sn']
+        if self.video_filter:
+            cmd += ['-vf', self.video_filter]
+        if self.max_frames:
+            cmd += ['-frames:v', str(self.max_frames)]
+        cmd += ['-f', 'rawvideo', '-pix_fmt', 'rgb24', 'pipe:1']
+        self.process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        stderr=subprocess.PIPE, start_new_session=True)
+        self.job.children.add(self.process)
+        threading.Thread(target=self._feed, daemon=True).start()
+        threading.Thread(target=self._read_banner, daemon=True).start()
+
+        deadline = time.monotonic() + timeout
+        while not self.header_ready.wait(POLL_INTERVAL):
+            self.job.check()
+            if time.monotonic() > deadline:
+                self.close()
+                raise Exception("Timed out waiting for the video stream header")
+
+        self.info = parse_stream_header(self.header_lines)
+        if not self.info['width'] or not self.info['fps']:
+            self.close()
+            tail = '\n'.join(self.header_lines[-5:])
+            raise Exception(f"Could not read a video stream from the input: {tail}")
+        return self.info
+
+    def frames(self):
+        """Yield decoded RGB frames (writable arrays) until the stream ends"""
+        width, height = self.size or (self.info['width'], self.info['height'])
+        frame_bytes = width * height * 3
+        try:
+            while True:
+                self.job.check()
+                buffer = bytearray(frame_bytes)
+                if self.process.stdout.readinto(buffer) != frame_bytes:
+                    break
+                yield np.frombuffer(buffer, dtype=np.uint8).reshape(height, width, 3)
+            self.process.wait()
+            self.job.check()
+            if self.process.returncode != 0:
+                tail = '\n'.join(self.header_lines[-5:])
+                raise Exception(f"Stream decoding failed: {tail}")
+        finally:
+            self.close()
+
+    def close(self):
+        """Stop ffmpeg if it is still running"""
+        if self.process is not None:
+            if self.process.poll() is None:
+                self.process.kill()
+                self.process.wait()
+            self.job.children.discard(self.process)
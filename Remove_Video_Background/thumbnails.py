@@ -0,0 +1,98 @@
+"""
+Poster Frame and Thumbnail Sprite Sheet
+Collects evenly spaced frames while the pipeline decodes the video anyway,
+and writes a poster JPEG, a fixed-grid sprite sheet and a JSON index of tile
+timestamps, with no second pass over the file
+"""
+
+import json
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+SPRITE_COLUMNS = 5
+SPRITE_ROWS = 5
+TILE_WIDTH = 160
+JPEG_QUALITY = 85
+# Frames darker than this (mean 0-255) are poor poster candidates (fades, black intros)
+MIN_POSTER_BRIGHTNESS = 24
+
+
+def thumbnail_paths_for(output_path):
+    """Poster, sprite sheet and index paths next to the main output"""
+    output_path = Path(output_path)
+    return {
+        'poster': output_path.with_name(f'{output_path.stem}_poster.jpg'),
+        'sprite': output_path.with_name(f'{output_path.stem}_sprite.jpg'),
+        'index': output_path.with_name(f'{output_path.stem}_thumbnails.json'),
+    }
+
+
+class ThumbnailCollector:
+    """
+    Feed every decoded frame to add(i, frame_rgb); only the frames that fall
+    on the sprite grid's sample points are resized and kept.
+
+    The poster is the sampled frame with the most detail (Laplacian variance
+    of its tile) among those that are not near-black; only that one full
+    frame is held at a time.
+    """
+
+    def __init__(self, frame_count, fps, width, height, columns=SPRITE_COLUMNS, rows=SPRITE_ROWS,
+                 tile_width=TILE_WIDTH):
+        self.fps = fps
+        self.tile_width = tile_width
+        self.tile_height = max(2, round(height * tile_width / width / 2) * 2)
+
+        count = max(1, min(columns * rows, frame_count))
+        # Short clips get a smaller sheet rather than empty rows
+        self.columns = min(columns, count)
+        self.rows = -(-count // self.columns)
+        # Sample the middle of each of `count` equal spans of the clip
+        self.sample_frames = {int((k + 0.5) * frame_count / count): k for k in range(count)}
+        self.sheet = np.zeros((self.rows * self.tile_height, self.columns * tile_width, 3), dtype=np.uint8)
+        self.tiles = []
+        self.poster = None
+        self.poster_index = None
+        self.poster_score = -1.0
+
+    def add(self, index, frame_rgb):
+        """Record frame `index` if it is one of the sample points"""
+        slot = self.sample_frames.get(index)
+        if slot is None:
+            return
+        row, col = divmod(slot, self.columns)
+        y, x = row * self.tile_height, col * self.tile_width
+        tile = self.sheet[y:y + self.tile_height, x:x + self.tile_width]
+        cv2.resize(frame_rgb, (self.tile_width, self.tile_height), dst=tile, interpolation=cv2.INTER_AREA)
+        self.tiles.append({'index': index, 'time': round(index / self.fps, 3), 'x': x, 'y': y})
+
+        gray = cv2.cvtColor(tile, cv2.COLOR_RGB2GRAY)
+        score = cv2.Laplacian(gray, cv2.CV_32F).var() if gray.mean() >= MIN_POSTER_BRIGHTNESS else 0.0
+        if score > self.poster_score:
+            self.poster_score = score
+            self.poster_index = index
+            self.poster = cv2.cvtColor(frame_rgb, cv2.COLOR_RGB2BGR)
+
+    def write(self, output_path):
+        """Write poster, sprite sheet and index next to `output_path`; returns their paths"""
+        if self.poster is None:
+            return None
+        paths = thumbnail_paths_for(output_path)
+        params = [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY]
+        cv2.imwrite(str(paths['poster']), self.poster, params)
+        cv2.imwrite(str(paths['sprite']), cv2.cvtColor(self.sheet, cv2.COLOR_RGB2BGR), params)
+
+        index = {
+            'poster': paths['poster'].name,
+            'poster_time': round(self.poster_index / self.fps, 3),
+            'sprite': paths['sprite'].name,
+            'columns': self.columns,
+            'rows': self.rows,
+            'tile_width': self.tile_width,
+            'tile_height': self.tile_height,
+            'tiles': sorted(self.tiles, key=lambda t: t['index']),
+        }
+        paths['index'].write_text(json.dumps(index, indent=2))
+        return paths
@@ -0,0 +1,38 @@
+"""
+Video Metadata Probe
+ffprobe wrapper with no heavy imports, so metadata checks start instantly
+"""
+
+import json
+import subprocess
+
+
+def get_video_info(video_path, ffprobe='ffprobe'):
+    """Get video metadata using ffprobe"""
+    cmd = [
+        ffprobe, '-v', 'quiet', '-print_format', 'json',
+        '-show_streams', '-show_format', str(video_path)
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+
+    if result.returncode != 0:
+        raise Exception(f"Failed to read video file: {video_path}")
+
+    info = json.loads(result.stdout)
+
+    video_stream = next((s for s in info.get('streams', []) if s['codec_type'] == 'video'), None)
+    if video_stream is None:
+        raise Exception(f"No video streams found in: {video_path}")
+
+    fps_parts = video_stream['r_frame_rate'].split('/')
+    fps = float(fps_parts[0]) / float(fps_parts[1])
+
+    duration = float(info['format']['duration'])
+
+    return {
+        'width': int(video_stream['width']),
+        'height': int(video_stream['height']),
+        'fps': fps,
+        'duration': duration,
+        'total_frames': int(video_stream['nb_frames']) if 'nb_frames' in video_stream else round(duration * fps)
+    }
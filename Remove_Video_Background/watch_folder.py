@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Watch-Folder Background Removal
+Polls an input directory (e.g. Uploads/) and removes backgrounds from new or
+changed videos. A manifest records each input's content hash, parameters and
+outputs so restarts and rescans skip work that is already done.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from datetime import datetime, timezone
+from pathlib import Path
+
+from manifest_store import file_hash, load_manifest, save_manifest
+from Remove_Background import (
+    find_video_files, output_path_for, _batch_job, _init_batch_worker
+)
+
+MANIFEST_NAME = 'processed_manifest.json'
+
+# Anything that changes the outputs; a mismatch forces reprocessing
+PIPELINE_PARAMS = {
+    'model': 'u2net',
+    'outputs': ['mov', 'gif'],
+    'mov_profile': 'balanced',
+    'gif_profile': 'archival',
+}
+
+
+def is_up_to_date(record, digest):
+    """True if a manifest record already covers this content and parameters"""
+    return (record is not None
+            and record.get('status') == 'ok'
+            and record.get('hash') == digest
+            and record.get('params') == PIPELINE_PARAMS
+            and all(os.path.exists(p) for p in record.get('outputs', [])))
+
+
+def is_handled(record, digest):
+    """Up to date, or already failed on this exact content (retried only on change)"""
+    if is_up_to_date(record, digest):
+        return True
+    return (record is not None
+            and record.get('status') == 'error'
+            and record.get('hash') == digest
+            and record.get('params') == PIPELINE_PARAMS)
+
+
+class FolderWatcher:
+    """Tracks an input directory and feeds changed videos to a bounded worker pool"""
+
+    def __init__(self, input_dir, workers=1, manifest_path=None):
+        self.input_dir = Path(input_dir)
+        self.workers = max(1, workers)
+        self.manifest_path = Path(manifest_path) if manifest_path else self.input_dir / MANIFEST_NAME
+        self.manifest = load_manifest(self.manifest_path)
+        self.last_sizes = {}   # path -> (size, mtime) seen on the previous scan
+        self.running = {}      # future -> (path, digest, started)
+        self.unstable = 0      # files still growing on the last scan
+
+    def _is_stable(self, path):
+        """A file is ready once its size and mtime are unchanged between scans"""
+        stat = os.stat(path)
+        current = (stat.st_size, stat.st_mtime)
+        previous = self.last_sizes.get(path)
+        self.last_sizes[path] = current
+        return previous == current
+
+    def scan(self, queued=()):
+        """Return (path, digest) for stable videos that need processing (running or `queued` ones are skipped)"""
+        busy = {path for path, _, _ in self.running.values()} | set(queued)
+        todo = []
+        self.unstable = 0
+        for path in find_video_files(self.input_dir):
+            if path in busy:
+                continue
+            if not self._is_stable(path):
+                self.unstable += 1
+                continue
+            record = self.manifest['files'].get(path)
+            size, mtime = self.last_sizes[path]
+            # Cheap check first: unchanged size/mtime means unchanged content
+            if record and record.get('size') == size and record.get('mtime') == mtime \
+                    and is_handled(record, record.get('hash')):
+                continue
+            digest = file_hash(path)
+            if is_handled(record, digest):
+                record.update({'size': size, 'mtime': mtime})
+                continue
+            todo.append((path, digest))
+        return todo
+
+    def _record(self, path, digest, entry):
+        """Store a finished job in the manifest"""
+        size, mtime = self.last_sizes.get(path, (None, None))
+        self.manifest['files'][path] = {
+            'hash': digest,
+            'size': size,
+            'mtime': mtime,
+            'params': PIPELINE_PARAMS,
+            'outputs': entry.get('outputs', []),
+            'status': entry['status'],
+            'error': entry.get('error'),
+            'timings': entry.get('timings'),
+            'processed_at': datetime.now(timezone.utc).isoformat(),
+        }
+        save_manifest(self.manifest, self.manifest_path)
+
+    def _collect(self):
+        """Record results of finished jobs"""
+        for future in [f for f in self.running if f.done()]:
+            path, digest, started = self.running.pop(future)
+            try:
+                entry = future.result()
+            except Exception as e:
+                entry = {'status': 'error', 'error': str(e), 'outputs': [output_path_for(path)]}
+            self._record(path, digest, entry)
+            print(f"[{entry['status'].upper()}] {path} ({time.monotonic() - started:.1f}s)")
+
+    def run(self, interval=5.0, once=False):
+        """Poll until interrupted (or until the queue drains with once=True)"""
+        threads_per_worker = max(1, (os.cpu_count() or 1) // self.workers)
+        queue = []
+        print(f"Watching {self.input_dir} with {self.workers} worker(s), manifest: {self.manifest_path}")
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_batch_worker,
+                                 initargs=(threads_per_worker,)) as pool:
+            try:
+                while True:
+                    self._collect()
+                    queued = {path for path, _ in queue}
+                    # Queued files were hashed when they were queued; do not rehash them every poll
+                    for path, digest in self.scan(queued):
+                        queue.append((path, digest))
+                        print(f"[QUEUED] {path}")
+
+                    # New files wait behind running jobs instead of oversubscribing
+                    while queue and len(self.running) < self.workers:
+                        path, digest = queue.pop(0)
+                        future = pool.submit(_batch_job, path)
+                        self.running[future] = (path, digest, time.monotonic())
+                        print(f"[START] {path}")
+
+                    if once and not queue and not self.running and not self.unstable:
+                        break
+                    time.sleep(interval)
+            except KeyboardInterrupt:
+                print("Stopping watcher; waiting for running jobs...")
+            self._collect_all()
+
+    def _collect_all(self):
+        """Wait for in-flight jobs and record them"""
+        wait(list(self.running))
+        self._collect()
+
+
+def parse_args(argv):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Watch a folder and remove video backgrounds incrementally')
+    parser.add_argument('input_dir', nargs='?', default='Uploads')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Maximum concurrent jobs (default: 1)')
+    parser.add_argument('--interval', type=float, default=5.0,
+                        help='Seconds between scans (default: 5)')
+    parser.add_argument('--manifest', default=None,
+                        help=f'Manifest path (default: <input_dir>/{MANIFEST_NAME})')
+    parser.add_argument('--once', action='store_true',
+                        help='Process what is pending, then exit')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    args = parse_args(sys.argv[1:])
+    FolderWatcher(args.input_dir, args.workers, args.manifest).run(args.interval, args.once)
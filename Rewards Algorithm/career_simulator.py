@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Career Projection Simulator
+Monte Carlo check of the growth and milestone model: starts thousands of new
+bands per subscription plan (Realistic-Starting-Metrics.md), grows them all a
+day at a time with growth_model.apply_day, and reports how long they take to
+reach Gold, Platinum and Diamond.
+
+Usage:
+    python career_simulator.py                       # 10k bands per plan, 5 years
+    python career_simulator.py --years 20 --no-boosts
+    python career_simulator.py --rate mogul=3.0 --boost diamond=0.6 --json
+"""
+
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from growth_model import (BOOSTS, FAME_CAP, MILESTONES, PLANS, TIER_FAME_GROWTH, VARIANCE,
+                          apply_day, starting_metrics)
+
+PERCENTILES = [10, 25, 50, 75, 90]
+DAYS_PER_YEAR = 365
+
+
+def simulate(bands_per_plan=10_000, years=5, plans=None, seed=None, rates=None, boosts=None,
+             variance=VARIANCE, fame_cap=FAME_CAP):
+    """
+    Simulate `bands_per_plan` careers for each plan over `years`.
+
+    Returns per-plan results: the day each milestone was first reached (-1
+    if never) and the final state arrays.
+    """
+    plans = plans or PLANS
+    rng = np.random.default_rng(seed)
+    n = bands_per_plan * len(plans)
+
+    state = starting_metrics(n, rng)
+    state['plan'] = np.repeat(np.array([PLANS.index(p) for p in plans], dtype=np.int8), bands_per_plan)
+    first_day = np.full((len(MILESTONES), n), -1, dtype=np.int32)
+
+    for day in range(1, years * DAYS_PER_YEAR + 1):
+        growth = apply_day(state, rng, rates=rates, boosts=boosts, variance=variance, fame_cap=fame_cap)
+        for k in range(len(MILESTONES)):
+            newly = (growth['level_after'] > k) & (first_day[k] < 0)
+            first_day[k, newly] = day
+
+    results = {}
+    for i, plan in enumerate(plans):
+        rows = slice(i * bands_per_plan, (i + 1) * bands_per_plan)
+        results[plan] = {
+            'first_day': first_day[:, rows],
+            'fame': state['fame'][rows],
+            'sales': (state['streams'] + state['digital'] + state['physical'])[rows],
+        }
+    return results
+
+
+def summarize(results, years):
+    """Time-to-milestone percentiles (years; None = not reached within the horizon) per plan"""
+    summary = {}
+    for plan, result in results.items():
+        milestones = {}
+        for k, (name, required, _) in enumerate(MILESTONES):
+            days = result['first_day'][k].astype(np.float64)
+            days[days < 0] = np.inf
+            # 'nearest' keeps unreached (inf) bands from turning percentiles into NaN
+            values = np.percentile(days, PERCENTILES, method='nearest')
+            milestones[name] = {
+                'reached': round(float(np.isfinite(days).mean()), 4),
+                'years': {f'p{p}': (round(float(v) / DAYS_PER_YEAR, 2) if np.isfinite(v) else None)
+                          for p, v in zip(PERCENTILES, values)},
+            }
+        summary[plan] = {
+            'milestones': milestones,
+            'final_sales_median': int(np.median(result['sales'])),
+            'final_fame_median': round(float(np.median(result['fame'])), 1),
+        }
+    return summary
+
+
+def print_summary(summary, bands_per_plan, years, elapsed):
+    """Human-readable table of the summary"""
+    print(f"{bands_per_plan:,} bands per plan x {years} years, simulated in {elapsed:.2f}s")
+    for plan, entry in summary.items():
+        print(f"\n{plan} (median after {years}y: {entry['final_sales_median']:,} sales, "
+              f"FAME {entry['final_fame_median']})")
+        print(f"  {'milestone':10s} {'reached':>8s} " + ' '.join(f"{'p' + str(p):>7s}" for p in PERCENTILES))
+        for name, m in entry['milestones'].items():
+            cells = ' '.join(f"{v:7.2f}" if v is not None else f"{'>' + str(years):>7s}"
+                             for v in m['years'].values())
+            print(f"  {name:10s} {m['reached']:8.1%} {cells}")
+
+
+def _overrides(pairs, allowed, kind):
+    """Parse repeated name=value options"""
+    values = {}
+    for pair in pairs or []:
+        name, _, value = pair.partition('=')
+        if name not in allowed or not value:
+            raise SystemExit(f"--{kind} expects one of {', '.join(allowed)} as name=value, got {pair!r}")
+        values[name] = float(value)
+    return values
+
+
+def parse_args(argv):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Monte Carlo career projections for the growth model')
+    parser.add_argument('--bands', type=int, default=10_000, help='Bands simulated per plan')
+    parser.add_argument('--years', type=int, default=5)
+    parser.add_argument('--plans', default=','.join(PLANS), help='Comma-separated plans to simulate')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--rate', action='append', metavar='PLAN=FAME_PER_DAY',
+                        help='Override a tier FAME growth rate (repeatable)')
+    parser.add_argument('--boost', action='append', metavar='MILESTONE=BOOST',
+                        help='Override a milestone FAME boost, e.g. gold=0.1 (repeatable)')
+    parser.add_argument('--no-boosts', action='store_true', help='Disable all milestone boosts')
+    parser.add_argument('--variance', type=float, default=VARIANCE)
+    parser.add_argument('--fame-cap', type=float, default=FAME_CAP, help='0 disables the cap')
+    parser.add_argument('--json', action='store_true', help='Print the summary as JSON')
+    return parser.parse_args(argv)
+
+
+def main(argv):
+    args = parse_args(argv)
+    plans = [p.strip() for p in args.plans.split(',') if p.strip()]
+    unknown = [p for p in plans if p not in PLANS]
+    if unknown:
+        raise SystemExit(f"Unknown plan(s): {', '.join(unknown)} (choose from {', '.join(PLANS)})")
+
+    rates = {**TIER_FAME_GROWTH, **_overrides(args.rate, PLANS, 'rate')}
+    boosts = BOOSTS.copy()
+    milestone_names = [name for name, _, _ in MILESTONES]
+    for name, value in _overrides(args.boost, milestone_names, 'boost').items():
+        boosts[milestone_names.index(name) + 1] = value
+    if args.no_boosts:
+        boosts[:] = 0.0
+
+    start = time.perf_counter()
+    results = simulate(args.bands, args.years, plans, args.seed, rates, boosts,
+                       args.variance, args.fame_cap or np.inf)
+    elapsed = time.perf_counter() - start
+    summary = summarize(results, args.years)
+
+    if args.json:
+        print(json.dumps({'bands_per_plan': args.bands, 'years': args.years, 'seed': args.seed,
+                          'seconds': round(elapsed, 3), 'plans': summary}, indent=2))
+    else:
+        print_summary(summary, args.bands, args.years, elapsed)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
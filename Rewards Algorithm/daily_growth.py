@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Nightly Daily-Growth Tick
+Applies one day of growth (growth_model.py) to every band at once instead of
+one POST /api/daily-growth/:cardId call per card. Bands are loaded as column
+arrays, bands still inside their 24-hour cooldown are left alone, and the
+results are written back in bulk.
+
+Sources:
+    CSV exports     --bands bands.csv --users Users/users.csv --output out.csv
+    PostgreSQL      --database-url postgres://...  (or DATABASE_URL; needs psycopg)
+
+Usage:
+    python daily_growth.py --bands bands.csv --output bands_next.csv --seed 42
+    python daily_growth.py --database-url "$DATABASE_URL" --seed 42
+"""
+
+import argparse
+import csv
+import io
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from growth_model import FAME_CAP, MILESTONE_NAMES, apply_day, plan_codes
+
+COOLDOWN = np.timedelta64(24, 'h')
+BAND_COLUMNS = ['id', 'user_id', 'fame', 'physical_copies', 'digital_downloads',
+                'total_streams', 'last_growth_applied']
+LOG_COLUMNS = ['band_id', 'user_id', 'fame_growth', 'streams_added', 'digital_added',
+               'physical_added', 'applied_at']
+
+
+def _clean(value):
+    """CSV exports wrap timestamps in extra quotes; strip them"""
+    return value.strip().strip('"') if value else ''
+
+
+def _timestamps(values):
+    """ISO/Postgres timestamp strings -> datetime64[ms] (NaT for empty)"""
+    return np.array([_clean(v).rstrip('Z') or 'NaT' for v in values], dtype='datetime64[ms]')
+
+
+def columns_from_rows(rows, plans_by_user):
+    """Column arrays for the growth model from band rows (dicts keyed by BAND_COLUMNS)"""
+    ids = [row['id'] for row in rows]
+    user_ids = [row['user_id'] for row in rows]
+    return {
+        'id': ids,
+        'user_id': user_ids,
+        'fame': np.array([row['fame'] or 0 for row in rows], dtype=np.float64),
+        'physical': np.array([row['physical_copies'] or 0 for row in rows], dtype=np.int64),
+        'digital': np.array([row['digital_downloads'] or 0 for row in rows], dtype=np.int64),
+        'streams': np.array([row['total_streams'] or 0 for row in rows], dtype=np.int64),
+        'plan': plan_codes([plans_by_user.get(u, 'free') for u in user_ids]),
+        'last_growth': _timestamps([row['last_growth_applied'] for row in rows]),
+    }
+
+
+def eligible(last_growth, now):
+    """Bands whose cooldown has passed (or that never grew)"""
+    return np.isnat(last_growth) | (now - last_growth >= COOLDOWN)
+
+
+def run_tick(state, seed=None, now=None):
+    """Apply one day to `state`; returns (growth, eligible mask, now, seed)"""
+    if seed is None:
+        seed = int(np.random.SeedSequence().entropy % (2 ** 63))
+    now = now if now is not None else np.datetime64('now', 'ms')
+    mask = eligible(state['last_growth'], now)
+
+    # FAME is stored as an integer; grow from the stored value and round back
+    old_fame = state['fame'].copy()
+    growth = apply_day(state, np.random.default_rng(seed), mask)
+    state['fame'] = np.clip(np.rint(state['fame']), 0, FAME_CAP)
+    growth['fame_growth'] = (state['fame'] - old_fame).astype(np.int64)
+    state['last_growth'] = np.where(mask, now, state['last_growth'])
+    return growth, mask, now, seed
+
+
+# ---------------------------------------------------------------------------
+# CSV source
+# ---------------------------------------------------------------------------
+
+def load_plans_csv(users_path):
+    """user id -> subscription plan from a users export"""
+    if not users_path or not Path(users_path).exists():
+        return {}
+    with open(users_path, newline='', encoding='utf-8') as f:
+        return {_clean(row['id']): _clean(row.get('subscription_plan')) or 'free'
+                for row in csv.DictReader(f)}
+
+
+def load_bands_csv(bands_path, users_path):
+    """Band columns from a bands export plus the users export for plans"""
+    with open(bands_path, newline='', encoding='utf-8') as f:
+        rows = [{k: _clean(row.get(k)) for k in BAND_COLUMNS} for row in csv.DictReader(f)]
+    return columns_from_rows(rows, load_plans_csv(users_path))
+
+
+def _iso(timestamps):
+    """datetime64[ms] -> ISO strings ('' for NaT)"""
+    text = np.datetime_as_string(timestamps, unit='ms')
+    return np.where(np.isnat(timestamps), '', np.char.add(text, 'Z'))
+
+
+def write_bands_csv(state, output_path):
+    """Write updated band columns"""
+    with open(output_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(BAND_COLUMNS)
+        # tolist() first: csv formats Python ints much faster than NumPy scalars
+        writer.writerows(zip(state['id'], state['user_id'], state['fame'].astype(np.int64).tolist(),
+                             state['physical'].tolist(), state['digital'].tolist(),
+                             state['streams'].tolist(), _iso(state['last_growth']).tolist()))
+
+
+def write_log_csv(state, growth, mask, now, log_path):
+    """Append daily_growth_log rows for the bands that grew"""
+    new_file = not Path(log_path).exists()
+    idx = np.flatnonzero(mask)
+    applied_at = _iso(np.array([now]))[0]
+    with open(log_path, 'a', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        if new_file:
+            writer.writerow(LOG_COLUMNS)
+        writer.writerows(zip([state['id'][i] for i in idx], [state['user_id'][i] for i in idx],
+                             growth['fame_growth'][idx].tolist(), growth['streams_added'][idx].tolist(),
+                             growth['digital_added'][idx].tolist(), growth['physical_added'][idx].tolist(),
+                             [applied_at] * len(idx)))
+
+
+# ---------------------------------------------------------------------------
+# PostgreSQL source
+# ---------------------------------------------------------------------------
+
+LOAD_SQL = """
+    COPY (SELECT b.id, b.user_id, b.fame, b.physical_copies, b.digital_downloads,
+                 b.total_streams, b.last_growth_applied, COALESCE(u.subscription_plan, 'free')
+          FROM bands b LEFT JOIN users u ON u.id = b.user_id) TO STDOUT
+"""
+
+
+def _copy_text(rows):
+    """Rows -> COPY text format (tab separated, \\N for NULL)"""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write('\t'.join('\\N' if v is None else str(v) for v in row))
+        buffer.write('\n')
+    return buffer.getvalue()
+
+
+def _connect(database_url):
+    try:
+        import psycopg
+    except ImportError:
+        raise Exception("PostgreSQL mode needs psycopg: pip install 'psycopg[binary]'")
+    return psycopg.connect(database_url)
+
+
+def load_bands_db(conn):
+    """Band columns from the bands table in one COPY"""
+    rows, plans_by_user = [], {}
+    with conn.cursor() as cur:
+        with cur.copy(LOAD_SQL) as copy:
+            for record in copy.rows():
+                row = dict(zip(BAND_COLUMNS, (None if v is None else str(v) for v in record[:7])))
+                row['last_growth_applied'] = row['last_growth_applied'] or ''
+                plans_by_user[row['user_id']] = record[7]
+                rows.append(row)
+    return columns_from_rows(rows, plans_by_user)
+
+
+def write_back_db(conn, state, growth, mask, now):
+    """Bulk update grown bands, log their growth and award new milestones in one transaction"""
+    idx = np.flatnonzero(mask)
+    ids = [state['id'][i] for i in idx]
+    user_ids = [state['user_id'][i] for i in idx]
+    applied_at = str(now.astype('datetime64[ms]')).replace('T', ' ')
+
+    with conn.transaction(), conn.cursor() as cur:
+        cur.execute("""CREATE TEMP TABLE growth_tick (
+                           id varchar, fame integer, physical_copies integer,
+                           digital_downloads integer, total_streams integer) ON COMMIT DROP""")
+        with cur.copy("COPY growth_tick FROM STDIN") as copy:
+            copy.write(_copy_text(zip(ids, state['fame'][idx].astype(np.int64), state['physical'][idx],
+                                      state['digital'][idx], state['streams'][idx])))
+        cur.execute("""UPDATE bands b SET fame = t.fame, physical_copies = t.physical_copies,
+                              digital_downloads = t.digital_downloads,
+                              total_streams = t.total_streams,
+                              last_growth_applied = %s, updated_at = %s
+                       FROM growth_tick t WHERE b.id = t.id""", (applied_at, applied_at))
+
+        with cur.copy("COPY daily_growth_log (band_id, user_id, fame_growth, streams_added, "
+                      "digital_added, physical_added, applied_at) FROM STDIN") as copy:
+            copy.write(_copy_text(zip(ids, user_ids, growth['fame_growth'][idx],
+                                      growth['streams_added'][idx], growth['digital_added'][idx],
+                                      growth['physical_added'][idx], [applied_at] * len(idx))))
+
+        # Milestones crossed today; existing rows are skipped like checkAndAwardAchievements
+        achievements = [(state['id'][i], MILESTONE_NAMES[level])
+                        for i in np.flatnonzero(growth['level_after'] > growth['level_before'])
+                        for level in range(growth['level_before'][i] + 1, growth['level_after'][i] + 1)]
+        if achievements:
+            cur.execute("CREATE TEMP TABLE growth_awards (band_id varchar, achievement_type varchar) "
+                        "ON COMMIT DROP")
+            with cur.copy("COPY growth_awards FROM STDIN") as copy:
+                copy.write(_copy_text(achievements))
+            cur.execute("""INSERT INTO band_achievements (band_id, achievement_type)
+                           SELECT a.band_id, a.achievement_type FROM growth_awards a
+                           WHERE NOT EXISTS (SELECT 1 FROM band_achievements e
+                                             WHERE e.band_id = a.band_id
+                                               AND e.achievement_type = a.achievement_type)""")
+
+
+# ---------------------------------------------------------------------------
+
+def summarize(growth, mask, seed, elapsed):
+    """Printable summary of a tick"""
+    crossed = growth['level_after'] > growth['level_before']
+    new_levels = np.bincount(growth['level_after'][crossed], minlength=len(MILESTONE_NAMES))
+    return {
+        'seed': seed,
+        'bands': int(len(mask)),
+        'grown': int(mask.sum()),
+        'on_cooldown': int((~mask).sum()),
+        'fame_added': int(growth['fame_growth'].sum()),
+        'streams_added': int(growth['streams_added'].sum()),
+        'digital_added': int(growth['digital_added'].sum()),
+        'physical_added': int(growth['physical_added'].sum()),
+        'new_milestones': {name: int(new_levels[i]) for i, name in enumerate(MILESTONE_NAMES) if i},
+        'seconds': round(elapsed, 3),
+    }
+
+
+def parse_args(argv):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Apply one day of growth to every band')
+    parser.add_argument('--bands', help='Bands CSV export (CSV mode)')
+    parser.add_argument('--users', default=str(Path(__file__).resolve().parent.parent / 'Users' / 'users.csv'),
+                        help='Users CSV export with subscription_plan')
+    parser.add_argument('--output', help='Updated bands CSV (default: overwrite --bands)')
+    parser.add_argument('--log', help='Append daily_growth_log rows to this CSV')
+    parser.add_argument('--database-url', default=os.environ.get('DATABASE_URL'),
+                        help='PostgreSQL URL (default: DATABASE_URL); used when --bands is not given')
+    parser.add_argument('--seed', type=int, help='RNG seed, for reproducible ticks')
+    return parser.parse_args(argv)
+
+
+def main(argv):
+    args = parse_args(argv)
+    start = time.perf_counter()
+
+    if args.bands:
+        state = load_bands_csv(args.bands, args.users)
+        growth, mask, now, seed = run_tick(state, args.seed)
+        write_bands_csv(state, args.output or args.bands)
+        if args.log:
+            write_log_csv(state, growth, mask, now, args.log)
+    elif args.database_url:
+        with _connect(args.database_url) as conn:
+            state = load_bands_db(conn)
+            growth, mask, now, seed = run_tick(state, args.seed)
+            write_back_db(conn, state, growth, mask, now)
+    else:
+        print("Either --bands or --database-url (or DATABASE_URL) is required")
+        sys.exit(1)
+
+    summary = summarize(growth, mask, seed, time.perf_counter() - start)
+    print(f"[OK] Grew {summary['grown']:,} of {summary['bands']:,} bands in {summary['seconds']}s "
+          f"(seed {seed})")
+    for name, count in summary['new_milestones'].items():
+        if count:
+            print(f"   New {name}: {count:,}")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
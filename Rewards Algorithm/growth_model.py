@@ -0,0 +1,138 @@
+"""
+Daily Growth Model
+The rules from Daily-Growth-System.md and Realistic-Starting-Metrics.md as
+vectorised NumPy operations over column arrays, one element per band. Used
+by the nightly batch engine (daily_growth.py) and the career simulator
+(career_simulator.py).
+"""
+
+import numpy as np
+
+# Daily FAME growth by subscription plan (PLAN_DISPLAY_NAMES in shared/schema.ts)
+TIER_FAME_GROWTH = {
+    'free': 1.0,       # Fan
+    'studio': 1.25,    # Studio Pass (not in the doc; between Fan and Artist)
+    'creator': 1.5,    # Artist
+    'producer': 2.0,   # Record Label
+    'mogul': 2.5,      # Mogul
+}
+PLANS = list(TIER_FAME_GROWTH)
+
+# Sales added per FAME point per day
+STREAMS_PER_FAME = 20.0
+DIGITAL_PER_FAME = 1.0
+PHYSICAL_PER_FAME = 0.1
+
+# (name, total sales required, FAME growth boost), lowest first
+MILESTONES = [
+    ('gold', 500_000, 0.05),
+    ('platinum', 2_000_000, 0.25),
+    ('diamond', 10_000_000, 0.45),
+]
+MILESTONE_NAMES = ['none'] + [name for name, _, _ in MILESTONES]
+
+# Growth is scaled by a uniform factor in [1 - VARIANCE, 1 + VARIANCE]
+VARIANCE = 0.2
+FAME_CAP = 100.0
+
+# Starting metrics: (base low, base high, minimum) before genre and quality scaling
+STARTING_RANGES = {
+    'physical': (50, 250, 12),
+    'digital': (150, 650, 45),
+    'streams': (800, 2800, 250),
+}
+STARTING_FAME = 5.0
+GENRE_MULTIPLIERS = {
+    'hip hop': 1.8, 'pop': 1.5, 'r&b': 1.4, 'electronic': 1.3, 'rock': 1.2,
+    'country': 1.1, 'alternative': 1.0, 'metal': 0.9, 'indie': 0.8, 'punk': 0.7,
+    'folk': 0.6, 'jazz': 0.5, 'classical': 0.4,
+}
+
+_THRESHOLDS = np.array([required for _, required, _ in MILESTONES], dtype=np.int64)
+BOOSTS = np.array([0.0] + [boost for _, _, boost in MILESTONES])
+
+
+def plan_codes(plans):
+    """Subscription plan names -> integer codes into PLANS (unknown plans count as free)"""
+    lookup = {plan: i for i, plan in enumerate(PLANS)}
+    return np.fromiter((lookup.get(p, 0) for p in plans), dtype=np.int8, count=len(plans))
+
+
+def tier_rates(codes, rates=None):
+    """Daily base FAME growth for an array of plan codes"""
+    rates = rates or TIER_FAME_GROWTH
+    return np.array([rates[plan] for plan in PLANS])[codes]
+
+
+def milestone_levels(total_sales):
+    """0 = none, 1 = gold, 2 = platinum, 3 = diamond, for each band"""
+    return np.searchsorted(_THRESHOLDS, total_sales, side='right').astype(np.int8)
+
+
+def starting_metrics(n, rng, genre_multipliers=None, confidence=None):
+    """
+    Starting sales for `n` new bands, as column arrays.
+
+    `genre_multipliers` (per band) defaults to a uniform draw over the
+    genre chart, `confidence` (0-100, per band) to a uniform draw.
+    """
+    if genre_multipliers is None:
+        genre_multipliers = rng.choice(np.array(list(GENRE_MULTIPLIERS.values())), size=n)
+    if confidence is None:
+        confidence = rng.uniform(0, 100, size=n)
+    quality = 0.7 + confidence / 100 * 0.6
+    columns = {}
+    for name, (low, high, minimum) in STARTING_RANGES.items():
+        base = rng.uniform(low, high, size=n) * genre_multipliers * quality
+        columns[name] = np.maximum(np.rint(base), minimum).astype(np.int64)
+    columns['fame'] = np.full(n, STARTING_FAME)
+    return columns
+
+
+def apply_day(state, rng, mask=None, rates=None, boosts=None, variance=VARIANCE, fame_cap=FAME_CAP):
+    """
+    Apply one day of growth in place and return what was added.
+
+    `state` holds equal-length arrays: fame (float64), streams, digital and
+    physical (int64) and plan (plan codes). `mask` limits growth to some
+    bands (e.g. those past their 24-hour cooldown). Milestone boosts use the
+    sales total before today's growth, as the API endpoint does. `rates`,
+    `boosts`, `variance` and `fame_cap` override the documented values.
+    """
+    boosts = BOOSTS if boosts is None else boosts
+    n = len(state['fame'])
+    if mask is None:
+        mask = np.ones(n, dtype=bool)
+    fame = state['fame']
+
+    sales = state['streams'] + state['digital'] + state['physical']
+    level_before = milestone_levels(sales)
+
+    # One draw per band per quantity: FAME, streams, digital, physical
+    factors = rng.uniform(1.0 - variance, 1.0 + variance, size=(4, n))
+    fame_growth = tier_rates(state['plan'], rates) * (1.0 + boosts[level_before]) * factors[0]
+    streams_added = np.rint(fame * STREAMS_PER_FAME * factors[1]).astype(np.int64)
+    digital_added = np.rint(fame * DIGITAL_PER_FAME * factors[2]).astype(np.int64)
+    physical_added = np.rint(fame * PHYSICAL_PER_FAME * factors[3]).astype(np.int64)
+
+    fame_growth[~mask] = 0.0
+    streams_added[~mask] = 0
+    digital_added[~mask] = 0
+    physical_added[~mask] = 0
+
+    new_fame = np.minimum(fame + fame_growth, fame_cap)
+    fame_growth = new_fame - fame
+    state['fame'] = new_fame
+    state['streams'] += streams_added
+    state['digital'] += digital_added
+    state['physical'] += physical_added
+
+    level_after = milestone_levels(sales + streams_added + digital_added + physical_added)
+    return {
+        'fame_growth': fame_growth,
+        'streams_added': streams_added,
+        'digital_added': digital_added,
+        'physical_added': physical_added,
+        'level_before': level_before,
+        'level_after': level_after,
+    }
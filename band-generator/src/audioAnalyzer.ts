@@ -1,10 +1,91 @@
+import { execFile } from 'child_process';
+import { existsSync, promises as fs } from 'fs';
+import os from 'os';
+import path from 'path';
+import { fileURLToPath } from 'url';
 import type { AudioMetrics } from './types.js';
 
+// Same interpreter the server uses for its other Python workers
+const PYTHON = 'python';
+const ANALYSIS_TIMEOUT_MS = 60_000;
+
 /**
- * Audio analyzer with deterministic hashing
- * Uses file characteristics to generate consistent results for the same file
+ * Locate audio_analysis.py: AUDIO_ANALYSIS_SCRIPT if set, otherwise the
+ * Remove_Video_Background folder beside this package, or under the working
+ * directory when this module is bundled into the server build
+ */
+function resolveAnalysisScript(): string | null {
+  const candidates = process.env.AUDIO_ANALYSIS_SCRIPT
+    ? [path.resolve(process.env.AUDIO_ANALYSIS_SCRIPT)]
+    : [
+        path.join(path.dirname(fileURLToPath(import.meta.url)), '..', '..', 'Remove_Video_Background', 'audio_analysis.py'),
+        path.join(process.cwd(), 'Remove_Video_Background', 'audio_analysis.py'),
+      ];
+  const script = candidates.find((candidate) => existsSync(candidate)) ?? null;
+  if (!script) {
+    console.warn(`⚠️  Audio analysis worker not found (${candidates.join(', ')}), using estimates`);
+  }
+  return script;
+}
+
+const ANALYSIS_SCRIPT = resolveAnalysisScript();
+
+/**
+ * Audio analyzer
+ * WAV files are measured by the Python analysis worker (tempo, key, energy);
+ * other formats, or a failed analysis, fall back to deterministic hashing of
+ * the file so the same file always gets the same result
  */
 export class AudioAnalyzer {
+  /**
+   * Analyze an uploaded file, measuring WAVs with the Python worker
+   */
+  static async analyze(buffer: Buffer, filename: string): Promise<AudioMetrics> {
+    const metrics = this.analyzeBuffer(buffer, filename);
+    const isWav = buffer.length >= 12 &&
+      buffer.toString('ascii', 0, 4) === 'RIFF' && buffer.toString('ascii', 8, 12) === 'WAVE';
+    if (!isWav || !ANALYSIS_SCRIPT) {
+      return metrics;
+    }
+
+    try {
+      const measured = await this.runWorker(buffer, ANALYSIS_SCRIPT);
+      return { ...metrics, ...measured };
+    } catch (error: any) {
+      console.warn(`⚠️  Audio analysis worker failed, using estimates: ${error.message}`);
+      return metrics;
+    }
+  }
+
+  /**
+   * Run audio_analysis.py on a temporary copy of the buffer
+   */
+  private static async runWorker(buffer: Buffer, script: string): Promise<Partial<Pick<AudioMetrics, 'tempo' | 'key' | 'energy'>>> {
+    const dir = await fs.mkdtemp(path.join(os.tmpdir(), 'audio-analysis-'));
+    const wavPath = path.join(dir, 'input.wav');
+    try {
+      await fs.writeFile(wavPath, buffer);
+      const stdout = await new Promise<string>((resolve, reject) => {
+        execFile(PYTHON, [script, wavPath], { timeout: ANALYSIS_TIMEOUT_MS },
+          (error, out) => (error ? reject(error) : resolve(out)));
+      });
+      const result = JSON.parse(stdout.trim().split('\n').pop() || '{}');
+      if (result.error) {
+        throw new Error(result.error);
+      }
+      // Only measured values override the estimates (e.g. silence has no tempo or key)
+      const measured: Partial<Pick<AudioMetrics, 'tempo' | 'key' | 'energy'>> = {};
+      for (const field of ['tempo', 'key', 'energy'] as const) {
+        if (result[field] !== undefined && result[field] !== null) {
+          measured[field] = result[field];
+        }
+      }
+      return measured;
+    } finally {
+      await fs.rm(dir, { recursive: true, force: true });
+    }
+  }
+
   /**
    * Generate a simple hash from buffer for deterministic results
    */
@@ -55,7 +55,7 @@ export function setupRoutes(app: Express) {
 
       // Analyze audio
       console.log('🔊 Analyzing audio...');
-      const audioMetrics = AudioAnalyzer.analyzeBuffer(req.file.buffer, req.file.originalname);
+      const audioMetrics = await AudioAnalyzer.analyze(req.file.buffer, req.file.originalname);
       console.log('📊 Audio metrics:', audioMetrics);
 
       // Generate band
@@ -16,6 +16,10 @@ echo "   ✓ Ghost-Musician symlinks created"
 echo "📦 Building frontend with Vite..."
 vite build --config vite.config.override.ts
 
+# Build static pages (minified, precompressed)
+echo "📦 Building Video Studio page..."
+python video-generation/build.py
+
 # Build backend
 echo "📦 Building backend with esbuild..."
 esbuild server/index.ts --platform=node --packages=external --bundle --format=esm --outdir=dist
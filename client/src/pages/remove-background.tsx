@@ -211,7 +211,12 @@ export default function RemoveBackgroundPage() {
         const data = JSON.parse(event.data);
         console.log('Progress update:', data);
 
-        // Only care about completion signal
+        // Show queue position and wait estimate while the job waits for a worker
+        if (data.step === 'queue' && data.queue_position > 0) {
+          setProgressMessage(data.message);
+        }
+
+        // Completion signal
         if (data.step === 'step6' && !processCompleted) {
           setProcessCompleted(true);
           setProgressPercent(100);
@@ -301,8 +306,14 @@ export default function RemoveBackgroundPage() {
     formData.append("video", uploadedVideo);
     formData.append("format", selectedFormat);
 
+    // Subscribe to progress before uploading: queue, preview, segment and thumbnail
+    // events are sent while the request is still running
+    const newJobId = `job_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`;
+    setJobId(newJobId);
+    connectToProgress(newJobId);
+
     try {
-      const response = await fetch("/api/video/remove-background", {
+      const response = await fetch(`/api/video/remove-background?format=${selectedFormat}&jobId=${newJobId}`, {
         method: "POST",
         body: formData,
         credentials: "include",
@@ -315,12 +326,6 @@ export default function RemoveBackgroundPage() {
 
       const result = await response.json();
 
-      // Connect to SSE stream for completion notification only
-      if (result.jobId) {
-        setJobId(result.jobId);
-        connectToProgress(result.jobId);
-      }
-
       // Set result URL for final delivery
       setResultUrl(result.processedUrl);
 
@@ -340,6 +345,11 @@ export default function RemoveBackgroundPage() {
         clearTimeout(stepTimerRef.current);
         stepTimerRef.current = null;
       }
+      // Stop listening for progress of the failed job
+      if (eventSourceRef.current) {
+        eventSourceRef.current.close();
+        eventSourceRef.current = null;
+      }
     }
   };
 
@@ -1,5 +1,186 @@
-def main():
-    print("Hello from repl-nix-workspace!")
+"""
+AetherWave media tools command line.
+
+Subcommands import their heavy dependencies (cv2, rembg/onnxruntime, PIL)
+only when they run, so `--help`, argument errors and `probe` start
+instantly.
+
+    python main.py remove-bg <input> <output> <webm|mov|gif> [options]
+    python main.py images <dir-or-glob> [--format png|webp] [--workers N]
+    python main.py optimize-assets [<asset_dir> ...] [--workers N]
+    python main.py probe <video>
+    python main.py bench [--video <video>] [--calibrate]
+    python main.py serve [<input_dir>] [--workers N]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PIPELINE_DIR = Path(__file__).resolve().parent / 'Remove_Video_Background'
+
+
+def _use_pipeline():
+    """Make the Remove_Video_Background modules importable"""
+    if str(PIPELINE_DIR) not in sys.path:
+        sys.path.insert(0, str(PIPELINE_DIR))
+
+
+def cmd_remove_bg(args):
+    """Run the streaming background-removal pipeline"""
+    _use_pipeline()
+    from create_transparent_video_streaming import main as remove_bg_main
+    remove_bg_main(args.pipeline_args)
+
+
+def cmd_images(args):
+    """Remove backgrounds from a directory or glob of still images"""
+    _use_pipeline()
+    from image_batch import run_images
+    run_images(args.source, args.output_dir, args.format, args.workers, args.force)
+
+
+def cmd_optimize_assets(args):
+    """Shrink static images and GIFs into optimized/ variants"""
+    _use_pipeline()
+    from asset_optimizer import optimize_roots, ASSET_ROOTS
+    optimize_roots(args.roots or ASSET_ROOTS, args.workers, args.force)
+
+
+def cmd_probe(args):
+    """Print video metadata as JSON (ffprobe only, no heavy imports)"""
+    _use_pipeline()
+    from video_probe import get_video_info
+    info = get_video_info(args.video)
+    if args.plan:
+        from memory_planner import plan_execution
+        info['plan'] = plan_execution(info['width'], info['height'], info['total_frames'])
+    print(json.dumps(info, indent=2))
+
+
+def _time_command(argv, runs):
+    """Median wall time of running this CLI with `argv` in a fresh interpreter"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, __file__] + argv, capture_output=True)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def _time_import(modules, runs):
+    """Median wall time of importing `modules` in a fresh interpreter"""
+    code = '; '.join(f'import {m}' for m in modules)
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True)
+        samples.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            return None
+    return statistics.median(samples)
+
+
+def cmd_bench(args):
+    """Startup-time benchmark, plus the allocation check and encoder calibration on request"""
+    baseline = _time_import([], args.runs)
+    heavy = _time_import(['cv2', 'rembg', 'PIL.Image', 'tqdm'], args.runs)
+
+    print(f"Startup benchmark (median of {args.runs} runs)")
+    print(f"  {'python (empty)':28s} {baseline * 1000:8.0f} ms")
+    if heavy is None:
+        print(f"  {'import cv2+rembg+PIL+tqdm':28s} {'n/a (not installed)':>8s}")
+    else:
+        print(f"  {'import cv2+rembg+PIL+tqdm':28s} {heavy * 1000:8.0f} ms")
+    print(f"  {'main.py --help':28s} {_time_command(['--help'], args.runs) * 1000:8.0f} ms")
+    if args.video:
+        print(f"  {'main.py probe':28s} {_time_command(['probe', args.video], args.runs) * 1000:8.0f} ms")
+
+    if args.allocations:
+        _use_pipeline()
+        from frame_buffers import main as allocation_check
+        print()
+        allocation_check([])
+
+    if args.calibrate:
+        _use_pipeline()
+        from encoder_profiles import CALIBRATION_FILE, calibrate_all
+        print()
+        print("Encoder calibration (fps at the 960x960 reference, used for --target-seconds)")
+        for fmt, profiles in calibrate_all().items():
+            for name, fps in profiles.items():
+                print(f"  {fmt + ' ' + name:28s} {fps:8.1f} fps")
+        print(f"Saved to {CALIBRATION_FILE}")
+
+
+def cmd_serve(args):
+    """Run the watch-folder worker over an input directory"""
+    _use_pipeline()
+    from watch_folder import FolderWatcher
+    FolderWatcher(args.input_dir, args.workers, args.manifest).run(args.interval, args.once)
+
+
+def build_parser():
+    """Argument parser for all subcommands"""
+    parser = argparse.ArgumentParser(prog='main.py', description='AetherWave media tools')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    # Listed for the top-level help; main() forwards its arguments to the pipeline's own parser
+    remove_bg = sub.add_parser('remove-bg', add_help=False,
+                               help='Remove a video background (see remove-bg --help)')
+    remove_bg.set_defaults(func=cmd_remove_bg)
+
+    images = sub.add_parser('images', help='Remove backgrounds from still images')
+    images.add_argument('source', help='Directory or glob pattern (quote it)')
+    images.add_argument('-o', '--output-dir', default=None)
+    images.add_argument('--format', choices=['png', 'webp'], default='png')
+    images.add_argument('--workers', type=int, default=1)
+    images.add_argument('--force', action='store_true', help='Reprocess unchanged images')
+    images.set_defaults(func=cmd_images)
+
+    optimize = sub.add_parser('optimize-assets', help='Shrink static images and GIFs')
+    optimize.add_argument('roots', nargs='*', help='Asset directories (default: site asset roots)')
+    optimize.add_argument('--workers', type=int, default=None)
+    optimize.add_argument('--force', action='store_true', help='Reprocess unchanged assets')
+    optimize.set_defaults(func=cmd_optimize_assets)
+
+    probe = sub.add_parser('probe', help='Print video metadata as JSON')
+    probe.add_argument('video')
+    probe.add_argument('--plan', action='store_true', help='Include the memory execution plan')
+    probe.set_defaults(func=cmd_probe)
+
+    bench = sub.add_parser('bench', help='Measure CLI startup time')
+    bench.add_argument('--video', help='Also time `probe` on this video')
+    bench.add_argument('--runs', type=int, default=5)
+    bench.add_argument('--allocations', action='store_true',
+                       help='Also run the per-frame allocation check (loads the model)')
+    bench.add_argument('--calibrate', action='store_true',
+                       help='Time every encoder profile on this machine and save the results')
+    bench.set_defaults(func=cmd_bench)
+
+    serve = sub.add_parser('serve', help='Watch a folder and process new videos')
+    serve.add_argument('input_dir', nargs='?', default='Uploads')
+    serve.add_argument('--workers', type=int, default=1)
+    serve.add_argument('--interval', type=float, default=5.0)
+    serve.add_argument('--manifest', default=None)
+    serve.add_argument('--once', action='store_true')
+    serve.set_defaults(func=cmd_serve)
+
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    # Options (including --help) may come before the positionals, which REMAINDER cannot take
+    if argv[:1] == ['remove-bg']:
+        cmd_remove_bg(argparse.Namespace(pipeline_args=argv[1:]))
+        return
+    args = build_parser().parse_args(argv)
+    args.func(args)
 
 
 if __name__ == "__main__":
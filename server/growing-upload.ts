@@ -0,0 +1,47 @@
+import type { Request } from "express";
+import type { StorageEngine } from "multer";
+import crypto from "crypto";
+import fs from "fs";
+import os from "os";
+import path from "path";
+
+// Written next to the upload once it is complete; the Python follower
+// (stream_ingest.DONE_SUFFIX) treats the file as finished when it appears
+export const UPLOAD_DONE_SUFFIX = '.done';
+
+/**
+ * Multer storage that writes uploads to the temp directory like `dest` does,
+ * but calls `onStart` as soon as the file is created, so a consumer can read
+ * it while the rest of the upload is still arriving.
+ */
+export function growingFileStorage(
+  onStart: (req: Request, file: Express.Multer.File, filePath: string) => void
+): StorageEngine {
+  return {
+    _handleFile(req, file, cb) {
+      const filename = crypto.randomBytes(16).toString('hex');
+      const filePath = path.join(os.tmpdir(), filename);
+      const out = fs.createWriteStream(filePath);
+
+      out.on('open', () => onStart(req as Request, file, filePath));
+      out.on('error', cb);
+      file.stream.on('error', (err) => {
+        out.destroy();
+        cb(err);
+      });
+      out.on('finish', () => {
+        fs.writeFile(filePath + UPLOAD_DONE_SUFFIX, '', (err) => {
+          if (err) return cb(err);
+          cb(null, { destination: os.tmpdir(), filename, path: filePath, size: out.bytesWritten });
+        });
+      });
+      file.stream.pipe(out);
+    },
+
+    _removeFile(_req, file, cb) {
+      fs.unlink(file.path + UPLOAD_DONE_SUFFIX, () => {
+        fs.unlink(file.path, (err) => cb(err));
+      });
+    }
+  };
+}
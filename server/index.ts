@@ -18,6 +18,7 @@ import express, { type Request, Response, NextFunction } from "express";
 import cors from "cors";
 import { setupVite, serveStatic, log } from "./vite";
 import { maintenanceMiddleware } from "./maintenance";
+import { servePrecompressed } from "./precompressed";
 import path from "path";
 import { promises as fs } from "fs";
 import { registerRoutes } from "./routes";
@@ -128,6 +129,10 @@ app.use((req, res, next) => {
     "/featured-artist",
     express.static(path.join(rootDir, "Featured Artist")),
   );
+  app.use(
+    "/video-generation",
+    servePrecompressed(path.join(rootDir, "video-generation", "dist")),
+  );
   app.use(
     "/video-generation",
     express.static(path.join(rootDir, "video-generation")),
@@ -169,6 +174,10 @@ app.use((req, res, next) => {
     "/featured-artist",
     express.static(path.join(rootDir, "Featured Artist")),
   );
+  app.use(
+    "/video-generation",
+    servePrecompressed(path.join(rootDir, "video-generation", "dist")),
+  );
   app.use(
     "/video-generation",
     express.static(path.join(rootDir, "video-generation")),
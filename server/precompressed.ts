@@ -0,0 +1,49 @@
+import type { Request, Response, NextFunction } from "express";
+import express from "express";
+import path from "path";
+import fs from "fs";
+
+// Content-hashed asset names, e.g. app.0062197da4.js — safe to cache forever
+const HASHED_ASSET = /\.[0-9a-f]{10}\.(js|css)$/;
+
+const CONTENT_TYPES: Record<string, string> = {
+  ".html": "text/html; charset=utf-8",
+  ".css": "text/css; charset=utf-8",
+  ".js": "application/javascript; charset=utf-8",
+};
+
+/**
+ * Static handler for build output with precompressed .br/.gz variants
+ * (see video-generation/build.py). Serves the smallest variant the client
+ * accepts and marks content-hashed assets immutable; anything not in `dir`
+ * falls through to the next handler.
+ */
+export function servePrecompressed(dir: string) {
+  const serveStatic = express.static(dir, { index: false });
+
+  return (req: Request, res: Response, next: NextFunction) => {
+    if (req.method !== "GET" && req.method !== "HEAD") return next();
+
+    const relative = decodeURIComponent(req.path);
+    const filePath = path.join(dir, relative);
+    if (!filePath.startsWith(dir + path.sep) || !fs.existsSync(filePath)) return next();
+
+    const contentType = CONTENT_TYPES[path.extname(filePath)];
+    res.setHeader("Vary", "Accept-Encoding");
+    res.setHeader(
+      "Cache-Control",
+      HASHED_ASSET.test(filePath) ? "public, max-age=31536000, immutable" : "no-cache",
+    );
+
+    const accepted = req.headers["accept-encoding"] || "";
+    for (const [encoding, suffix] of [["br", ".br"], ["gzip", ".gz"]]) {
+      if (contentType && accepted.includes(encoding) && fs.existsSync(filePath + suffix)) {
+        res.setHeader("Content-Encoding", encoding);
+        res.setHeader("Content-Type", contentType);
+        req.url = req.url.replace(req.path, req.path + suffix);
+        break;
+      }
+    }
+    serveStatic(req, res, next);
+  };
+}
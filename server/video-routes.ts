@@ -12,6 +12,7 @@ const isDevelopment = process.env.NODE_ENV === "development";
 const authMiddleware = isDevelopment ? isDevAuthenticated : isAuthenticated;
 import {
   extractLoopFrames,
+  buildSeamlessLoop,
   downloadVideo,
   concatenateVideos,
   cleanupFile,
@@ -23,10 +24,11 @@ import path from "path";
 import os from "os";
 import fs from "fs";
 import fsPromises from "fs/promises";
-import { spawn } from "child_process";
+import { spawn, type ChildProcess } from "child_process";
 import { fileURLToPath } from "url";
 import multer from "multer";
 import { EventEmitter } from "events";
+import { growingFileStorage, UPLOAD_DONE_SUFFIX } from "./growing-upload";
 
 // Create __dirname equivalent for ES modules
 const __dirname = path.dirname(fileURLToPath(import.meta.url));
@@ -42,6 +44,70 @@ const upload = multer({
 // Progress event emitters for active processing jobs
 const progressEmitters = new Map<string, EventEmitter>();
 
+// Running background-removal processes and their owners, so jobs can be cancelled
+const activeJobs = new Map<string, { process: ChildProcess; userId?: string }>();
+
+// Hard limit for one background-removal job (seconds)
+const BACKGROUND_REMOVAL_DEADLINE = 15 * 60;
+
+// Exit codes of a cancelled or timed-out background-removal job (job_control.EXIT_CODES)
+const JOB_ABORTED_EXIT_CODES = [130, 124];
+
+// Upload types that ffmpeg can decode while they are still arriving; MP4/MOV usually
+// keep their index at the end of the file and are processed after the upload
+const STREAMABLE_VIDEO_TYPES = ['video/webm', 'video/x-matroska'];
+
+// How long WebM chunks and their playlist outlive the job, so clients playing
+// announced segment URLs can finish before switching to the joined file
+const SEGMENT_RETENTION_MS = 10 * 60 * 1000;
+const SEGMENT_FILE_PATTERN = /^bg_removed_\d+(_part\d{3}\.webm|_segments\.json)$/;
+
+// Delete the chunks and playlist of one output once its retention has passed
+const scheduleSegmentCleanup = (outputPath: string) => {
+  const dir = path.dirname(outputPath);
+  const stem = path.basename(outputPath, path.extname(outputPath));
+  setTimeout(async () => {
+    try {
+      for (const name of await fsPromises.readdir(dir)) {
+        if (SEGMENT_FILE_PATTERN.test(name) && name.startsWith(`${stem}_`)) {
+          await fsPromises.rm(path.join(dir, name), { force: true });
+        }
+      }
+    } catch (err) {
+      console.error('Failed to delete WebM segments:', err);
+    }
+  }, SEGMENT_RETENTION_MS).unref();
+};
+
+// Chunks whose timer was lost to a server restart are swept by age at startup
+const sweepStaleSegments = async (dir: string) => {
+  try {
+    for (const name of await fsPromises.readdir(dir)) {
+      if (!SEGMENT_FILE_PATTERN.test(name)) continue;
+      const filePath = path.join(dir, name);
+      const stats = await fsPromises.stat(filePath);
+      if (Date.now() - stats.mtimeMs > SEGMENT_RETENTION_MS) {
+        await fsPromises.rm(filePath, { force: true });
+      }
+    }
+  } catch (err) {
+    if ((err as NodeJS.ErrnoException).code !== 'ENOENT') {
+      console.error('Failed to sweep WebM segments:', err);
+    }
+  }
+};
+
+// Ask a running background-removal job to stop; the script cleans up and exits
+const cancelBackgroundRemoval = (jobId: string) => {
+  const job = activeJobs.get(jobId);
+  if (!job) {
+    return false;
+  }
+  console.log(`Cancelling background removal job: ${jobId}`);
+  job.process.kill('SIGTERM');
+  return true;
+};
+
 // Video generation models configuration
 const VIDEO_MODELS = {
   veo3: {
@@ -85,17 +151,24 @@ const mockVideoGeneration = async (prompt: string, model: string, imageFile?: Fi
   };
 };
 
+// Output formats the background-removal script can write
+const BACKGROUND_REMOVAL_FORMATS = ['webm', 'mov', 'gif', 'webp', 'apng'] as const;
+type BackgroundRemovalFormat = typeof BACKGROUND_REMOVAL_FORMATS[number];
+
 // Actual background removal using Python scripts with real-time progress
 const removeBackgroundFromVideo = async (
-  videoFile: Express.Multer.File,
-  format: 'webm' | 'mov' | 'gif' = 'webm',
-  jobId: string
+  inputPath: string,
+  format: BackgroundRemovalFormat = 'webm',
+  jobId: string,
+  options: { follow?: boolean; userId?: string; plan?: string | null } = {}
 ) => {
+  const { follow = false, userId, plan } = options;
   const currentDir = path.dirname(fileURLToPath(import.meta.url));
 
   // Create unique filename
   const timestamp = Date.now();
-  const outputFilename = `bg_removed_${timestamp}.${format}`;
+  // APNG is written with the .png extension browsers expect
+  const outputFilename = `bg_removed_${timestamp}.${format === 'apng' ? 'png' : format}`;
   const outputPath = path.join(currentDir, '..', 'uploads', 'processed', outputFilename);
 
   // Ensure output directory exists
@@ -104,7 +177,6 @@ const removeBackgroundFromVideo = async (
 
   // Path to NEW STREAMING Python script
   const pythonScript = path.join(currentDir, '..', 'Remove_Video_Background', 'create_transparent_video_streaming.py');
-  const inputPath = videoFile.path;
 
   console.log(`Processing video with job ID: ${jobId}`);
   console.log(`Using streaming Python script: ${pythonScript}`);
@@ -118,8 +190,20 @@ const removeBackgroundFromVideo = async (
       pythonScript,
       inputPath,
       outputPath,
-      format
+      format,
+      '--preview',
+      '--thumbnails',
+      // WebM is written as playable chunks so results show up before the job ends
+      ...(format === 'webm' ? ['--segment-seconds', '2'] : []),
+      '--deadline', String(BACKGROUND_REMOVAL_DEADLINE),
+      // Upload still in progress: decode the file as it grows
+      ...(follow ? ['--follow'] : []),
+      // Take turns with other jobs: priority by plan, fair share between users
+      '--schedule',
+      ...(userId ? ['--user-id', String(userId)] : []),
+      '--plan', plan || 'free'
     ]);
+    activeJobs.set(jobId, { process: pythonProcess, userId: userId ? String(userId) : undefined });
 
     let stdoutBuffer = '';
 
@@ -134,6 +218,28 @@ const removeBackgroundFromVideo = async (
         if (line.trim()) {
           try {
             const progressData = JSON.parse(line);
+
+            // Expose the quick preview through the processed-file download route
+            if (progressData.preview_path) {
+              progressData.preview_url = `/api/video/download-processed/${path.basename(progressData.preview_path)}`;
+              delete progressData.preview_path;
+            }
+
+            // Same for each finished WebM segment
+            if (progressData.segment_path) {
+              progressData.segment_url = `/api/video/download-processed/${path.basename(progressData.segment_path)}`;
+              delete progressData.segment_path;
+              delete progressData.playlist_path;
+            }
+
+            // Poster, sprite sheet and tile index for the scrubber
+            for (const key of ['poster', 'sprite', 'thumbnails']) {
+              if (progressData[`${key}_path`]) {
+                progressData[`${key}_url`] = `/api/video/download-processed/${path.basename(progressData[`${key}_path`])}`;
+                delete progressData[`${key}_path`];
+              }
+            }
+
             console.log(`Progress [${jobId}]:`, progressData);
 
             // Emit to SSE clients
@@ -150,18 +256,25 @@ const removeBackgroundFromVideo = async (
     });
 
     pythonProcess.on('close', async (code) => {
+      activeJobs.delete(jobId);
+      if (format === 'webm') scheduleSegmentCleanup(outputPath);
+
+      // A failed streamed job keeps its input and emitter: the caller retries on the finished upload
+      const keepForRetry = follow && code !== 0;
+
       // Clean up
       try {
-        await fsPromises.unlink(inputPath);
+        if (!keepForRetry) await fsPromises.unlink(inputPath);
+        if (follow) await fsPromises.rm(inputPath + UPLOAD_DONE_SUFFIX, { force: true });
       } catch (err) {
         console.error('Failed to delete input file:', err);
       }
 
       // Clean up emitter
-      progressEmitters.delete(jobId);
+      if (!keepForRetry) progressEmitters.delete(jobId);
 
       if (code !== 0) {
-        reject(new Error(`Python process exited with code ${code}`));
+        reject(Object.assign(new Error(`Python process exited with code ${code}`), { exitCode: code }));
         return;
       }
 
@@ -183,6 +296,7 @@ const removeBackgroundFromVideo = async (
     });
 
     pythonProcess.on('error', (error) => {
+      activeJobs.delete(jobId);
       progressEmitters.delete(jobId);
       reject(new Error(`Failed to start Python process: ${error.message}`));
     });
@@ -190,6 +304,8 @@ const removeBackgroundFromVideo = async (
 };
 
 export function setupVideoRoutes(app: Express) {
+  sweepStaleSegments(path.join(__dirname, '..', 'uploads', 'processed'));
+
   // Download temporary video files AND metadata - serves for both video playback and metadata download
   app.get("/api/video/download-temp/:filename", async (req: Request, res: Response) => {
     try {
@@ -240,11 +356,11 @@ export function setupVideoRoutes(app: Express) {
       // Debug logging
       console.log(`Download request for: ${filename}`);
       console.log(`Constructed path: ${filePath}`);
-      console.log(`Regex test: ${filename.match(/^bg_removed_\d+\.(webm|mov|gif)$/)} `);
+      console.log(`Regex test: ${filename.match(/^bg_removed_\d+((_preview|_part\d{3})?\.(webm|mov|gif|webp|png)|_(poster|sprite)\.jpg|_thumbnails\.json)$/)} `);
       console.log(`File exists: ${fs.existsSync(filePath)}`);
 
       // Security: only allow expected patterns for background-removed videos
-      if (!filename.match(/^bg_removed_\d+\.(webm|mov|gif)$/)) {
+      if (!filename.match(/^bg_removed_\d+((_preview|_part\d{3})?\.(webm|mov|gif|webp|png)|_(poster|sprite)\.jpg|_thumbnails\.json)$/)) {
         console.log(`Invalid filename rejected: ${filename}`);
         return res.status(400).json({ error: "Invalid filename" });
       }
@@ -264,6 +380,14 @@ export function setupVideoRoutes(app: Express) {
         contentType = 'video/quicktime';
       } else if (extension === 'gif') {
         contentType = 'image/gif';
+      } else if (extension === 'webp') {
+        contentType = 'image/webp';
+      } else if (extension === 'png') {
+        contentType = 'image/png';
+      } else if (extension === 'jpg') {
+        contentType = 'image/jpeg';
+      } else if (extension === 'json') {
+        contentType = 'application/json';
       } else {
         contentType = 'application/octet-stream';
       }
@@ -448,11 +572,34 @@ export function setupVideoRoutes(app: Express) {
     });
   });
 
+  // Cancel a running background removal job
+  app.post("/api/video/remove-background/cancel/:jobId", authMiddleware, (req: Request, res: Response) => {
+    const { jobId } = req.params;
+    const userId = (req as any).user?.id;
+    const job = activeJobs.get(jobId);
+    if (!job) {
+      return res.status(404).json({ success: false, error: "Job not found or already finished" });
+    }
+    // Only the user who started a job may cancel it
+    if (job.userId !== String(userId)) {
+      return res.status(403).json({ success: false, error: "Not allowed to cancel this job" });
+    }
+    cancelBackgroundRemoval(jobId);
+    res.json({ success: true, jobId });
+  });
+
   // Remove video background
-  app.post("/api/video/remove-background", authMiddleware, upload.single('video'), async (req: Request, res: Response) => {
+  // With ?format=..., WebM/Matroska uploads are matted from their first bytes instead of after
+  // the upload (the multipart `format` field arrives after the file, too late to start early)
+  // Clients pass their own ?jobId=... so they can subscribe to progress before uploading
+  app.post("/api/video/remove-background", authMiddleware, async (req: Request, res: Response) => {
+    const requestedJobId = req.query.jobId as string | undefined;
+    const jobId = requestedJobId && /^job_\d+_[a-z0-9]+$/.test(requestedJobId) && !activeJobs.has(requestedJobId)
+      ? requestedJobId
+      : `job_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`;
+    let streamingJob: ReturnType<typeof removeBackgroundFromVideo> | null = null;
     try {
       const userId = (req as any).user?.id;
-      const { format = 'webm' } = req.body;
 
       if (!userId) {
         return res.status(401).json({
@@ -461,6 +608,53 @@ export function setupVideoRoutes(app: Express) {
         });
       }
 
+      // Check user credits before accepting the upload (background removal costs 20 credits)
+      const user = await storage.getUser(userId);
+      if (!user) {
+        return res.status(404).json({
+          success: false,
+          error: "User not found"
+        });
+      }
+
+      const BACKGROUND_REMOVAL_COST = 20;
+      if (user.credits < BACKGROUND_REMOVAL_COST) {
+        return res.status(400).json({
+          success: false,
+          error: `Insufficient credits. Required: ${BACKGROUND_REMOVAL_COST}, Available: ${user.credits}`
+        });
+      }
+
+      const queryFormat = req.query.format as string | undefined;
+      if (queryFormat !== undefined && !BACKGROUND_REMOVAL_FORMATS.includes(queryFormat as BackgroundRemovalFormat)) {
+        return res.status(400).json({
+          success: false,
+          error: `Invalid format. Allowed: ${BACKGROUND_REMOVAL_FORMATS.join(', ')}`
+        });
+      }
+
+      const uploader = queryFormat
+        ? multer({
+            storage: growingFileStorage((_req, file, filePath) => {
+              if (STREAMABLE_VIDEO_TYPES.includes(file.mimetype)) {
+                streamingJob = removeBackgroundFromVideo(filePath, queryFormat as BackgroundRemovalFormat, jobId, {
+                  follow: true,
+                  userId,
+                  plan: user.subscriptionPlan
+                });
+                // Failures are reported when the job is awaited below
+                streamingJob.catch(() => {});
+              }
+            }),
+            limits: { fileSize: 100 * 1024 * 1024 }
+          })
+        : upload;
+      await new Promise<void>((resolve, reject) => {
+        uploader.single('video')(req, res, (err: any) => err ? reject(err) : resolve());
+      });
+
+      const format = queryFormat || req.body.format || 'webm';
+
       // Check if file was uploaded
       if (!req.file) {
         return res.status(400).json({
@@ -473,39 +667,55 @@ export function setupVideoRoutes(app: Express) {
 
       // Validate file type
       if (!videoFile.mimetype.startsWith('video/')) {
+        await cleanupFile(videoFile.path);
         return res.status(400).json({
           success: false,
           error: "Invalid file type. Please upload a video file."
         });
       }
 
-      // Check user credits (background removal costs 20 credits)
-      const user = await storage.getUser(userId);
-      if (!user) {
-        return res.status(404).json({
-          success: false,
-          error: "User not found"
-        });
-      }
-
-      const BACKGROUND_REMOVAL_COST = 20;
-      if (user.credits < BACKGROUND_REMOVAL_COST) {
+      if (!BACKGROUND_REMOVAL_FORMATS.includes(format)) {
+        await cleanupFile(videoFile.path);
         return res.status(400).json({
           success: false,
-          error: `Insufficient credits. Required: ${BACKGROUND_REMOVAL_COST}, Available: ${user.credits}`
+          error: `Invalid format. Allowed: ${BACKGROUND_REMOVAL_FORMATS.join(', ')}`
         });
       }
 
-      console.log(`Starting background removal for user ${userId}`);
-
-      // Generate unique job ID for progress tracking
-      const jobId = `job_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`;
+      console.log(`Starting background removal for user ${userId}${streamingJob ? ' (streamed during upload)' : ''}`);
 
       // Deduct credits
       await storage.deductCredits(userId, 'background_removal' as any);
 
+      // Stop the Python job if the client goes away before it finishes
+      res.on('close', () => {
+        if (!res.writableEnded) {
+          cancelBackgroundRemoval(jobId);
+        }
+      });
+
       // Process background removal with Python scripts (with job ID for progress tracking)
-      const result = await removeBackgroundFromVideo(videoFile, format as 'webm' | 'mov' | 'gif', jobId);
+      const runOnFile = () => removeBackgroundFromVideo(videoFile.path, format as BackgroundRemovalFormat, jobId, {
+        userId,
+        plan: user.subscriptionPlan
+      });
+      let result;
+      if (streamingJob) {
+        try {
+          result = await streamingJob;
+        } catch (error: any) {
+          if (res.writableEnded || res.destroyed || JOB_ABORTED_EXIT_CODES.includes(error.exitCode)) {
+            await cleanupFile(videoFile.path);
+            progressEmitters.delete(jobId);
+            throw error;
+          }
+          // Not decodable while arriving (e.g. index at the end): process the finished upload
+          console.warn(`Streamed decode failed for job ${jobId}, retrying on the finished upload`);
+          result = await runOnFile();
+        }
+      } else {
+        result = await runOnFile();
+      }
 
       res.json({
         success: true,
@@ -519,6 +729,8 @@ export function setupVideoRoutes(app: Express) {
 
     } catch (error) {
       console.error("Error removing background:", error);
+      // A job started during the upload must not outlive a failed request
+      if (streamingJob) cancelBackgroundRemoval(jobId);
       res.status(500).json({
         success: false,
         error: "Failed to remove background"
@@ -699,8 +911,10 @@ export function setupVideoRoutes(app: Express) {
     }
   });
 
-  // SEAMLESS LOOP CREATOR - Upload existing video and create perfect loop
-  app.post("/api/video/create-seamless-loop", async (req: Request, res: Response) => {
+  // SEAMLESS LOOP CREATOR - Upload existing video and cut it at its most seamless loop point
+  // No AI generation: one low-res analysis pass finds the seam, one ffmpeg call writes the loop
+  app.post("/api/video/create-seamless-loop", authMiddleware, upload.single('video'), async (req: Request, res: Response) => {
+    let uploadedVideoPath: string | null = null;
     try {
       const userId = (req as any).user?.id;
 
@@ -720,6 +934,7 @@ export function setupVideoRoutes(app: Express) {
       }
 
       const videoFile = req.file;
+      uploadedVideoPath = videoFile.path;
 
       // Validate file type
       if (!videoFile.mimetype.startsWith('video/')) {
@@ -729,43 +944,33 @@ export function setupVideoRoutes(app: Express) {
         });
       }
 
-      // Get user and check credits (30 credits for VEO 3 Fast loop generation)
-      const user = await storage.getUser(userId);
-      if (!user) {
-        return res.status(404).json({
-          success: false,
-          error: "User not found"
-        });
-      }
-
-      const SEAMLESS_LOOP_COST = 30; // VEO 3 Fast generation cost
-      if (user.credits < SEAMLESS_LOOP_COST) {
-        return res.status(400).json({
-          success: false,
-          error: `Insufficient credits. Required: ${SEAMLESS_LOOP_COST}, Available: ${user.credits}`
-        });
-      }
+      const minSeconds = req.body.minSeconds ? parseFloat(req.body.minSeconds) : undefined;
+      const maxSeconds = req.body.maxSeconds ? parseFloat(req.body.maxSeconds) : undefined;
+      const crossfade = req.body.crossfade ? parseFloat(req.body.crossfade) : 0.5;
 
       console.log(`Starting seamless loop creation for user ${userId}`);
 
-      // TODO: Implement actual seamless loop processing:
-      // 1. Extract first frame and last frame of first 50% using ffmpeg
-      // 2. Upload frames to ImgBB
-      // 3. Call VEO 3 with FIRST_AND_LAST_FRAMES_2_VIDEO mode
-      // 4. Concatenate original first 50% + VEO-generated second 50%
-      // 5. Return final seamless loop video
+      const finalLoopPath = path.join(os.tmpdir(), `seamless-loop-${Date.now()}.mp4`);
+      const loop = await buildSeamlessLoop(videoFile.path, finalLoopPath, { minSeconds, maxSeconds, crossfade });
 
-      res.status(501).json({
-        success: false,
-        error: "Seamless loop processing not yet implemented - needs ffmpeg integration"
+      console.log(`Seamless loop created: ${finalLoopPath} (${loop.startTime}s-${loop.endTime}s, seam ${loop.seamScore})`);
+
+      res.json({
+        success: true,
+        videoUrl: `/api/video/download-temp/${path.basename(finalLoopPath)}`,
+        message: `Seamless loop created from ${loop.startTime}s to ${loop.endTime}s`,
+        duration: loop.duration,
+        loop
       });
 
-    } catch (error) {
+    } catch (error: any) {
       console.error("Error creating seamless loop:", error);
       res.status(500).json({
         success: false,
-        error: "Failed to create seamless loop"
+        error: error.message || "Failed to create seamless loop"
       });
+    } finally {
+      if (uploadedVideoPath) await cleanupFile(uploadedVideoPath);
     }
   });
 
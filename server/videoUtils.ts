@@ -1,11 +1,18 @@
-import { exec } from 'child_process';
+import { exec, execFile } from 'child_process';
 import { promisify } from 'util';
 import { writeFile, unlink, mkdir } from 'fs/promises';
 import { existsSync } from 'fs';
 import path from 'path';
 import os from 'os';
+import { fileURLToPath } from 'url';
 
 const execAsync = promisify(exec);
+const execFileAsync = promisify(execFile);
+
+// Python loop engine (seam detection + single-pass encode)
+const LOOP_BUILDER_SCRIPT = path.join(
+  path.dirname(fileURLToPath(import.meta.url)), '..', 'Remove_Video_Background', 'loop_builder.py'
+);
 
 // Temporary directory for video processing
 const TMP_DIR = '/tmp/video-processing';
@@ -207,6 +214,53 @@ export async function concatenateVideos(video1Path: string, video2Path: string,
   }
 }
 
+export interface SeamlessLoopResult {
+  startTime: number;
+  endTime: number;
+  duration: number;
+  crossfade: number;
+  seamScore: number;
+}
+
+/**
+ * Cut a video at its most seamless loop point in one analysis pass and one encode
+ * @param inputPath Path to input video (any format ffmpeg reads)
+ * @param outputPath Path to output H.264 MP4 loop
+ * @param options minSeconds/maxSeconds bound the loop length, crossfade blends the seam (seconds)
+ * @returns Chosen loop points; seamScore is 0 for a perfect match, ~1 for an average frame pair
+ */
+export async function buildSeamlessLoop(
+  inputPath: string,
+  outputPath: string,
+  options: { minSeconds?: number; maxSeconds?: number; crossfade?: number } = {}
+): Promise<SeamlessLoopResult> {
+  const args = [LOOP_BUILDER_SCRIPT, inputPath, outputPath];
+  if (options.minSeconds !== undefined) args.push('--min-seconds', String(options.minSeconds));
+  if (options.maxSeconds !== undefined) args.push('--max-seconds', String(options.maxSeconds));
+  if (options.crossfade !== undefined) args.push('--crossfade', String(options.crossfade));
+
+  try {
+    console.log('Building seamless loop:', args.join(' '));
+    const { stdout } = await execFileAsync('python', args, { maxBuffer: 1024 * 1024 });
+    const loop = JSON.parse(stdout.trim().split('\n').pop() || '{}');
+    return {
+      startTime: loop.start_time,
+      endTime: loop.end_time,
+      duration: loop.output_duration,
+      crossfade: loop.crossfade,
+      seamScore: loop.seam_score
+    };
+  } catch (error: any) {
+    // The script reports failures as a JSON line on stdout
+    let message = error.message;
+    try {
+      message = JSON.parse(error.stdout.trim().split('\n').pop()).error || message;
+    } catch {}
+    console.error('Error building seamless loop:', message);
+    throw new Error(`Failed to build seamless loop: ${message}`);
+  }
+}
+
 /**
  * Download a video from URL to temporary file
  * @param videoUrl URL of the video
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Video Studio Page Build
+Assembles video-generation.html from src/layout.html and the panel
+fragments in src/fragments/, then writes into dist/:
+
+- minified HTML with the critical CSS inlined: rules used by the
+  above-the-fold fragments in CRITICAL_FRAGMENTS
+- the remaining CSS and the page script as content-hashed files that can
+  be cached forever
+- precompressed .gz and .br variants of every output
+
+Nothing is rewritten when no input hash has changed since the last build,
+and an unchanged asset keeps its hashed name. Editing one fragment
+therefore only invalidates the HTML.
+
+Usage:
+    python build.py [--force]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import re
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+SRC_DIR = ROOT / 'src'
+DIST_DIR = ROOT / 'dist'
+MANIFEST_PATH = DIST_DIR / 'build-manifest.json'
+PAGE_NAME = 'video-generation.html'
+
+# Bump when the build logic changes so unchanged inputs still rebuild
+BUILD_VERSION = 1
+# Fragments visible on first paint; their selectors decide the inlined CSS
+CRITICAL_FRAGMENTS = ['chrome', 'page-header', 'generate-tab']
+# Content-hash length in asset file names
+HASH_LENGTH = 10
+
+PLACEHOLDER = re.compile(r'\{\{\s*([\w:-]+)\s*\}\}')
+
+
+def content_hash(data):
+    """Hex SHA-256 of text or bytes"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+def read_sources():
+    """Layout, fragments, stylesheet and script from src/"""
+    fragments = {p.stem: p.read_text(encoding='utf-8')
+                 for p in sorted((SRC_DIR / 'fragments').glob('*.html'))}
+    return {
+        'layout': (SRC_DIR / 'layout.html').read_text(encoding='utf-8'),
+        'styles': (SRC_DIR / 'styles.css').read_text(encoding='utf-8'),
+        'script': (SRC_DIR / 'app.js').read_text(encoding='utf-8'),
+        'fragments': fragments,
+    }
+
+
+def source_hashes(sources):
+    """Per-input content hashes, keyed by path relative to src/"""
+    hashes = {
+        'layout.html': content_hash(sources['layout']),
+        'styles.css': content_hash(sources['styles']),
+        'app.js': content_hash(sources['script']),
+    }
+    for name, text in sources['fragments'].items():
+        hashes[f'fragments/{name}.html'] = content_hash(text)
+    return hashes
+
+
+# ---------------------------------------------------------------------------
+# Minification
+# ---------------------------------------------------------------------------
+
+def minify_css(css):
+    """Strip comments and insignificant whitespace"""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    return css.replace(';}', '}').strip()
+
+
+def minify_js(js):
+    """
+    Drop comment-only and blank lines and strip indentation.
+
+    Lines inside multi-line template literals are kept verbatim; no
+    expression-level rewriting is attempted.
+    """
+    out = []
+    in_template = False
+    for line in js.splitlines():
+        if in_template:
+            out.append(line)
+        else:
+            stripped = line.strip()
+            if stripped and not stripped.startswith('//'):
+                out.append(stripped)
+        # Unescaped backticks toggle template-literal state
+        if len(re.findall(r'(?<!\\)`', line)) % 2:
+            in_template = not in_template
+    return '\n'.join(out)
+
+
+_PROTECTED = re.compile(r'(<(pre|textarea|script|style)\b.*?</\2>)', re.S | re.I)
+
+
+def minify_html(html):
+    """Remove comments and collapse whitespace outside <pre>/<textarea>/<script>/<style>"""
+    html = re.sub(r'<!--(?!\[if).*?-->', '', html, flags=re.S)
+    parts = _PROTECTED.split(html)
+    out = []
+    # split() yields text, protected block, tag name, text, ...
+    for i in range(0, len(parts), 3):
+        text = re.sub(r'\s+', ' ', parts[i])
+        out.append(re.sub(r'>\s+<', '> <', text))
+        if i + 1 < len(parts):
+            out.append(parts[i + 1])
+    return ''.join(out).strip()
+
+
+# ---------------------------------------------------------------------------
+# Critical CSS
+# ---------------------------------------------------------------------------
+
+def used_selectors(html):
+    """Tags, classes and ids present in an HTML fragment"""
+    classes = set()
+    for value in re.findall(r'class="([^"]*)"', html):
+        classes.update(value.split())
+    return {
+        'tags': {t.lower() for t in re.findall(r'<([a-zA-Z][\w-]*)', html)},
+        'classes': classes,
+        'ids': set(re.findall(r'id="([^"]*)"', html)),
+    }
+
+
+def _selector_used(selector, used):
+    """True if every tag, class and id a selector names appears in `used`"""
+    selector = re.sub(r'::?[\w-]+(\([^)]*\))?', '', selector)  # pseudo-classes/elements
+    selector = re.sub(r'\[[^\]]*\]', '', selector)              # attribute selectors
+    classes = re.findall(r'\.([\w-]+)', selector)
+    ids = re.findall(r'#([\w-]+)', selector)
+    tags = re.findall(r'(?:^|[\s>+~])([a-zA-Z][\w-]*)', selector)
+    return (all(c in used['classes'] for c in classes)
+            and all(i in used['ids'] for i in ids)
+            and all(t.lower() in used['tags'] for t in tags))
+
+
+def _css_blocks(css):
+    """Top-level (prelude, body) pairs of a stylesheet"""
+    blocks, depth, start, prelude = [], 0, 0, ''
+    for i, ch in enumerate(css):
+        if ch == '{':
+            if depth == 0:
+                prelude, start = css[start:i].strip(), i + 1
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                blocks.append((prelude, css[start:i]))
+                start = i + 1
+    return blocks
+
+
+def split_critical_css(css, html):
+    """(critical, rest) stylesheets: rules the above-the-fold HTML uses, and the others"""
+    used = used_selectors(html)
+    critical, rest = [], []
+    for prelude, body in _css_blocks(re.sub(r'/\*.*?\*/', '', css, flags=re.S)):
+        if prelude.startswith(('@media', '@supports')):
+            inner_critical, inner_rest = split_critical_css(body, html)
+            if inner_critical:
+                critical.append(f'{prelude}{{{inner_critical}}}')
+            if inner_rest:
+                rest.append(f'{prelude}{{{inner_rest}}}')
+        elif prelude.startswith('@') or prelude in (':root', '*', 'html', 'body') or \
+                any(_selector_used(s, used) for s in prelude.split(',')):
+            # At-rules such as @keyframes are small and referenced from critical rules
+            critical.append(f'{prelude}{{{body}}}')
+        else:
+            rest.append(f'{prelude}{{{body}}}')
+    return minify_css(''.join(critical)), minify_css(''.join(rest))
+
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+def _brotli(data):
+    """Brotli-compressed bytes via the brotli module, the brotli CLI or Node's zlib; None if none exist"""
+    try:
+        import brotli
+        return brotli.compress(data, quality=11)
+    except ImportError:
+        pass
+    if shutil.which('brotli'):
+        result = subprocess.run(['brotli', '-c', '-q', '11'], input=data, capture_output=True)
+        if result.returncode == 0:
+            return result.stdout
+    if shutil.which('node'):
+        script = ("const z=require('zlib');const c=[];process.stdin.on('data',d=>c.push(d))"
+                  ".on('end',()=>process.stdout.write(z.brotliCompressSync(Buffer.concat(c),"
+                  "{params:{[z.constants.BROTLI_PARAM_QUALITY]:11}})))")
+        result = subprocess.run(['node', '-e', script], input=data, capture_output=True)
+        if result.returncode == 0:
+            return result.stdout
+    return None
+
+
+def write_output(name, text):
+    """Write a file plus .gz/.br variants; returns the written sizes"""
+    data = text.encode('utf-8')
+    path = DIST_DIR / name
+    path.write_bytes(data)
+    sizes = {'raw': len(data)}
+
+    gz = gzip.compress(data, compresslevel=9, mtime=0)
+    (DIST_DIR / f'{name}.gz').write_bytes(gz)
+    sizes['gz'] = len(gz)
+
+    br = _brotli(data)
+    if br is not None:
+        (DIST_DIR / f'{name}.br').write_bytes(br)
+        sizes['br'] = len(br)
+    return sizes
+
+
+def hashed_name(stem, suffix, text):
+    """Content-hashed asset file name"""
+    return f'{stem}.{content_hash(text)[:HASH_LENGTH]}{suffix}'
+
+
+def load_manifest():
+    if MANIFEST_PATH.exists():
+        return json.loads(MANIFEST_PATH.read_text(encoding='utf-8'))
+    return {}
+
+
+def remove_stale_assets(keep):
+    """Delete hashed assets (and their variants) not in `keep`"""
+    for path in DIST_DIR.glob('*.*.*'):
+        base = path.name.removesuffix('.gz').removesuffix('.br')
+        if base != PAGE_NAME and base not in keep and base != MANIFEST_PATH.name:
+            path.unlink()
+
+
+def build(force=False):
+    """Build dist/ if any input changed; returns the manifest"""
+    sources = read_sources()
+    hashes = source_hashes(sources)
+    manifest = load_manifest()
+    outputs_exist = all((DIST_DIR / f).exists() for f in manifest.get('outputs', {}).values())
+    if not force and manifest.get('build_version') == BUILD_VERSION and \
+            manifest.get('inputs') == hashes and outputs_exist and manifest.get('outputs'):
+        print("[OK] Up to date")
+        return manifest
+
+    changed = sorted(k for k, v in hashes.items() if manifest.get('inputs', {}).get(k) != v)
+    print(f"Changed inputs: {', '.join(changed) if changed else '(forced)'}")
+    DIST_DIR.mkdir(exist_ok=True)
+
+    missing = [m for m in PLACEHOLDER.findall(sources['layout'])
+               if m.startswith('fragment:') and m.split(':', 1)[1] not in sources['fragments']]
+    if missing:
+        raise Exception(f"Layout references missing fragments: {', '.join(missing)}")
+
+    critical_html = ''.join(sources['fragments'].get(name, '') for name in CRITICAL_FRAGMENTS)
+    critical_css, rest_css = split_critical_css(sources['styles'], critical_html)
+    script = minify_js(sources['script'])
+
+    css_name = hashed_name('styles', '.css', rest_css)
+    js_name = hashed_name('app', '.js', script)
+    sizes = {}
+    for name, text in ((css_name, rest_css), (js_name, script)):
+        # A hashed name already on disk holds exactly this content
+        if not force and (DIST_DIR / name).exists() and (DIST_DIR / f'{name}.gz').exists():
+            continue
+        sizes[name] = write_output(name, text)
+
+    replacements = {
+        'critical_css': f'<style>{critical_css}</style>',
+        'stylesheet': (f'<link rel="stylesheet" href="{css_name}" media="print" '
+                       f'onload="this.media=\'all\'">'
+                       f'<noscript><link rel="stylesheet" href="{css_name}"></noscript>'),
+        'script': f'<script src="{js_name}"></script>',
+    }
+
+    def fill(match):
+        key = match.group(1)
+        if key.startswith('fragment:'):
+            return sources['fragments'][key.split(':', 1)[1]]
+        if key not in replacements:
+            raise Exception(f"Unknown layout placeholder: {{{{ {key} }}}}")
+        return replacements[key]
+
+    html = minify_html(PLACEHOLDER.sub(fill, sources['layout']))
+    sizes[PAGE_NAME] = write_output(PAGE_NAME, html)
+
+    # Keep the previous build's assets for pages already loaded in browsers
+    previous = manifest.get('outputs', {})
+    outputs = {'html': PAGE_NAME, 'css': css_name, 'js': js_name}
+    remove_stale_assets({css_name, js_name, previous.get('css'), previous.get('js')})
+
+    manifest = {'build_version': BUILD_VERSION, 'inputs': hashes, 'outputs': outputs}
+    MANIFEST_PATH.write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+
+    source_bytes = sum(len(t.encode('utf-8')) for t in (sources['layout'], sources['styles'], sources['script'],
+                                                        *sources['fragments'].values()))
+    print(f"[OK] Built {PAGE_NAME} ({source_bytes:,} source bytes)")
+    for name, s in sizes.items():
+        variants = ', '.join(f"{k} {v:,}" for k, v in s.items())
+        print(f"   {name}: {variants}")
+    if not any('br' in s for s in sizes.values()):
+        print("   (no .br variants: install the 'brotli' package, the brotli CLI or Node.js)")
+    return manifest
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='Build the Video Studio page into dist/')
+    parser.add_argument('--force', action='store_true', help='Rebuild even if no input changed')
+    args = parser.parse_args(argv)
+    build(args.force)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])